@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+Benchmark querying persisted hierarchies in SQLite
+
+A synthetic vocabulary forming a tree of broader concepts, each with
+four narrower concepts, is loaded by `skos.RDFLoader` and saved to a
+SQLite database file.  The subtrees of random concepts are then
+fetched with their depths by querying `concept_broader` once for each
+level of the subtree, by `skos.descendants_query` with a recursive
+common table expression, and by `skos.descendants_query` with the
+`concept_closure` table.  The time taken to build the closure table,
+and to add a concept while it is maintained, is shown separately.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/closure.py 10000 50000
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+import skos
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+
+def generate(count):
+    """
+    Generate a graph of `count` concepts in a tree
+    """
+    graph = rdflib.Graph()
+    add = graph.add
+    uris = [rdflib.URIRef('http://example.com/concept/%d' % i) for i in xrange(count)]
+    for i, uri in enumerate(uris):
+        add((uri, rdflib.RDF.type, SKOS['Concept']))
+        add((uri, SKOS['prefLabel'], rdflib.Literal('Concept %d' % i, lang='en')))
+        if i:
+            add((uri, SKOS['broader'], uris[(i - 1) // 4]))
+    return graph
+
+def levels(session, uri):
+    edges = skos.concept_broader
+    depths = {}
+    level, depth = [uri], 0
+    while level:
+        depth += 1
+        query = select([edges.c.narrower_uri]).where(edges.c.broader_uri.in_(level))
+        level = [row[0] for row in session.execute(query) if row[0] not in depths]
+        for narrower in level:
+            depths[narrower] = depth
+    concepts = session.query(skos.Concept).filter(skos.Concept.uri.in_(depths.keys())) if depths else []
+    return sorted((depths[concept.uri], concept.uri) for concept in concepts)
+
+def recursive(session, uri):
+    return sorted((depth, concept.uri) for concept, depth in skos.descendants_query(session, uri))
+
+def closure(session, uri):
+    return sorted((depth, concept.uri) for concept, depth in skos.descendants_query(session, uri, closure=True))
+
+def main(sizes, queries=200):
+    print '%10s %12s %14s %12s %12s %12s' % ('concepts', 'levels (s)', 'recursive (s)', 'closure (s)', 'build (s)', 'add (ms)')
+    rnd = random.Random(1)
+    for count in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            engine = create_engine('sqlite:///%s' % os.path.join(directory, 'skos.db'))
+            skos.Base.metadata.create_all(engine)
+            Session = sessionmaker(engine)
+            session = Session()
+            session.add_all(skos.RDFLoader(generate(count)).values())
+            session.commit()
+            session.close()
+
+            start = time.time()
+            skos.build_closure(engine)
+            building = time.time() - start
+
+            # the subtrees of concepts near the top are the largest
+            uris = ['http://example.com/concept/%d' % min(int(rnd.expovariate(0.01)), count - 1) for i in xrange(queries)]
+            timings = []
+            results = []
+            for fetch in (levels, recursive, closure):
+                session = Session()
+                start = time.time()
+                results.append([fetch(session, uri) for uri in uris])
+                timings.append(time.time() - start)
+                session.close()
+            assert results[0] == results[1] == results[2]
+
+            skos.maintain_closure(Session)
+            session = Session()
+            parent = session.query(skos.Concept).get('http://example.com/concept/1')
+            start = time.time()
+            parent.narrower.add(skos.Concept('http://example.com/concept/new', 'New'))
+            session.commit()
+            adding = time.time() - start
+            session.close()
+            engine.dispose()
+        finally:
+            shutil.rmtree(directory)
+        print '%10d %12.3f %14.3f %12.3f %12.3f %12.1f' % tuple([count] + timings + [building, adding * 1000])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+Benchmark exporting a loaded vocabulary as N-Triples
+
+A synthetic vocabulary is loaded by `skos.RDFLoader` and written to a
+file as N-Triples, both by building an `rdflib.Graph` with
+`RDFBuilder.build` and serialising it, and by streaming the triples
+with `RDFBuilder.write_ntriples`, and by writing four shards in
+parallel with `RDFBuilder.write_ntriples_sharded`.  Each export runs in
+a child process so that the growth in its peak memory can be
+attributed to the export.  Memory is measured on Unix only, and only
+for the exporting process itself.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/export.py 10000 50000
+"""
+
+import os
+import sys
+import resource
+import shutil
+import tempfile
+import time
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import skos
+from loading import generate
+
+def serialize(objects, fileobj):
+    skos.RDFBuilder().build(objects).serialize(fileobj, format='nt')
+
+def stream(objects, fileobj):
+    skos.RDFBuilder().write_ntriples(objects, fileobj)
+
+def shard(objects, fileobj):
+    directory = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(directory, 'shard%d.nt' % i) for i in xrange(4)]
+        skos.RDFBuilder().write_ntriples_sharded(objects, paths)
+    finally:
+        shutil.rmtree(directory)
+
+def measure(export, count, queue):
+    loader = skos.RDFLoader(generate(count), flat=True)
+    objects = loader.values()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryFile() as fileobj:
+        start = time.time()
+        export(objects, fileobj)
+        elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    queue.put((elapsed, peak))
+
+def run(export, count):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(export, count, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main(sizes):
+    print '%10s %12s %12s %12s %16s %16s' % ('concepts', 'graph (s)', 'stream (s)', 'sharded (s)', 'graph (KiB)', 'stream (KiB)')
+    for count in sizes:
+        graph, streamed, sharded = run(serialize, count), run(stream, count), run(shard, count)
+        print '%10d %12.2f %12.2f %12.2f %16d %16d' % (count, graph[0], streamed[0], sharded[0], graph[1], streamed[1])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000])
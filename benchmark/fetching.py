@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+"""
+Benchmark fetching external resources for `skos.RDFLoader`
+
+A chain of interlinked SKOS documents is served by the local HTTP
+server used by the tests and resolved with `max_depth=float('inf')`.
+The `skos.HTTPFetcher`, which keeps its connection alive and requests
+N-Triples, is compared against the same fetcher restricted to RDF/XML
+and against the `skos.URLFetcher`, which opens a new connection for
+each document.  The server converts documents to N-Triples on the fly,
+which is included in the timings, and connections over the loopback
+interface are cheap, so the savings on remote hosts are understated.
+
+Run it from the distribution root:
+
+    python benchmark/fetching.py
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+from resolution import write_documents
+from test.server import RDFServer
+
+def xml_fetcher():
+    fetcher = skos.HTTPFetcher()
+    fetcher.accept = 'application/rdf+xml'
+    return fetcher
+
+def run(server, fetcher_class, count):
+    graph = rdflib.Graph()
+    graph.parse(server.url('0.xml'))
+    fetcher = fetcher_class()
+    loader = skos.RDFLoader(graph, max_depth=float('inf'), flat=True, fetcher=fetcher)
+    assert len(loader) == count, len(loader)
+    if isinstance(fetcher, skos.HTTPFetcher):
+        fetcher.close()
+
+def main():
+    print '%10s %12s %12s %12s' % ('documents', 'pooled (s)', 'RDF/XML (s)', 'urllib2 (s)')
+    for count in (50, 100, 200, 400):
+        directory = tempfile.mkdtemp()
+        server = RDFServer()
+        server.directory = directory
+        server.start()
+        try:
+            write_documents(directory, count)
+            timings = [
+                min(timeit.repeat(lambda: run(server, fetcher_class, count), number=1, repeat=3))
+                for fetcher_class in (skos.HTTPFetcher, xml_fetcher, skos.URLFetcher)
+                ]
+        finally:
+            server.stop()
+            shutil.rmtree(directory)
+        print '%10d %12.3f %12.3f %12.3f' % tuple([count] + timings)
+
+if __name__ == '__main__':
+    main()
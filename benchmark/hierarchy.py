@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+Benchmark testing whether concepts lie under other concepts
+
+A synthetic vocabulary forming a binary tree of broader concepts is
+loaded by `skos.RDFLoader`, and random pairs of concepts are tested
+for whether the first is anywhere under the second, both by walking
+`Concept.broader` upwards from the first concept and by consulting the
+loader's `Hierarchy`.  The time taken to build the `Hierarchy` is
+shown separately.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/hierarchy.py 10000 50000
+"""
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+
+def generate(count):
+    """
+    Generate a graph of `count` concepts in a binary tree
+    """
+    graph = rdflib.Graph()
+    add = graph.add
+    uris = [rdflib.URIRef('http://example.com/concept/%d' % i) for i in xrange(count)]
+    for i, uri in enumerate(uris):
+        add((uri, rdflib.RDF.type, SKOS['Concept']))
+        add((uri, SKOS['prefLabel'], rdflib.Literal('Concept %d' % i, lang='en')))
+        if i:
+            add((uri, SKOS['broader'], uris[(i - 1) // 2]))
+    return graph
+
+def walk(concept, ancestor):
+    seen = set()
+    stack = list(concept.broader.itervalues())
+    while stack:
+        broader = stack.pop()
+        if broader.uri == ancestor.uri:
+            return True
+        if broader.uri not in seen:
+            seen.add(broader.uri)
+            stack.extend(broader.broader.itervalues())
+    return False
+
+def main(sizes, queries=100000):
+    print '%10s %12s %12s %12s' % ('concepts', 'walk (s)', 'index (s)', 'build (s)')
+    rnd = random.Random(1)
+    for count in sizes:
+        loader = skos.RDFLoader(generate(count))
+        concepts = loader.values()
+        pairs = [(rnd.choice(concepts), rnd.choice(concepts)) for i in xrange(queries)]
+
+        start = time.time()
+        walked = [walk(concept, ancestor) for concept, ancestor in pairs]
+        walking = time.time() - start
+
+        start = time.time()
+        hierarchy = loader.hierarchy
+        building = time.time() - start
+        start = time.time()
+        indexed = [hierarchy.is_descendant_of(concept, ancestor) for concept, ancestor in pairs]
+        indexing = time.time() - start
+
+        assert walked == indexed
+        print '%10d %12.3f %12.3f %12.3f' % (count, walking, indexing, building)
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the URI interning performed by `skos.RDFLoader`
+
+A vocabulary in which each concept is related to many others is loaded
+with the loader's memoised URI table, and with a loader normalising
+each URI afresh every time it is seen, as was previously the case.
+Each load runs in a child process so that the growth in its resident
+memory can be attributed to the loaded objects.  Memory is measured
+on Linux only.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/interning.py 10000 50000
+"""
+
+import gc
+import os
+import sys
+import random
+import time
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+from model import resident
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+
+class _Uninterned(object):
+    """
+    URI normalisation without memoisation
+    """
+
+    def __init__(self, normalise_uri):
+        self.normalise_uri = normalise_uri
+
+    def __getitem__(self, uri):
+        return self.normalise_uri(uri)
+
+    def forget(self):
+        pass
+
+class UninternedLoader(skos.RDFLoader):
+    """
+    An `RDFLoader` normalising each URI whenever it is seen
+    """
+
+    def _configure(self, *args, **kwargs):
+        super(UninternedLoader, self)._configure(*args, **kwargs)
+        self._uris = _Uninterned(self.normalise_uri)
+
+def generate(count, links=10, seed=1):
+    """
+    Generate a graph of `count` concepts each related to `links` others
+    """
+    rnd = random.Random(seed)
+    graph = rdflib.Graph()
+    add = graph.add
+    uris = [rdflib.URIRef('http://example.com/vocabulary/concept/%d' % i) for i in xrange(count)]
+    for i, uri in enumerate(uris):
+        add((uri, rdflib.RDF.type, SKOS['Concept']))
+        add((uri, SKOS['prefLabel'], rdflib.Literal('Concept %d' % i, lang='en')))
+        for j in xrange(links):
+            add((uri, SKOS['related'], uris[rnd.randrange(count)]))
+        if i:
+            add((uri, SKOS['broader'], uris[(i - 1) // 10]))
+    return graph
+
+def normalise_uri(uri):
+    return str(uri).rstrip('/')
+
+def measure(loader_class, count, queue):
+    graph = generate(count)
+    loader_class(generate(10)) # import and configure lazily loaded code
+    gc.collect()
+    before = resident()
+    start = time.time()
+    loader = loader_class(graph, plain=True, normalise_uri=normalise_uri)
+    elapsed = time.time() - start
+    queue.put((elapsed, (resident() - before) // count))
+
+def run(loader_class, count):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(loader_class, count, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main(sizes):
+    print '%10s %14s %16s %18s %20s' % ('concepts', 'interned (s)', 'uninterned (s)', 'interned (B/concept)', 'uninterned (B/concept)')
+    for count in sizes:
+        interned, uninterned = run(skos.RDFLoader, count), run(UninternedLoader, count)
+        print '%10d %14.2f %16.2f %18d %20d' % (count, interned[0], uninterned[0], interned[1], uninterned[1])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000])
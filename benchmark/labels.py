@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Benchmark autocompleting concept labels
+
+Synthetic concepts, each with a preferred and an alternative label of
+random words, are searched for the top ten matches of each keystroke
+as queries are typed.  A `skos.LabelIndex` is compared against
+scanning the lower cased labels of every concept for words starting
+with the query.  The time taken to build the index is shown
+separately.
+
+Run it from the distribution root, optionally passing the numbers of
+labels to test:
+
+    python benchmark/labels.py 100000 500000
+"""
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import skos
+
+def generate(count, rnd):
+    """
+    Generate concepts with `count` labels between them
+    """
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'ha', 'ke', 'li', 'mo', 'nu', 'pa', 're', 'si', 'to', 'vu', 'wa']
+    words = [''.join(rnd.choice(syllables) for i in xrange(rnd.randint(2, 4))) for j in xrange(5000)]
+    label = lambda: ' '.join(rnd.choice(words) for i in xrange(rnd.randint(1, 4))).capitalize()
+    return [skos.PlainConcept('http://example.com/concept/%d' % i, label(), altLabel=label()) for i in xrange(count // 2)]
+
+def scan(concepts, query, limit=10):
+    words = query.lower().split()
+    results = []
+    for concept in concepts:
+        for label in (concept.prefLabel, concept.altLabel):
+            label_words = label.lower().split()
+            if all(any(word.startswith(other) for word in label_words) for other in words):
+                results.append((concept.uri, label))
+                break
+        if len(results) == limit:
+            break
+    return results
+
+def keystrokes(concepts, rnd, count):
+    queries = []
+    for i in xrange(count):
+        label = rnd.choice(concepts).prefLabel.lower()
+        queries.extend(label[:j] for j in xrange(1, len(label) + 1) if label[j - 1] != ' ')
+    return queries
+
+def main(sizes, typed=20):
+    print '%10s %10s %14s %14s %12s' % ('labels', 'queries', 'scan (ms)', 'index (ms)', 'build (s)')
+    rnd = random.Random(1)
+    for count in sizes:
+        concepts = generate(count, rnd)
+        queries = keystrokes(concepts, rnd, typed)
+
+        start = time.time()
+        index = skos.LabelIndex(concepts)
+        building = time.time() - start
+
+        start = time.time()
+        for query in queries:
+            index.search(query)
+        indexed = time.time() - start
+
+        start = time.time()
+        for query in queries:
+            scan(concepts, query)
+        scanned = time.time() - start
+
+        print '%10d %10d %14.3f %14.3f %12.2f' % (count, len(queries), scanned * 1000 / len(queries), indexed * 1000 / len(queries), building)
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 500000])
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+"""
+Benchmark building the SKOS object model with `skos.RDFLoader`
+
+A synthetic vocabulary is generated in an `rdflib.Graph` and loaded
+both by `skos.RDFLoader`, which builds objects from a single pass over
+the graph's triples, and by the previous implementation, which queried
+the graph for the attributes of each object and the edges of each
+relation.  Each vocabulary is loaded with and without relations
+between the concepts, as wiring the relations is common to both.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/loading.py 10000 100000
+"""
+
+import gc
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+DC = rdflib.Namespace('http://purl.org/dc/elements/1.1/')
+
+class QueryingLoader(skos.RDFLoader):
+    """
+    An `RDFLoader` querying the graph for each object
+    """
+
+    def _iterateType(self, graph, type_):
+        return graph.subjects(rdflib.RDF.type, SKOS[type_])
+
+    def _loadConcepts(self, graph, cache, lang):
+        concepts = set()
+        normalise_uri = self.normalise_uri
+        default_label = [[None, type('obj', (object,), {'value':""})]]
+        for subject in self._iterateType(graph, 'Concept'):
+            uri = normalise_uri(subject)
+            label_list = graph.preferredLabel(subject, lang=lang, default=default_label)
+            label = unicode(label_list[0][1].value)
+            defn = self._get_value_for_lang(graph.objects(subject, SKOS['definition']), lang)
+            alt = self._get_value_for_lang(graph.objects(subject, SKOS['altLabel']), lang)
+            notn = unicode(graph.value(subject=subject, predicate=SKOS['notation']))
+            cache[uri] = skos.Concept(uri, label, defn, notn, alt)
+            concepts.add(uri)
+
+        attrs = {
+            SKOS['narrower']: 'narrower',
+            SKOS['broader']: 'broader',
+            SKOS['related']: 'related',
+            SKOS['exactMatch']: 'synonyms',
+            rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'): 'synonyms'
+            }
+        for predicate, attr in attrs.iteritems():
+            for subject, object_ in graph.subject_objects(predicate=predicate):
+                try:
+                    match = cache[normalise_uri(object_)]
+                except KeyError:
+                    continue
+                getattr(cache[normalise_uri(subject)], attr).add(match)
+
+        return concepts
+
+    def _loadCollections(self, graph, cache):
+        collections = set()
+        normalise_uri = self.normalise_uri
+        for subject in self._iterateType(graph, 'Collection'):
+            uri = normalise_uri(subject)
+            title = unicode(graph.value(subject, DC['title']))
+            description = unicode(graph.value(subject, DC['description']))
+            date = self._dcDateToDatetime(graph.value(subject, DC['date']))
+            cache[uri] = skos.Collection(uri, title, description, date)
+            collections.add(uri)
+
+        for subject, object_ in graph.subject_objects(predicate=SKOS['member']):
+            try:
+                member = cache[normalise_uri(object_)]
+            except KeyError:
+                continue
+            cache[normalise_uri(subject)].members.add(member)
+
+        return collections
+
+    def _loadConceptSchemes(self, graph, cache):
+        return set()
+
+    def load(self, graph, lang='en'):
+        cache = {}
+        self._concepts = self._collections = self._schemes = set()
+        self._resolveGraph(graph)
+        self._flat_concepts = self._loadConcepts(graph, cache, lang)
+        self._flat_collections = self._loadCollections(graph, cache)
+        self._flat_schemes = self._loadConceptSchemes(graph, cache)
+        self._flat_cache = self._cache = cache
+
+def generate(count, relations=True, seed=1):
+    """
+    Generate a graph containing `count` concepts
+
+    The concepts are interlinked unless `relations` is `False`.
+    """
+    rnd = random.Random(seed)
+    graph = rdflib.Graph()
+    add = graph.add
+    uris = [rdflib.URIRef('http://example.com/concept/%d' % i) for i in xrange(count)]
+    for i, uri in enumerate(uris):
+        add((uri, rdflib.RDF.type, SKOS['Concept']))
+        add((uri, SKOS['prefLabel'], rdflib.Literal('Concept %d' % i, lang='en')))
+        add((uri, SKOS['altLabel'], rdflib.Literal('C%d' % i, lang='en')))
+        add((uri, SKOS['definition'], rdflib.Literal('The concept numbered %d' % i, lang='en')))
+        add((uri, SKOS['notation'], rdflib.Literal('%d' % i)))
+        if not relations:
+            continue
+        if i:
+            parent = uris[(i - 1) // 10]
+            add((uri, SKOS['broader'], parent))
+            add((parent, SKOS['narrower'], uri))
+        add((uri, SKOS['related'], uris[rnd.randrange(count)]))
+
+    collection = rdflib.URIRef('http://example.com/collection')
+    add((collection, rdflib.RDF.type, SKOS['Collection']))
+    add((collection, DC['title'], rdflib.Literal('Collection')))
+    add((collection, DC['description'], rdflib.Literal('Every tenth concept')))
+    for uri in uris[::10]:
+        add((collection, SKOS['member'], uri))
+    return graph
+
+def timed(loader_class, graph):
+    # the cyclic garbage collector is disabled while timing as its
+    # passes over the many objects created otherwise dominate
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.time()
+        loader = loader_class(graph, lang='en', flat=True)
+        elapsed = time.time() - start
+    finally:
+        gc.enable()
+    assert len(loader) == len(loader.getConcepts()) + 1
+    return elapsed
+
+def main(sizes):
+    print '%10s %10s %10s %16s %14s' % ('concepts', 'relations', 'triples', 'single pass (s)', 'querying (s)')
+    for count in sizes:
+        for relations in (False, True):
+            graph = generate(count, relations)
+            timings = [timed(loader_class, graph) for loader_class in (skos.RDFLoader, QueryingLoader)]
+            print '%10d %10s %10d %16.2f %14.2f' % tuple([count, relations, len(graph)] + timings)
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the plain object model against the SQLAlchemy model
+
+A synthetic vocabulary is loaded by `skos.RDFLoader` into both the
+SQLAlchemy mapped classes and, with `plain=True`, the `__slots__`
+based plain classes.  Each load runs in a child process so that the
+growth in its resident memory can be attributed to the loaded objects.
+Memory is measured on Linux only.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/model.py 10000 100000
+"""
+
+import os
+import sys
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import skos
+from loading import generate, timed
+
+def resident():
+    """
+    Return the resident memory of this process in bytes
+    """
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def measure(count, plain, queue):
+    graph = generate(count)
+    skos.RDFLoader(generate(10), plain=plain) # import and configure lazily loaded code
+    before = resident()
+    loader = skos.RDFLoader(graph, plain=plain, flat=True)
+    memory = resident() - before
+    elapsed = timed(lambda graph, **kwargs: skos.RDFLoader(graph, plain=plain, **kwargs), graph)
+    queue.put((elapsed, memory // count))
+
+def run(count, plain):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(count, plain, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main(sizes):
+    print '%10s %14s %14s %18s %18s' % ('concepts', 'plain (s)', 'mapped (s)', 'plain (B/concept)', 'mapped (B/concept)')
+    for count in sizes:
+        plain, mapped = run(count, True), run(count, False)
+        print '%10d %14.2f %14.2f %18d %18d' % (count, plain[0], mapped[0], plain[1], mapped[1])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
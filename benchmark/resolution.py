@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the resolution of external resources by `skos.RDFLoader`
+
+A chain of interlinked SKOS documents is written to a temporary
+directory and resolved with `max_depth=float('inf')`.  The breadth
+first resolution used by `skos.RDFLoader` is compared against the
+previous implementation, which rescanned the whole accumulated graph
+after each resource was parsed.
+
+Run it from the distribution root:
+
+    python benchmark/resolution.py
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+
+SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+
+DOCUMENT = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:skos="http://www.w3.org/2004/02/skos/core#">
+  <skos:Concept rdf:about="./%(id)d.xml">
+    <skos:notation>%(id)d</skos:notation>
+    <skos:prefLabel>Concept %(id)d</skos:prefLabel>
+    <skos:definition>The concept numbered %(id)d</skos:definition>
+    <skos:broader rdf:resource="./%(broader)d.xml"/>
+    <skos:related rdf:resource="./%(related)d.xml"/>
+  </skos:Concept>
+</rdf:RDF>
+"""
+
+class RescanningLoader(skos.RDFLoader):
+    """
+    An `RDFLoader` using the previous depth first resolution
+    """
+
+    def load(self, graph, lang='en'):
+        self._resolveGraph(graph)
+        super(RescanningLoader, self).load(graph, lang)
+
+    def _resolveIndex(self, index, graph=None):
+        pass
+
+    def _resolveGraph(self, graph, depth=0, resolved=None):
+        if depth >= self.max_depth:
+            return
+
+        if resolved is None:
+            resolved = set()
+
+        types = [SKOS[type_] for type_ in ('Concept', 'Collection', 'ConceptScheme')]
+        for type_ in types:
+            resolved.update(graph.subjects(rdflib.RDF.type, type_))
+
+        unresolved = set()
+        for predicate in ('broader', 'narrower', 'related', 'exactMatch', 'member'):
+            unresolved.update(graph.objects(predicate=SKOS[predicate]))
+        unresolved -= resolved
+        resolved.update(unresolved)
+
+        for uri in unresolved:
+            subgraph = graph.parse(uri)
+            self._resolveGraph(subgraph, depth+1, resolved)
+
+def write_documents(directory, count):
+    """
+    Write `count` documents to a directory, returning the first
+    """
+    for id_ in xrange(count):
+        values = {
+            'id': id_,
+            'broader': (id_ + 1) % count,
+            'related': (id_ + 2) % count
+            }
+        with open(os.path.join(directory, '%d.xml' % id_), 'w') as fh:
+            fh.write(DOCUMENT % values)
+    return 'file://' + os.path.join(directory, '0.xml')
+
+def run(loader_class, start, count):
+    graph = rdflib.Graph()
+    graph.parse(start)
+    loader = loader_class(graph, max_depth=float('inf'), flat=True)
+    assert len(loader) == count, len(loader)
+
+def main():
+    print '%10s %12s %12s' % ('documents', 'frontier (s)', 'rescan (s)')
+    for count in (50, 100, 200, 400, 800):
+        directory = tempfile.mkdtemp()
+        try:
+            start = write_documents(directory, count)
+            timings = [
+                min(timeit.repeat(lambda: run(loader_class, start, count), number=1, repeat=3))
+                for loader_class in (skos.RDFLoader, RescanningLoader)
+                ]
+        finally:
+            shutil.rmtree(directory)
+        print '%10d %12.3f %12.3f' % tuple([count] + timings)
+
+if __name__ == '__main__':
+    main()
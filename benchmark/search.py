@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+"""
+Benchmark searching persisted concepts by their labels and definitions
+
+Synthetic concepts, each with a preferred label, an alternative label
+and a definition of random words, are saved to a SQLite database file
+and searched for the concepts matching random words.  Filtering the
+`concept` table with `LIKE '%...%'` on each column is compared against
+`skos.search_query` with the `concept_search` full-text index.  The
+time taken to build the index, and to add a concept while it is
+maintained, is shown separately.
+
+Run it from the distribution root, optionally passing the numbers of
+concepts to test:
+
+    python benchmark/search.py 10000 100000
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+import skos
+
+def generate(count, rnd):
+    """
+    Generate `count` concepts and the words used in them
+    """
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'ha', 'ke', 'li', 'mo', 'nu', 'pa', 're', 'si', 'to', 'vu', 'wa']
+    words = [''.join(rnd.choice(syllables) for i in xrange(rnd.randint(2, 4))) for j in xrange(20000)]
+    text = lambda lower, upper: ' '.join(rnd.choice(words) for i in xrange(rnd.randint(lower, upper))).capitalize()
+    concepts = [skos.Concept('http://example.com/concept/%d' % i, text(1, 4), text(10, 30), altLabel=text(1, 4)) for i in xrange(count)]
+    return concepts, words
+
+def scan(session, word):
+    pattern = '%%%s%%' % word
+    columns = (skos.Concept.prefLabel, skos.Concept.altLabel, skos.Concept.definition)
+    return session.query(skos.Concept).filter(or_(*[column.like(pattern) for column in columns])).all()
+
+def search(session, word):
+    return skos.search_query(session, word, prefix=False).all()
+
+def main(sizes, queries=200):
+    print '%10s %12s %12s %12s %12s' % ('concepts', 'like (ms)', 'index (ms)', 'build (s)', 'add (ms)')
+    rnd = random.Random(1)
+    for count in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            engine = create_engine('sqlite:///%s' % os.path.join(directory, 'skos.db'))
+            skos.Base.metadata.create_all(engine)
+            Session = sessionmaker(engine)
+            concepts, words = generate(count, rnd)
+            session = Session()
+            session.add_all(concepts)
+            session.commit()
+            session.close()
+            del concepts
+
+            start = time.time()
+            skos.build_search_index(engine)
+            building = time.time() - start
+
+            words = [rnd.choice(words) for i in xrange(queries)]
+            timings = []
+            results = []
+            for fetch in (scan, search):
+                session = Session()
+                start = time.time()
+                results.append([set(concept.uri for concept in fetch(session, word)) for word in words])
+                timings.append((time.time() - start) * 1000 / queries)
+                session.close()
+
+            # LIKE also matches words containing the query word
+            assert all(indexed <= scanned for scanned, indexed in zip(*results))
+
+            skos.maintain_search_index(Session)
+            session = Session()
+            start = time.time()
+            session.add(skos.Concept('http://example.com/concept/new', 'New concept', 'A concept added later'))
+            session.commit()
+            adding = time.time() - start
+            session.close()
+            engine.dispose()
+        finally:
+            shutil.rmtree(directory)
+        print '%10d %12.3f %12.3f %12.3f %12.1f' % tuple([count] + timings + [building, adding * 1000])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""
+Benchmark starting an `skos.RDFLoader` from a snapshot
+
+A synthetic vocabulary is loaded from RDF/XML and saved with
+`RDFLoader.save_snapshot`.  The time taken to parse and load the
+RDF/XML is compared against loading the snapshot, both eagerly and
+with `lazy=True`, in which case the snapshot is only mapped into
+memory.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/snapshot.py 10000 100000
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import rdflib
+import skos
+from loading import generate
+
+def timed(function):
+    start = time.time()
+    result = function()
+    return time.time() - start, result
+
+def main(sizes):
+    print '%10s %12s %14s %14s %14s' % ('concepts', 'RDF/XML (s)', 'snapshot (s)', 'lazy (s)', 'size (B)')
+    for count in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            xml = os.path.join(directory, 'vocabulary.xml')
+            generate(count).serialize(xml, format='xml')
+            snapshot = os.path.join(directory, 'vocabulary.snapshot')
+
+            def load_xml():
+                graph = rdflib.Graph()
+                graph.parse(xml)
+                return skos.RDFLoader(graph, flat=True)
+
+            xml_time, loader = timed(load_xml)
+            loader.save_snapshot(snapshot)
+            del loader
+
+            snapshot_time, loader = timed(lambda: skos.RDFLoader.from_snapshot(snapshot, flat=True))
+            assert len(loader) == count + 1
+            del loader
+
+            lazy_time, loader = timed(lambda: skos.RDFLoader.from_snapshot(snapshot, flat=True, lazy=True))
+            assert len(loader) == count + 1
+            print '%10d %12.2f %14.2f %14.4f %14d' % (count, xml_time, snapshot_time, lazy_time, os.path.getsize(snapshot))
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+Benchmark reading the symmetric relations of persisted concepts
+
+A vocabulary in which each concept is related to many others is loaded
+by `skos.RDFLoader`, saved to an in-memory SQLite database and read
+back in a new session.  The `related` relation of every concept is then
+iterated and sized repeatedly, as a read-heavy application would, and
+the session is flushed.  This is compared against reading the relation
+by copying its `_related_right` side into its `_related_left` side
+before each iteration, and counting it by building a set of the keys
+on both sides, which is what reading it previously set out to do.  The
+rows written to the database by statements other than SELECTs are
+counted for each.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/symmetric.py 500 2000
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+import skos
+from interning import generate
+
+def canonical(concept):
+    related = concept.related
+    return len(related), list(related)
+
+def copying(concept):
+    left, right = concept._related_left, concept._related_right
+    for value in right.values():
+        left.add(value)
+    return len(set(left) | set(right)), list(left)
+
+def run(read, count, passes=5):
+    engine = create_engine('sqlite:///:memory:')
+    skos.Base.metadata.create_all(engine)
+    Session = sessionmaker(engine)
+    session = Session()
+    session.add_all(skos.RDFLoader(generate(count)).values())
+    session.commit()
+    session.close()
+
+    writes = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith('SELECT'):
+            writes.extend(parameters if executemany else [parameters])
+    event.listen(engine, 'before_cursor_execute', record)
+
+    session = Session()
+    concepts = session.query(skos.Concept).all()
+    for concept in concepts:
+        concept.related         # load the relations before timing
+    start = time.time()
+    for i in xrange(passes):
+        for concept in concepts:
+            read(concept)
+    elapsed = time.time() - start
+    session.commit()
+    session.close()
+    engine.dispose()
+    return elapsed, len(writes)
+
+def main(sizes):
+    print '%10s %16s %14s %16s %14s' % ('concepts', 'canonical (s)', 'copying (s)', 'canonical (rows)', 'copying (rows)')
+    for count in sizes:
+        canonical_, copying_ = run(canonical, count), run(copying, count)
+        print '%10d %16.3f %14.3f %16d %14d' % (count, canonical_[0], copying_[0], canonical_[1], copying_[1])
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [500, 2000])
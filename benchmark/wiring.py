@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+"""
+Benchmark wiring the relations between objects in `skos.RDFLoader`
+
+The relations of a synthetic vocabulary are wired by `skos.RDFLoader`,
+which populates both sides of each relationship in a batch, and by the
+previous implementation, which added each edge through
+`InstrumentedConcepts.add` and so fired the SQLAlchemy appender and
+backref events for every edge.
+
+Run it from the distribution root, optionally passing the vocabulary
+sizes to test:
+
+    python benchmark/wiring.py 10000 100000
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import skos
+from loading import generate, timed
+
+class EventLoader(skos.RDFLoader):
+    """
+    An `RDFLoader` adding each edge through the SQLAlchemy events
+    """
+
+    def _wireRelations(self, cache, relations):
+        for subject, attr, object_ in relations:
+            getattr(cache[subject], attr).add(cache[object_])
+
+def main(sizes):
+    print '%10s %10s %12s %12s' % ('concepts', 'triples', 'batch (s)', 'events (s)')
+    for count in sizes:
+        graph = generate(count)
+        timings = [timed(loader_class, graph) for loader_class in (skos.RDFLoader, EventLoader)]
+        print '%10d %10d %12.2f %12.2f' % tuple([count, len(graph)] + timings)
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
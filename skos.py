@@ -86,6 +86,64 @@ types:
     >>> loader.getConceptSchemes() # we haven't got any `ConceptScheme`s
     {}
 
+Large vocabularies distributed as N-Triples dumps can be loaded
+without first parsing them into an `rdflib.Graph`: the
+`RDFLoader.from_ntriples` constructor reads the triples incrementally,
+only retaining the statements needed to build the object model.  It
+accepts the same keyword arguments as the `RDFLoader` constructor:
+
+    >>> with open('thesaurus.nt', 'rb') as fh:
+    ...     loader = skos.RDFLoader.from_ntriples(fh, lang='en')
+
+Once loaded, the object model can be saved in a compact binary
+snapshot with `RDFLoader.save_snapshot`.  `RDFLoader.from_snapshot`
+maps a snapshot into memory rather than reading it, so processes
+sharing a snapshot share its pages, and with `lazy=True` start up
+without building any objects.  Snapshots retain the objects, their
+relations and the `flat` and non-flat views.  A lazy loader keeps
+the snapshot mapped until it is closed, which it can be as a context
+manager:
+
+    >>> loader.save_snapshot('thesaurus.snapshot')
+    >>> with skos.RDFLoader.from_snapshot('thesaurus.snapshot', lazy=True) as loader:
+    ...     concepts = loader.getConcepts()
+
+When only a few objects from a large vocabulary are needed the `lazy`
+parameter defers building them until they are accessed, whether
+through the loader or through the relations of other objects.  The
+loader can still be sized and searched without building anything, and
+at least the `max_objects` most recently used objects, and at most
+twice as many, are retained.  Lazy loading requires SQLAlchemy >= 1.0:
+
+    >>> loader = skos.RDFLoader(graph, lazy=True, max_objects=1000)
+    >>> len(loader)             # nothing has been built yet
+    3
+    >>> concept = loader['http://my.fake.domain/test1'] # builds the concept
+    >>> concept.related         # builds the related concepts
+    {'http://my.fake.domain/test2': <Concept('http://my.fake.domain/test2')>}
+
+Services that only read the loaded objects can avoid the overhead of
+the SQLAlchemy mapped classes by passing `plain=True`.  The loader
+then builds `PlainConcept`, `PlainCollection` and `PlainConceptScheme`
+objects: these have the same attributes but use `__slots__`, expose
+their relations as read only `Concepts` and can't be persisted:
+
+    >>> loader = skos.RDFLoader(graph, plain=True)
+    >>> loader['http://my.fake.domain/test1'].related
+    {'http://my.fake.domain/test2': <PlainConcept('http://my.fake.domain/test2')>}
+
+The `lang` parameter selects the language of each `Concept`'s
+`prefLabel`, `definition` and `altLabel`, and can be a sequence of
+languages tried in turn.  Serving several languages doesn't require
+loading the graph once per language: with `languages=True` the
+literals in every language are also kept in each `Concept.labels`,
+from which they are retrieved with a fallback chain:
+
+    >>> loader = skos.RDFLoader(graph, lang=('es', 'en'), languages=True)
+    >>> concept = loader['http://my.fake.domain/test1']
+    >>> concept.labels.get('prefLabel', ('fr', '')) # fall back to an untagged label
+    u'Acoustic backscatter in the water column'
+
 Note that you can convert your Python SKOS objects back into their RDF
 representation using the `RDFBuilder` class:
 
@@ -93,6 +151,37 @@ representation using the `RDFBuilder` class:
     >>> objects = loader.values()
     >>> another_graph = builder.build(objects)
 
+By default every object linked to the objects being built is also
+added to the graph.  The `max_hops` and `predicates` parameters limit
+this to a neighbourhood, objects referred to beyond it only being
+given an `rdf:type`:
+
+    >>> subgraph = builder.build([concept], max_hops=2, predicates=['broader', 'narrower'])
+
+Large vocabularies can be exported without building a graph: the
+`RDFBuilder.iter_triples` method generates each triple once, and
+`RDFBuilder.write_ntriples` streams them to a file as N-Triples:
+
+    >>> with open('vocabulary.nt', 'wb') as fh:
+    ...     builder.write_ntriples(objects, fh)
+
+On multi-core machines `RDFBuilder.write_ntriples_sharded` writes the
+export as several N-Triples files in parallel worker processes, the
+objects being partitioned between the files by a hash of their URI:
+
+    >>> builder.write_ntriples_sharded(objects, ['vocabulary-%d.nt' % i for i in range(4)])
+
+Once an export has been taken, a `skos.ChangeTracker` records the
+objects that are subsequently changed, allowing just the triples added
+and removed since to be written as a pair of N-Triples patches:
+
+    >>> tracker = skos.ChangeTracker(builder)
+    >>> concept.prefLabel = 'Revised label'
+    >>> with open('added.nt', 'wb') as added:
+    ...     with open('removed.nt', 'wb') as removed:
+    ...         builder.write_ntriples_delta(tracker, added, removed)
+    >>> tracker.checkpoint()
+
 The `RDFLoader` constructor also takes a `max_depth` parameter which
 defaults to `0`.  This parameter determines the depth to which RDF
 resources are resolved i.e. it is used to limit the depth to which
@@ -107,6 +196,72 @@ level of external resources to be parsed and resolved:
 If you want to resolve an entire (and potentially very large!) graph
 then use `max_depth=float('inf')`.
 
+Resolution can be bounded with the `max_documents`, `max_bytes` and
+`max_time` (in seconds) parameters, and `max_depths` sets the depth to
+which individual relations are followed.  Once a budget runs out the
+load finishes with the objects resolved so far, and the URIs that were
+referenced but not resolved are available in `loader.unresolved`.
+Fetches still blocking when `max_time` runs out are abandoned, even if
+the fetcher has no timeout of its own:
+
+    >>> loader = skos.RDFLoader(graph, max_depth=float('inf'), max_documents=500,
+    ...                         max_time=60, max_depths={'exactMatch': 1})
+    WARNING:skos:resolution stopped after 500 documents as the documents budget ran out
+    >>> len(loader.unresolved)
+    1342
+
+Resolving a large graph one resource at a time can be slow, so the
+`workers` parameter allows each level of external resources to be
+fetched and parsed concurrently by a pool of threads.  The `per_host`
+parameter caps the number of concurrent requests made to any single
+host:
+
+    >>> loader = skos.RDFLoader(graph, max_depth=2, workers=8, per_host=4)
+
+Remote resources can also be cached between loads by passing a
+`skos.DocumentCache` instance as the `cache` parameter.  The
+`skos.DirectoryCache` stores documents on disk, revalidating them with
+the remote server using conditional requests once they are older than
+`ttl` seconds and evicting the least recently used documents once
+their total size exceeds `max_size` bytes:
+
+    >>> cache = skos.DirectoryCache('/tmp/skos-cache', ttl=3600, max_size=100 * 1024 * 1024)
+    >>> loader = skos.RDFLoader(graph, max_depth=1, cache=cache)
+    >>> loader.cache_hits, loader.cache_misses
+    (0, 3)
+
+Remote resources are fetched by a `skos.HTTPFetcher`, which keeps
+connections to each host alive between requests, asks for the most
+compact RDF serialisation the server offers, accepts gzip compressed
+responses and makes conditional requests for cached documents.  The
+transport can be tuned or replaced by passing a `skos.Fetcher`
+instance as the `fetcher` parameter, e.g. to set a `timeout` in
+seconds or to fall back to `urllib2` with the `skos.URLFetcher`:
+
+    >>> loader = skos.RDFLoader(graph, max_depth=1, fetcher=skos.HTTPFetcher(timeout=10))
+
+Applications that must not block while resources are resolved, such as
+those running an event loop, can load in a background thread with
+`RDFLoader.start`, which accepts the constructor's parameters and
+returns a future.  The graph must not be used until the load is done:
+
+    >>> future = skos.RDFLoader.start(graph, max_depth=2, workers=8, callback=notify)
+    >>> loader = future.result(timeout=60)
+
+Timings and counts for each phase of a load are gathered in the
+loader's `stats` attribute, and are also passed to any `callbacks` as
+they are recorded, e.g. to forward them to a metrics system:
+
+    >>> def record(kind, name, value):
+    ...     print kind, name, value
+    >>> loader = skos.RDFLoader(graph, callbacks=[record])
+    timing index 0.000226974487305
+    timing concepts 0.000566005706787
+    count concepts 2
+    ...
+    >>> loader.stats.counts
+    {'edges': 4, 'collections': 1, 'schemes': 0, 'concepts': 2}
+
 Another constructor parameter is the boolean flag `flat`. This can
 also be toggled post-instantiation using the `RDFLoader.flat`
 property.  When set to `False` (the default) only SKOS objects present
@@ -153,6 +308,40 @@ and `Concept.related` are all instances of `skos.Concepts`:
 
     >>> assert concept in concept.broader['http://vocab.nerc.ac.uk/collection/P05/current/014/'].narrower
 
+`Concept.synonyms` and `Concept.related` are symmetric: each pair of
+concepts is stored as a single edge, which is seen from both concepts,
+however many times the relation is stated or added.  Reading either
+relation never modifies it, so it does not add work to a database
+session.
+
+Whether one concept lies anywhere under another is answered by the
+loader's `hierarchy`, a `skos.Hierarchy` holding the transitive closure
+of the broader relation.  It is built when first accessed and then
+follows changes to the broader and narrower concepts of the loaded
+objects.  Concepts are identified by their URIs, and a concept on a
+cycle is its own ancestor:
+
+    >>> hierarchy = loader.hierarchy
+    >>> hierarchy.is_descendant_of('http://my.fake.domain/test1', 'http://vocab.nerc.ac.uk/collection/P05/current/014/')
+    True
+    >>> sorted(hierarchy.ancestors('http://my.fake.domain/test1'))
+    ['http://vocab.nerc.ac.uk/collection/P05/current/014/']
+    >>> hierarchy.depth('http://my.fake.domain/test1') # broader steps to the top
+    1
+
+`Hierarchy.descendants` lists the narrower concepts in the same way.
+
+Concepts are found by their labels as a query is typed with a
+`skos.LabelIndex`, built from a loader, a `Concepts` container or any
+concepts.  Case and accents are ignored, and the last word of a query
+may be incomplete.  The `uri` and label of up to `limit` concepts are
+returned, and `add` and `discard` keep the index up to date as
+concepts change:
+
+    >>> index = skos.LabelIndex(loader)
+    >>> index.search('acoustic back', limit=5)
+    [('http://my.fake.domain/test1', u'Acoustic backscatter in the water column')]
+
 `Concept` instances also provide easy access to the other SKOS data:
 
     >>> concept.uri
@@ -213,19 +402,75 @@ techniques...
     >>> session2.query(skos.Concept).filter(skos.Concept.prefLabel.ilike('%water%')).all()
     [<Concept('http://my.fake.domain/test1')>,
      <Concept('http://vocab.nerc.ac.uk/collection/P01/current/ACBSADCP/')>]
+
+A whole subtree or chain of broader concepts is fetched, with the
+number of broader steps to each concept, in a single SQL statement.
+By default this is a recursive query over the `concept_broader` table,
+which needs `WITH RECURSIVE` support, such as in SQLite 3.8.3 or later.
+Alternatively `skos.build_closure` creates and fills the
+`concept_closure` table of every ancestor of each concept, which
+`skos.maintain_closure` keeps up to date as a session's concepts are
+flushed:
+
+    >>> skos.build_closure(engine)
+    >>> skos.maintain_closure(Session)
+    >>> [(concept.uri, depth) for concept, depth in skos.ancestors_query(session2, 'http://my.fake.domain/test1', closure=True)]
+    [('http://vocab.nerc.ac.uk/collection/P05/current/014/', 1)]
+    >>> skos.descendants_query(session2, 'http://vocab.nerc.ac.uk/collection/P05/current/014/').count()
+    1
+
+Searching labels with `LIKE` or `ilike` scans the whole `concept`
+table.  With SQLite's FTS5 extension `skos.build_search_index` creates
+and fills the `concept_search` full-text index of concept labels and
+definitions, and `skos.maintain_search_index` keeps it up to date as a
+session's concepts are flushed.  `skos.search_query` then returns the
+matching concepts, best first, without loading any others:
+
+    >>> skos.build_search_index(engine)
+    >>> skos.maintain_search_index(Session)
+    >>> sorted(concept.uri for concept in skos.search_query(session2, 'acoustic backsc'))
+    ['http://my.fake.domain/test1',
+     'http://vocab.nerc.ac.uk/collection/P01/current/ACBSADCP/']
 """
 
 __version__ = '0.1.1'
 
 from sqlalchemy.ext.declarative import declarative_base
 #from sqlalchemy import Table, Column, Integer, String, Date, Float, ForeignKey, event
-from sqlalchemy import Table, Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Table, Column, String, Text, DateTime, Integer, Float, ForeignKey, MetaData
 from sqlalchemy.orm import relationship, backref, synonym
+from sqlalchemy.orm.attributes import instance_state, NO_VALUE
 from sqlalchemy.orm.collections import collection
+import array
+import bisect
 import collections
+import contextlib
+import hashlib
+import heapq
+import json
 import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import urlparse
+import weakref
+import zlib
+
+try:
+    from logging import NullHandler
+except ImportError:             # Python < 2.7
+    class NullHandler(logging.Handler):
+        def emit(self, record):
+            pass
 
 logger = logging.getLogger(__name__)
+logger.addHandler(NullHandler())
 
 def info(*args, **kwargs):
     logger.info(*args, **kwargs)
@@ -233,6 +478,9 @@ def info(*args, **kwargs):
 def debug(*args, **kwargs):
     logger.debug(*args, **kwargs)
 
+def warning(*args, **kwargs):
+    logger.warning(*args, **kwargs)
+
 # Create a SQLAlchemy declarative base class using our metaclass
 Base = declarative_base()
 
@@ -252,6 +500,16 @@ concept_related = Table('concept_related', Base.metadata,
     Column('right_uri', String(255), ForeignKey('concept.uri'))
 )
 
+# the optional transitive closure of `concept_broader`, holding the
+# least number of broader steps from each concept to each ancestor.
+# It has its own metadata as it is only accurate when maintained.
+closure_metadata = MetaData()
+concept_closure = Table('concept_closure', closure_metadata,
+    Column('ancestor_uri', String(255), primary_key=True),
+    Column('descendant_uri', String(255), primary_key=True),
+    Column('depth', Integer, nullable=False)
+)
+
 concepts2schemes = Table('concepts2schemes', Base.metadata,
     Column('scheme_uri', String(255), ForeignKey('concept_scheme.uri')),
     Column('concept_uri', String(255), ForeignKey('concept.uri'))
@@ -265,6 +523,11 @@ concepts2collections = Table('concepts2collections', Base.metadata,
 class RecursionError(Exception):
     pass
 
+class LoaderTimeout(Exception):
+    """
+    Raised when waiting for a `LoaderFuture` times out
+    """
+
 # This function is necessary as the first option described at
 # <http://groups.google.com/group/sqlalchemy/browse_thread/thread/b4eaef1bdf132cdc?pli=1>
 # for a solution to self-referential many-to-many relationships using
@@ -278,6 +541,16 @@ def _create_attribute_mapping(name):
     """
 
     class AttributeJoin(collections.MutableSet, collections.Mapping):
+        """
+        The symmetric relation between concepts
+
+        Each related pair is stored as a single edge, in the `_left`
+        collection of one concept and the `_right` collection of the
+        other.  Databases written by earlier versions hold both
+        directions of each pair, so an edge may appear in both
+        collections and is counted once.  Reading the relation never
+        modifies them.
+        """
 
         def __init__(self, concept):
             self._left = getattr(concept, '_%s_left' % name)
@@ -285,8 +558,12 @@ def _create_attribute_mapping(name):
 
         # Implement the interface for `collections.Iterable`
         def __iter__(self):
-            self._left.update(self._right)
-            return iter(self._left)
+            left = self._left
+            for key in left:
+                yield key
+            for key in self._right:
+                if key not in left: # otherwise already yielded
+                    yield key
 
         # Implement the interface for `collections.Container`
         def __contains__(self, value):
@@ -294,11 +571,13 @@ def _create_attribute_mapping(name):
 
         # Implement the interface for `collections.Sized`
         def __len__(self):
-            return len(set(self._left.keys() + self._right.keys()))
+            left = self._left
+            return len(left) + len([key for key in self._right if key not in left])
 
         # Implement the interface for `collections.MutableSet`
         def add(self, value):
-            self._left.add(value)
+            if value not in self._right: # otherwise the edge exists
+                self._left.add(value)
 
         def discard(self, value):
             self._left.discard(value)
@@ -306,12 +585,11 @@ def _create_attribute_mapping(name):
 
         def pop(self):
             try:
-                value = self._concepts._synonyms_left.pop()
-            except KeyError:
-                value = self._concepts._synonyms_right.pop()
-                self._concepts._synonyms_left.discard(value)
-            else:
-                self._concepts._synonyms_right.discard(value)
+                key = next(iter(self))
+            except StopIteration:
+                raise KeyError('pop from an empty relation')
+            value = self[key]
+            self.discard(value)
             return value
 
         # Implement the interface for `collections.Mapping` with the
@@ -479,6 +757,88 @@ class InstrumentedConcepts(Concepts):
 _Synonyms = _create_attribute_mapping('synonyms')
 _Related = _create_attribute_mapping('related')
 
+def _populate(obj, key, collection, values):
+    """
+    Add objects to a relationship collection without firing events
+
+    The objects are added to the dictionary underlying an
+    `InstrumentedConcepts` collection, bypassing the per item
+    SQLAlchemy appender and backref events; the inverse relationship
+    must be populated by the caller.  The attribute is then recorded as
+    modified from an unloaded state so that all its members are treated
+    as additions when the object is flushed.  Unlike `flag_modified`
+    this works while the collection is being initialised.
+    """
+    concepts = collection._concepts
+    for value in values:
+        concepts[value.uri] = value
+    state = instance_state(obj)
+    try:
+        modified = state._modified_event
+    except AttributeError:
+        modified = state.modified_event # SQLAlchemy < 0.8
+    modified(state.dict, state.manager[key].impl, NO_VALUE)
+
+def _languages(lang):
+    """
+    Return a language fallback chain as a sequence of languages
+    """
+    if lang is None or isinstance(lang, basestring):
+        return (lang,)
+    return lang
+
+class Labels(object):
+    """
+    The literals of a `Concept` in every language
+
+    Values are held for each attribute as a tuple of `(language,
+    value)` pairs, `language` being `None` for untagged literals.  They
+    are retrieved by a language or by a sequence of languages tried in
+    turn, where the language `None` matches a value in any language
+    and `''` an untagged value.
+    """
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values=None):
+        self._values = {}
+        if values:
+            for attr, pairs in values.iteritems():
+                self._values[attr] = tuple(pairs)
+
+    def get(self, attr, lang, default=None):
+        pairs = self._values.get(attr, ())
+        for lang in _languages(lang):
+            for language, value in pairs:
+                if lang is None or language == (lang or None):
+                    return value
+        return default
+
+    def getAll(self, attr, lang):
+        """
+        Return all the values of an attribute in the first language
+        of a fallback chain that has any
+        """
+        pairs = self._values.get(attr, ())
+        for lang in _languages(lang):
+            values = [value for language, value in pairs if lang is None or language == (lang or None)]
+            if values:
+                return values
+        return []
+
+    def languages(self, attr=None):
+        """
+        Return the set of languages for one or all attributes
+        """
+        if attr is None:
+            pairs = chain(*self._values.values())
+        else:
+            pairs = self._values.get(attr, ())
+        return set((language for language, value in pairs))
+
+    def __repr__(self):
+        return '<%s(%r)>' % (self.__class__.__name__, sorted(self.languages()))
+
 class Object(Base):
     __tablename__ = 'object'
     _discriminator = Column('class', String(50))
@@ -502,6 +862,10 @@ class Concept(Object):
     notation = Column(String(50))
     altLabel = Column(String(50))
 
+    # a `Labels` instance holding the literals in every language,
+    # populated by an `RDFLoader` with `languages=True`
+    labels = None
+
     def __init__(self, uri, prefLabel, definition=None, notation=None, altLabel=None):
         super(Concept, self).__init__(uri)
         self.prefLabel = prefLabel
@@ -642,353 +1006,3333 @@ class Collection(Object):
         except AttributeError:
             return False
 
-
-import rdflib
-from itertools import chain, islice
-class RDFLoader(collections.Mapping):
+class _FrozenConcepts(Concepts):
     """
-    Loads an RDF graph into the Python SKOS object model
-
-    This class provides a mappable interface, with URIs as keys and
-    the objects themselves as values.
-
-    Use the `RDFBuilder` class to convert the Python SKOS objects back
-    into a RDF graph.
+    A read only `Concepts` view of a dictionary of concepts
     """
-    def __init__(self, graph, max_depth=0, flat=False, normalise_uri=str, lang=None):
-        if not isinstance(graph, rdflib.Graph):
-            raise TypeError('`rdflib.Graph` type expected for `graph` argument, found: %s' % type(graph))
-
-        try:
-            self.max_depth = float(max_depth)
-        except (TypeError, ValueError):
-            raise TypeError('Numeric type expected for `max_depth` argument, found: %s' % type(max_depth))
 
-        self.flat = bool(flat)
+    def __init__(self, concepts):
+        self._concepts = concepts
 
-        if not callable(normalise_uri):
-            raise TypeError('callable expected for `normalise_uri` argument')
-        self.normalise_uri = normalise_uri
+    def add(self, value):
+        raise TypeError('%s relations are read only' % self.__class__.__name__)
 
-        self.load(graph, lang)       # convert the graph to our object model
+    def discard(self, value):
+        raise TypeError('%s relations are read only' % self.__class__.__name__)
 
-    def _dcDateToDatetime(self, date):
-        """
-        Convert a Dublin Core date to a datetime object
-        """
-        from iso8601 import parse_date, ParseError
-        try:
-            return parse_date(date)
-        except ParseError:
-            return None
+    def pop(self):
+        raise TypeError('%s relations are read only' % self.__class__.__name__)
 
-    def _resolveGraph(self, graph, depth=0, resolved=None):
-        """
-        Resolve external RDF resources
-        """
-        if depth >= self.max_depth:
-            return
+_no_concepts = {}               # shared by all empty relations
 
-        if resolved is None:
-            resolved = set()
-
-        resolvable_predicates = (
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#broader'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#narrower'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#exactMatch'),
-            rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#related'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#member'),
-            )
-
-        resolvable_objects = (
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#ConceptScheme'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#Concept'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#Collection'),
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#hasTopConcept'),
-            )
-
-        normalise_uri = self.normalise_uri
-        # add existing resolved objects
-        for object_ in resolvable_objects:
-            resolved.update((normalise_uri(subject) for subject in graph.subjects(predicate=rdflib.URIRef('http://www.w3.org/1999/02/22-rdf-syntax-ns#type'), object=object_)))
+def _plain_relation(name):
+    """
+    Create a property exposing a relation of a plain object
+    """
+    attr = '_' + name
+    def get(self):
+        return _FrozenConcepts(getattr(self, attr) or _no_concepts)
+    return property(get, doc='The %s relation as a read only `Concepts`' % name)
 
-        unresolved = set()
-        for predicate in resolvable_predicates:
-            for subject, object_ in graph.subject_objects(predicate=predicate):
-                uri = normalise_uri(object_)
-                if uri not in resolved:
-                    unresolved.add(uri)
+class PlainObject(object):
+    """
+    The base class of the plain Python object model
+
+    The plain model mirrors the attribute interface of the SQLAlchemy
+    classes for read only use: its classes use `__slots__`, are not
+    instrumented and cannot be persisted.  Relations are held in plain
+    dictionaries, or `None` when empty, and are exposed as read only
+    `Concepts`.  Both sides of each relation are populated when
+    loading; `related` and `synonyms` hold the relation in either
+    direction.
+    """
 
-        # flag the unresolved as being resolved, as that is what
-        # happens next; flagging them now prevents duplicate
-        # resolutions!
-        resolved.update(unresolved)
+    __slots__ = ('uri',)
 
-        for uri in unresolved:
-            info('parsing %s', uri)
-            subgraph = graph.parse(uri)
-            self._resolveGraph(subgraph, depth+1, resolved)
+    def __init__(self, uri):
+        self.uri = uri
 
-    def _iterateType(self, graph, type_):
+    def _populate(self, key, values):
         """
-        Iterate over all subjects of a specific SKOS type
+        Add objects to a relation
         """
-        predicate = rdflib.URIRef('http://www.w3.org/1999/02/22-rdf-syntax-ns#type')
-        object_ = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#%s' % type_)
-        for subject in graph.subjects(predicate=predicate, object=object_):
-            yield subject
+        attr = '_' + key
+        concepts = getattr(self, attr)
+        if concepts is None:
+            concepts = {}
+            setattr(self, attr, concepts)
+        for value in values:
+            concepts[value.uri] = value
 
-    def _get_value_for_lang(self, graph, subject, predicate, lang):
-        objects = graph.objects(subject=subject, predicate=predicate)
-        if not objects:
-            return None
+    def __repr__(self):
+        return "<%s('%s')>" % (self.__class__.__name__, self.uri)
 
-        for obj in objects:
-            if hasattr(obj, "language") and obj.language == lang:
-                return obj.value
+class PlainConcept(PlainObject):
+    """
+    A plain Python equivalent of `Concept`
+    """
 
-        return None
+    _rdf_type = 'Concept'
 
-    def _loadConcepts(self, graph, cache, lang):
-        # generate all the concepts
-        concepts = set()
-        normalise_uri = self.normalise_uri
-        prefLabel = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#prefLabel')
-        definition = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#definition')
-        notation = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#notation')
-        altLabel = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#altLabel')
+    __slots__ = ('prefLabel', 'definition', 'notation', 'altLabel', 'labels',
+                 '_broader', '_narrower', '_related', '_synonyms', '_collections', '_schemes')
 
-        default_label = [[None, type('obj', (object,), {'value':""})]]
+    def __init__(self, uri, prefLabel, definition=None, notation=None, altLabel=None):
+        super(PlainConcept, self).__init__(uri)
+        self.prefLabel = prefLabel
+        self.definition = definition
+        self.notation = notation
+        self.altLabel = altLabel
+        self.labels = None
+        self._broader = self._narrower = self._related = self._synonyms = self._collections = self._schemes = None
 
-        for subject in self._iterateType(graph, 'Concept'):
-            uri = normalise_uri(subject)
+    broader = _plain_relation('broader')
+    narrower = _plain_relation('narrower')
+    related = _plain_relation('related')
+    synonyms = _plain_relation('synonyms')
+    collections = _plain_relation('collections')
+    schemes = _plain_relation('schemes')
 
-            # Check for a preferredLabel in our desired language
-            label_list = graph.preferredLabel(subject, lang=lang, default=default_label)
+    def __hash__(self):
+        return hash(''.join((v for v in (getattr(self, attr) for attr in ('uri', 'prefLabel', 'definition', 'notation', 'altLabel')) if v)))
 
-            label = unicode(label_list[0][1].value)
+    def __eq__(self, other):
+        try:
+            return min([getattr(self, attr) == getattr(other, attr) for attr in ('uri', 'prefLabel', 'definition', 'notation', 'altLabel')])
+        except AttributeError:
+            return False
 
-            defn = self._get_value_for_lang(graph, subject, definition, lang)
-            alt = self._get_value_for_lang(graph, subject, altLabel, lang)
+class PlainConceptScheme(PlainObject):
+    """
+    A plain Python equivalent of `ConceptScheme`
+    """
 
-            notn = unicode(graph.value(subject=subject, predicate=notation))
+    _rdf_type = 'ConceptScheme'
 
-            debug('creating Concept %s', uri)
-            cache[uri] = Concept(uri, label, defn, notn, alt)
-            concepts.add(uri)
+    __slots__ = ('title', 'description', '_concepts')
 
-        attrs = {
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#narrower'): 'narrower',
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#broader'): 'broader',
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#related'): 'related',
-            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#exactMatch'): 'synonyms',
-            rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'): 'synonyms'
-            }
-        for predicate, attr in attrs.iteritems():
-            for subject, object_ in graph.subject_objects(predicate=predicate):
-                try:
-                    match = cache[normalise_uri(object_)]
-                except KeyError:
-                    continue
-                debug('adding %s to %s as %s', object_, subject, attr)
-                getattr(cache[normalise_uri(subject)], attr).add(match)
+    def __init__(self, uri, title, description=None):
+        super(PlainConceptScheme, self).__init__(uri)
+        self.title = title
+        self.description = description
+        self._concepts = None
 
-        return concepts
+    concepts = _plain_relation('concepts')
 
-    def _loadCollections(self, graph, cache):
-        # generate all the collections
-        collections = set()
-        normalise_uri = self.normalise_uri
-        pred_titles = [rdflib.URIRef('http://purl.org/dc/terms/title'), rdflib.URIRef('http://purl.org/dc/elements/1.1/title')]
-        pred_descriptions = [rdflib.URIRef('http://purl.org/dc/terms/description'), rdflib.URIRef('http://purl.org/dc/elements/1.1/description')]
-        pred_dates = [rdflib.URIRef('http://purl.org/dc/terms/date'), rdflib.URIRef('http://purl.org/dc/elements/1.1/date')]
-        for subject in self._iterateType(graph, 'Collection'):
-            uri = normalise_uri(subject)
-            # create the basic concept
-            title = unicode(self._valueFromPredicates(graph, subject, pred_titles))
-            description = unicode(self._valueFromPredicates(graph, subject, pred_descriptions))
-            date = self._dcDateToDatetime(self._valueFromPredicates(graph, subject, pred_dates))
-            debug('creating Collection %s', uri)
-            cache[uri] = Collection(uri, title, description, date)
-            collections.add(uri)
-
-        for subject, object_ in graph.subject_objects(predicate=rdflib.URIRef('http://www.w3.org/2004/02/skos/core#member')):
-            try:
-                member = cache[normalise_uri(object_)]
-            except KeyError:
-                continue
-            debug('adding %s to %s as a member', object_, subject)
-            cache[normalise_uri(subject)].members.add(member)
+    def __hash__(self):
+        return hash(''.join((getattr(self, attr) for attr in ('uri', 'title', 'description'))))
 
-        return collections
+    def __eq__(self, other):
+        return min([getattr(self, attr) == getattr(other, attr) for attr in ('uri', 'title', 'description', 'concepts')])
 
-    def _valueFromPredicates(self, graph, subject, predicates):
-        """
-        Given a list of predicates return the first value from a graph that is not None
-        """
-        for predicate in predicates:
-            value = graph.value(subject=subject, predicate=predicate)
-            if value: return value
-        return None
+class PlainCollection(PlainObject):
+    """
+    A plain Python equivalent of `Collection`
+    """
 
-    def _loadConceptSchemes(self, graph, cache):
-        # generate all the schemes
-        schemes = set()
-        normalise_uri = self.normalise_uri
-        pred_titles = [rdflib.URIRef('http://purl.org/dc/terms/title'), rdflib.URIRef('http://purl.org/dc/elements/1.1/title')]
-        pred_descriptions = [rdflib.URIRef('http://purl.org/dc/terms/description'), rdflib.URIRef('http://purl.org/dc/elements/1.1/description')]
-        for subject in self._iterateType(graph, 'ConceptScheme'):
-            uri = normalise_uri(subject)
-            # create the basic concept
-            title = unicode(self._valueFromPredicates(graph, subject, pred_titles))
-            description = unicode(self._valueFromPredicates(graph, subject, pred_descriptions))
-            debug('creating ConceptScheme %s', uri)
-            cache[uri] = ConceptScheme(uri, title, description)
-            schemes.add(uri)
+    _rdf_type = 'Collection'
 
-        return schemes
+    __slots__ = ('title', 'description', 'date', '_members')
 
-    def load(self, graph, lang='en'):
-        cache = {}
-        normalise_uri = self.normalise_uri
-        self._concepts = set((normalise_uri(subj) for subj in self._iterateType(graph, 'Concept')))
-        self._collections = set((normalise_uri(subj) for subj in self._iterateType(graph, 'Collection')))
-        self._schemes = set((normalise_uri(subj) for subj in self._iterateType(graph, 'ConceptScheme')))
-        self._resolveGraph(graph)
-        self._flat_concepts = self._loadConcepts(graph, cache, lang)
-        self._flat_collections = self._loadCollections(graph, cache)
-        self._flat_schemes = self._loadConceptSchemes(graph, cache)
-        self._flat_cache = cache # all objects
-        self._cache = dict((uri, cache[uri]) for uri in (chain(self._concepts, self._schemes, self._collections)))
+    def __init__(self, uri, title, description=None, date=None):
+        super(PlainCollection, self).__init__(uri)
+        self.title = title
+        self.description = description
+        self.date = date
+        self._members = None
 
-    def _getAttr(self, name, flat=None):
-        if flat is None:
-            flat = self.flat
-        if flat:
-            name = '_flat%s' % name
-        return getattr(self, name)
+    members = _plain_relation('members')
 
-    def _getCache(self, flat=None):
-        return self._getAttr('_cache', flat)
+    def __hash__(self):
+        return hash(''.join((str(getattr(self, attr)) for attr in ('uri', 'title', 'description', 'date'))))
 
-    # Implement the interface for `collections.Iterable`
-    def __iter__(self, flat=None):
-        return iter(self._getCache(flat))
+    def __eq__(self, other):
+        try:
+            return min([getattr(self, attr) == getattr(other, attr) for attr in ('uri', 'title', 'description', 'members', 'date')])
+        except AttributeError:
+            return False
 
-    # Implement the interface for `collections.Container`
-    def __contains__(self, value, flat=None):
-        return value in self._getCache(flat)
 
-    # Implement the interface for `collections.Sized`
-    def __len__(self, flat=None):
-        return len(self._getCache(flat))
+class Document(object):
+    """
+    A retrieved RDF document and its HTTP validators
+    """
 
-    # Implement the interface for `collections.Mapping`
-    def __getitem__(self, key):
-        # try and return a cached item
-        return self._getCache()[key]
+    def __init__(self, data, content_type=None, etag=None, last_modified=None, fetched=None):
+        self.data = data
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        if fetched is None:
+            fetched = time.time()
+        self.fetched = fetched
+
+    @property
+    def format(self):
+        """
+        The `rdflib` parser format for the document
+        """
+        return _rdf_formats.get(self.content_type, 'xml')
 
-    def getConcepts(self, flat=None):
-        cache = self._getCache(flat)
-        concepts = self._getAttr('_concepts', flat)
+    def __repr__(self):
+        return "<%s(%d bytes, '%s')>" % (self.__class__.__name__, len(self.data), self.content_type)
+
+# map RDF media types to `rdflib` parser formats
+_rdf_formats = {
+    'application/rdf+xml': 'xml',
+    'application/xml': 'xml',
+    'text/xml': 'xml',
+    'text/turtle': 'turtle',
+    'application/x-turtle': 'turtle',
+    'text/n3': 'n3',
+    'text/rdf+n3': 'n3',
+    'application/n-triples': 'nt'
+    }
+
+class DocumentCache(object):
+    """
+    Base class for caches of remote RDF documents
 
-        return Concepts([cache[key] for key in concepts])
+    Pass an instance to `RDFLoader` to have external resources
+    resolved from the cache.  Subclasses implement `get` and `put` to
+    provide the storage: documents older than `ttl` seconds are
+    revalidated with the remote server before being reused.
+    """
 
-    def getConceptSchemes(self, flat=None):
-        cache = self._getCache(flat)
-        schemes = self._getAttr('_schemes', flat)
+    def __init__(self, ttl=86400):
+        self.ttl = ttl
 
-        return Concepts([cache[key] for key in schemes])
+    def get(self, uri):
+        """
+        Return the `Document` cached for a URI, or `None`
+        """
+        return None
 
-    def getCollections(self, flat=None):
-        cache = self._getCache(flat)
-        collections = self._getAttr('_collections', flat)
+    def put(self, uri, document):
+        """
+        Store the `Document` retrieved for a URI
+        """
+        pass
 
-        return Concepts([cache[key] for key in collections])
+    def isFresh(self, document):
+        """
+        Whether a document can be used without revalidation
+        """
+        return self.ttl is not None and time.time() - document.fetched < self.ttl
 
-class RDFBuilder(object):
+class DirectoryCache(DocumentCache):
     """
-    Creates a RDF graph from Python SKOS objects
-
-    The primary method of this class is `build()`.
-
-    Use the `RDFLoader` class to convert the RDF graph back into the
-    Python SKOS object model.
+    A `DocumentCache` storing documents in a directory
+
+    Each document is stored as a pair of files named after a hash of
+    its URI: one containing the data and one containing its metadata
+    as JSON.  When `max_size` is given the least recently used
+    documents are evicted once the data exceeds that many bytes.  The
+    size of the data is counted once and then kept as a running total,
+    so the directory is only scanned again when documents are evicted.
     """
 
-    def __init__(self):
-        self.SKOS = rdflib.Namespace("http://www.w3.org/2004/02/skos/core#")
-        self.DC = rdflib.Namespace("http://purl.org/dc/elements/1.1/")
+    def __init__(self, directory, ttl=86400, max_size=None):
+        super(DirectoryCache, self).__init__(ttl)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.max_size = max_size
+        self._size = None       # the bytes of data stored, once counted
+        self._lock = threading.Lock() # guards `_size` and eviction
+
+    def _paths(self, uri):
+        if isinstance(uri, unicode):
+            uri = uri.encode('utf-8')
+        base = os.path.join(self.directory, hashlib.sha1(uri).hexdigest())
+        return base + '.rdf', base + '.json'
+
+    def get(self, uri):
+        data_path, meta_path = self._paths(uri)
+        try:
+            with open(meta_path, 'rb') as fh:
+                meta = json.load(fh)
+            with open(data_path, 'rb') as fh:
+                data = fh.read()
+        except (IOError, ValueError):
+            return None
 
-    def getGraph(self):
-        # Instantiate the graph
-        graph = rdflib.Graph()
+        # record the access for the benefit of LRU eviction
+        try:
+            os.utime(data_path, None)
+        except OSError:
+            pass
 
-        # Bind a few prefix, namespace pairs.
-        graph.bind("dc", "http://purl.org/dc/elements/1.1/")
-        graph.bind("skos", "http://www.w3.org/2004/02/skos/core#")
-        return graph
+        return Document(data, meta['content_type'], meta['etag'], meta['last_modified'], meta['fetched'])
 
-    def objectInGraph(self, obj, graph):
-        return (rdflib.term.URIRef(obj.uri), rdflib.term.URIRef(u'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'), rdflib.term.URIRef(u'http://www.w3.org/2004/02/skos/core#%s' % obj.__class__.__name__)) in graph
+    def put(self, uri, document):
+        data_path, meta_path = self._paths(uri)
+        meta = {
+            'uri': uri,
+            'content_type': document.content_type,
+            'etag': document.etag,
+            'last_modified': document.last_modified,
+            'fetched': document.fetched
+            }
 
-    def buildConcept(self, graph, concept):
+        # write to temporary files and rename them so that readers
+        # never see a partially written document
+        written = []
+        for path, content in ((data_path, document.data), (meta_path, json.dumps(meta))):
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(content)
+            written.append((tmp_path, path))
+
+        # documents are stored from the loader's worker threads
+        with self._lock:
+            try:
+                replaced = os.path.getsize(data_path)
+            except OSError:
+                replaced = 0
+            for tmp_path, path in written:
+                os.rename(tmp_path, path)
+
+            if self.max_size is None:
+                return
+            if self._size is not None:
+                self._size += len(document.data) - replaced
+                if self._size <= self.max_size:
+                    return
+            self._evict(self.max_size)
+
+    def evict(self, max_size):
         """
-        Add a `skos.Concept` instance to a RDF graph
+        Remove least recently used documents until at most `max_size`
+        bytes of data remain
         """
-        if self.objectInGraph(concept, graph):
-            return
+        with self._lock:
+            self._evict(max_size)
+
+    def _evict(self, max_size):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.rdf'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= max_size:
+                break
+            for remove in (path, path[:-4] + '.json'):
+                try:
+                    os.remove(remove)
+                except OSError:
+                    pass
+            total -= size
+        self._size = total
 
-        node = rdflib.URIRef(concept.uri)
-        graph.add((node, rdflib.RDF.type, self.SKOS['Concept']))
-        graph.add((node, self.SKOS['notation'], rdflib.Literal(concept.notation)))
-        graph.add((node, self.SKOS['prefLabel'], rdflib.Literal(concept.prefLabel)))
-        graph.add((node, self.SKOS['definition'], rdflib.Literal(concept.definition)))
-        graph.add((node, self.SKOS['altLabel'], rdflib.Literal(concept.altLabel)))
+class Fetcher(object):
+    """
+    Retrieves remote RDF documents for an `RDFLoader`
 
-        for uri, synonym in concept.synonyms.iteritems():
-            graph.add((node, self.SKOS['exactMatch'], rdflib.URIRef(uri)))
-            self.buildConcept(graph, synonym)
+    Subclasses implement `fetch`, allowing the transport used to
+    resolve external resources to be replaced.  Fetchers are called
+    from the loader's worker threads.
+    """
+
+    def fetch(self, uri, headers=None, timeout=None):
+        """
+        Return the `Document` for a URI
+
+        `headers` are additional request headers, such as those of a
+        conditional request.  `None` is returned if a conditional
+        request finds the document to be unmodified.  `timeout` is
+        passed by loaders with a `max_time` budget: the seconds left
+        before the deadline, after which blocking operations should be
+        abandoned.
+        """
+        raise NotImplementedError
+
+def _shorterTimeout(timeout, limit):
+    """
+    Return the shorter of two optional timeouts
+    """
+    if timeout is None:
+        return limit
+    if limit is None:
+        return timeout
+    return min(timeout, limit)
+
+class URLFetcher(Fetcher):
+    """
+    A `Fetcher` using `urllib2`
+
+    `timeout` is the number of seconds after which blocking operations
+    are abandoned, defaulting to the global socket timeout.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    def fetch(self, uri, headers=None, timeout=None):
+        import urllib2
+
+        request = urllib2.Request(uri, headers={'Accept': 'application/rdf+xml, */*;q=0.1'})
+        for name, value in (headers or {}).iteritems():
+            request.add_header(name, value)
+
+        kwargs = {}
+        timeout = _shorterTimeout(self.timeout, timeout)
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        try:
+            response = urllib2.urlopen(request, **kwargs)
+        except urllib2.HTTPError, e:
+            if e.code == 304:
+                return None
+            raise
+
+        try:
+            headers = response.info()
+            return Document(response.read(), headers.gettype(), headers.get('ETag'), headers.get('Last-Modified'))
+        finally:
+            response.close()
+
+class HTTPFetcher(Fetcher):
+    """
+    A `Fetcher` reusing persistent HTTP connections
+
+    Up to `max_idle` keep-alive connections to each host are retained
+    between requests.  The most compact RDF serialisation is requested,
+    responses may be gzip compressed and up to `max_redirects`
+    redirects are followed.  `timeout` is the number of seconds after
+    which blocking operations are abandoned.
+    """
+
+    accept = 'application/n-triples, text/turtle;q=0.9, application/rdf+xml;q=0.8, */*;q=0.1'
+
+    def __init__(self, timeout=None, max_idle=4, max_redirects=5):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_redirects = max_redirects
+        self._idle = {}         # (scheme, netloc) -> [connections]
+        self._lock = threading.Lock()
+
+    def fetch(self, uri, headers=None, timeout=None):
+        import urllib2
+
+        timeout = _shorterTimeout(self.timeout, timeout)
+        for redirect in xrange(self.max_redirects + 1):
+            response, data = self._request(uri, headers, timeout)
+            location = response.getheader('location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                uri = urlparse.urljoin(uri, location)
+                continue
+            if response.status == 304:
+                return None
+            if response.status >= 400:
+                raise urllib2.HTTPError(uri, response.status, response.reason, response.msg, None)
+
+            if response.getheader('content-encoding', '').lower() in ('gzip', 'x-gzip'):
+                data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+            content_type = response.getheader('content-type', '').split(';')[0].strip().lower() or None
+            return Document(data, content_type, response.getheader('etag'), response.getheader('last-modified'))
+
+        raise IOError('too many redirects fetching %s' % uri)
+
+    def close(self):
+        """
+        Close the idle connections
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.itervalues():
+            for connection in connections:
+                connection.close()
+
+    def _request(self, uri, headers, timeout):
+        """
+        Make a GET request, returning the response and its body
+        """
+        import httplib
+
+        scheme, netloc, path, query, fragment = urlparse.urlsplit(uri)
+        if query:
+            path = '%s?%s' % (path, query)
+        request_headers = {'Accept': self.accept, 'Accept-Encoding': 'gzip'}
+        request_headers.update(headers or {})
+
+        key = (scheme, netloc)
+        connection = self._connection(key)
+        reused = connection is not None
+        while True:
+            if connection is None:
+                connection_class = httplib.HTTPSConnection if scheme == 'https' else httplib.HTTPConnection
+                connection = connection_class(netloc, timeout=timeout)
+            try:
+                # an idle connection may have been opened with another timeout
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                connection.request('GET', path or '/', headers=request_headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (httplib.HTTPException, IOError):
+                connection.close()
+                if not reused:
+                    raise
+                # the server may have closed an idle connection
+                connection, reused = None, False
+                continue
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+        return response, data
+
+    def _connection(self, key):
+        with self._lock:
+            try:
+                return self._idle[key].pop()
+            except (KeyError, IndexError):
+                return None
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+class LoaderFuture(object):
+    """
+    The pending result of an `RDFLoader` loading in the background
+
+    The interface follows that of `concurrent.futures.Future`.
+    Callbacks are called with the future from the loading thread once
+    the load has finished.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Return the loader, waiting up to `timeout` seconds for it
+        """
+        exception = self.exception(timeout)
+        if exception is not None:
+            raise exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Return the exception raised by the load, if any
+        """
+        self._event.wait(timeout)  # returns None on Python 2.6
+        if not self._event.is_set():
+            raise LoaderTimeout('the loader was not ready within %s seconds' % timeout)
+        return self._exception
+
+    def add_done_callback(self, callback):
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, result=None, exception=None):
+        with self._lock:
+            self._result = result
+            self._exception = exception
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception('exception calling callback for %r', self)
+
+import rdflib
+from itertools import chain, islice
+
+class _ResolutionBudget(object):
+    """
+    The documents, bytes and time that a resolution may consume
+
+    `allow` is called before each resource is fetched, so a limit is
+    only checked between documents: the document exceeding the byte
+    budget is still parsed, as are documents already being fetched by
+    other workers when the budget runs out.  Fetches are given the time
+    `remaining` as a timeout, so a stalled server cannot hold a
+    resolution past its deadline, and fetches failing once it has
+    passed are `abandon`ed.
+    """
+
+    def __init__(self, stats, max_documents=None, max_bytes=None, max_time=None):
+        self._stats = stats
+        self._lock = threading.Lock()
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.deadline = None if max_time is None else time.time() + max_time
+        self.documents = 0
+        self._bytes = stats.counts.get('bytes', 0)
+        self.exhausted = None   # the name of the budget that ran out
+        self.skipped = set()
+
+    @property
+    def bytes(self):
+        return self._stats.counts.get('bytes', 0) - self._bytes
+
+    def remaining(self):
+        """
+        Return the seconds left before the deadline, or `None`
+        """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.time(), 0.001) # 0 would not block
+
+    def allow(self, uri):
+        """
+        Return whether a resource may be fetched, consuming a document
+        """
+        with self._lock:
+            if self.exhausted is None:
+                if self.max_documents is not None and self.documents >= self.max_documents:
+                    self.exhausted = 'documents'
+                elif self.max_bytes is not None and self.bytes >= self.max_bytes:
+                    self.exhausted = 'bytes'
+                elif self.deadline is not None and time.time() >= self.deadline:
+                    self.exhausted = 'time'
+                else:
+                    self.documents += 1
+                    return True
+
+            self.skipped.add(uri)
+            return False
+
+    def abandon(self, uri):
+        """
+        Record a fetch failing at the deadline as the time running out
+
+        `False` is returned if the deadline has not passed.
+        """
+        if self.deadline is None or time.time() < self.deadline:
+            return False
+        with self._lock:
+            if self.exhausted is None:
+                self.exhausted = 'time'
+            self.skipped.add(uri)
+        return True
+
+class _TripleIndex(object):
+    """
+    SKOS statements bucketed by subject and predicate
+
+    The index is populated by a single pass over an iterable of
+    triples, retaining only the statements used to build the object
+    model.  Building objects from the buckets avoids the repeated
+    store lookups entailed by querying a graph for each object.
+    """
+
+    # SKOS types mapped to their URI
+    types = dict((type_, rdflib.URIRef('http://www.w3.org/2004/02/skos/core#%s' % type_)) for type_ in (
+        'Concept',
+        'Collection',
+        'ConceptScheme'
+        ))
+
+    # label predicates in order of preference
+    label_predicates = (
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#prefLabel'),
+        rdflib.URIRef('http://www.w3.org/2000/01/rdf-schema#label'),
+        )
+
+    # predicates with literal values indexed by subject
+    value_predicates = frozenset(label_predicates + (
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#definition'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#notation'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#altLabel'),
+        rdflib.URIRef('http://purl.org/dc/terms/title'),
+        rdflib.URIRef('http://purl.org/dc/elements/1.1/title'),
+        rdflib.URIRef('http://purl.org/dc/terms/description'),
+        rdflib.URIRef('http://purl.org/dc/elements/1.1/description'),
+        rdflib.URIRef('http://purl.org/dc/terms/date'),
+        rdflib.URIRef('http://purl.org/dc/elements/1.1/date'),
+        ))
+
+    # predicates relating objects to each other
+    relation_predicates = frozenset((
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#broader'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#narrower'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#related'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#exactMatch'),
+        rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'),
+        rdflib.URIRef('http://www.w3.org/2004/02/skos/core#member'),
+        ))
+
+    def __init__(self, triples=()):
+        self._subjects = dict((uri, set()) for uri in self.types.itervalues())
+        self.values = {}        # subject -> predicate -> [objects]
+        self.relations = dict((predicate, []) for predicate in self.relation_predicates)
+
+        # map each indexed predicate to the bucket receiving it, so
+        # that a single lookup classifies each triple
+        self._buckets = dict((predicate, None) for predicate in self.value_predicates)
+        self._buckets.update(self.relations)
+        self._buckets[rdflib.RDF.type] = self._subjects
+        self.update(triples)
+
+    def update(self, triples):
+        """
+        Add the statements in an iterable of triples to the index
+        """
+        buckets = self._buckets
+        values = self.values
+        subjects = self._subjects
+        for subject, predicate, object_ in triples:
+            try:
+                bucket = buckets[predicate]
+            except KeyError:
+                continue        # not a statement we're interested in
+
+            if bucket is None:
+                try:
+                    objects = values[subject]
+                except KeyError:
+                    objects = values[subject] = {}
+                try:
+                    objects[predicate].append(object_)
+                except KeyError:
+                    objects[predicate] = [object_]
+            elif bucket is subjects:
+                try:
+                    subjects[object_].add(subject)
+                except KeyError:
+                    pass        # not a SKOS type
+            else:
+                bucket.append((subject, object_))
+
+    def triple(self, subject, predicate, object_):
+        """
+        Add a single statement to the index
+
+        This allows the index to be used as the sink of an `rdflib`
+        N-Triples parser.
+        """
+        self.update(((subject, predicate, object_),))
+
+    def merge(self, other):
+        """
+        Add the statements held by another index
+        """
+        values = self.values
+        for subject, objects in other.values.iteritems():
+            try:
+                existing = values[subject]
+            except KeyError:
+                values[subject] = objects
+                continue
+            for predicate, values_ in objects.iteritems():
+                existing.setdefault(predicate, []).extend(values_)
+
+        for predicate, pairs in other.relations.iteritems():
+            self.relations[predicate].extend(pairs)
+
+        for type_, subjects in other._subjects.iteritems():
+            self._subjects[type_].update(subjects)
+
+    def subjects(self, type_):
+        """
+        Return the subjects of a specific SKOS type
+        """
+        return self._subjects[self.types[type_]]
+
+    def value(self, subject, predicate):
+        """
+        Return the first indexed value of a predicate, or `None`
+        """
+        try:
+            return self.values[subject][predicate][0]
+        except KeyError:
+            return None
+
+class LoaderStats(object):
+    """
+    Timings and counts gathered by an `RDFLoader`
+
+    `timings` maps the name of each loading phase to the seconds spent
+    in it: `index` (indexing the triples or mapping a snapshot),
+    `resolve` (resolving external resources), `concepts`,
+    `collections` and `schemes` (building objects), `snapshot`
+    (building objects from a snapshot) and `relations` (wiring the
+    objects together).
+    `counts` maps `concepts`, `collections`, `schemes`, `edges`,
+    `documents` and `bytes` to the number of objects built, relations
+    wired, external resources parsed and bytes read from them.
+    Repeated loads accumulate.
+
+    Each of the `callbacks` is called as `callback(kind, name, value)`
+    whenever a timing (`kind` being `'timing'`) or a count (`'count'`)
+    is recorded, allowing the values to be forwarded to a metrics
+    system.
+    """
+
+    def __init__(self, callbacks=()):
+        self.callbacks = list(callbacks)
+        self.timings = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed code as part of a phase
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._record(self.timings, 'timing', name, time.time() - start)
+
+    def count(self, name, value=1):
+        self._record(self.counts, 'count', name, value)
+
+    def _record(self, values, kind, name, value):
+        # counts are made from the resolution threads
+        with self._lock:
+            values[name] = values.get(name, 0) + value
+        for callback in self.callbacks:
+            callback(kind, name, value)
+
+    def __repr__(self):
+        return '<%s(timings=%r, counts=%r)>' % (self.__class__.__name__, self.timings, self.counts)
+
+class _CountingStream(object):
+    """
+    A file-like wrapper counting the bytes read from a stream
+    """
+
+    def __init__(self, stream, count):
+        self._stream = stream
+        self._count = count
+
+    def read(self, *args):
+        data = self._stream.read(*args)
+        self._count(len(data))
+        return data
+
+    def readline(self, *args):
+        data = self._stream.readline(*args)
+        self._count(len(data))
+        return data
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+class _LazyConcepts(Concepts):
+    """
+    A `Concepts` container building its values when accessed
+
+    Membership is determined from a set of URIs, so the container can
+    be sized and tested without building any objects.
+    """
+
+    def __init__(self, keys, get):
+        # the keys are only copied when the container is modified
+        if not isinstance(keys, collections.Set):
+            keys = frozenset(keys)
+        self._keys = keys
+        self._copied = False
+        self._get = get
+        self._concepts = {}     # values added to the container
+
+    def _ownKeys(self):
+        if not self._copied:
+            self._keys = set(self._keys)
+            self._copied = True
+        return self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __contains__(self, value):
+        try:
+            value = value.uri
+        except AttributeError:
+            pass
+        return value in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, value):
+        self._ownKeys().add(value.uri)
+        self._concepts[value.uri] = value
+
+    def discard(self, value):
+        self._ownKeys().discard(value.uri)
+        self._concepts.pop(value.uri, None)
+
+    def pop(self):
+        value = self[iter(self._keys).next()]
+        self.discard(value)
+        return value
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        try:
+            return self._concepts[key]
+        except KeyError:
+            return self._get(key)
+
+    def __delitem__(self, key):
+        self.discard(self[key])
+
+    def __eq__(self, other):
+        return dict(self.iteritems()) == other
+
+    def __str__(self):
+        return str(dict(self.iteritems()))
+
+    def __repr__(self):
+        return repr(dict(self.iteritems()))
+
+class _RecentObjects(object):
+    """
+    Strong references to recently used objects
+
+    This approximates a least recently used cache using two
+    generations: objects are added to the current generation, which
+    becomes the previous generation once it holds `size` objects.
+    Objects used from the previous generation are promoted back to the
+    current one.  At least the `size` most recently used objects are
+    retained, and fewer than twice as many.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._current = {}
+        self._previous = {}
+
+    def add(self, key, value):
+        self._previous.pop(key, None)
+        self._current[key] = value
+        if len(self._current) >= self.size:
+            self._previous = self._current
+            self._current = {}
+
+    def __len__(self):
+        return len(self._current) + len(self._previous)
+
+class _URITable(dict):
+    """
+    Memoised URI normalisation
+
+    Looking up a URI returns its normalised form, calling the
+    normalisation function only the first time the URI is seen.  Every
+    URI normalising to the same value is given the same string object,
+    so the objects and relations built from them share one string per
+    URI.
+    """
+
+    def __init__(self, normalise_uri):
+        self.normalise_uri = normalise_uri
+        self._canonical = {}
+
+    def __missing__(self, uri):
+        value = self.normalise_uri(uri)
+        value = self[uri] = self._canonical.setdefault(value, value)
+        return value
+
+    def forget(self):
+        """
+        Release the memoised URIs, retaining the canonical strings
+        """
+        self.clear()
+
+# the relationship attributes populated on demand for lazily loaded
+# objects
+_lazy_attributes = (
+    'broader',
+    'narrower',
+    '_related_left',
+    '_related_right',
+    '_synonyms_left',
+    '_synonyms_right',
+    'collections',
+    'members'
+    )
+
+_lazy_listening = []
+def _listenForLazyRelations():
+    """
+    Populate the relations of lazily loaded objects on first access
+
+    SQLAlchemy fires an `init_collection` event when an empty
+    collection is first created for an attribute, which is when
+    objects built by a lazy `RDFLoader` have their relations filled.
+    The collection is filled directly, without firing events, as both
+    sides of each relation are populated from the same index.  Any
+    relations still pending when an object is added to a session are
+    filled first, so that they are saved with it and cascade to the
+    related objects.
+    """
+    if _lazy_listening:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import configure_mappers, Session
+    from sqlalchemy.orm.events import AttributeEvents
+    if not hasattr(AttributeEvents, 'init_collection'):
+        raise NotImplementedError('lazy loading requires SQLAlchemy >= 1.0')
+
+    def listener(key):
+        def init_collection(target, collection, adapter):
+            try:
+                loader, pending = target.__dict__['_skos_lazy']
+            except KeyError:
+                return
+            if key in pending:
+                pending.discard(key)
+                loader._populate(target, key, collection)
+        return init_collection
+
+    configure_mappers()         # create the backref attributes
+    for cls in (Concept, Collection):
+        for key in _lazy_attributes:
+            try:
+                attribute = getattr(cls, key)
+            except AttributeError:
+                continue
+            event.listen(attribute, 'init_collection', listener(key))
+
+    def before_attach(session, instance):
+        try:
+            loader, pending = instance.__dict__['_skos_lazy']
+        except KeyError:
+            return
+        cls = type(instance)
+        for key in list(pending):
+            if hasattr(cls, key):
+                getattr(instance, key)  # fires `init_collection`
+
+    event.listen(Session, 'before_attach', before_attach)
+    _lazy_listening.append(True)
+
+# the active `ChangeTracker` instances, as the keys of a weak mapping
+# because `weakref.WeakSet` requires Python 2.7
+_trackers = weakref.WeakKeyDictionary()
+
+_change_listening = []
+def _listenForChanges():
+    """
+    Notify the active `ChangeTracker` instances of modified objects
+
+    SQLAlchemy fires attribute events before a value is set or a
+    relation changes, so trackers can describe an object as it was
+    before its first change.
+    """
+    if _change_listening:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import configure_mappers
+    from sqlalchemy.orm.properties import ColumnProperty, RelationshipProperty
+
+    def changed(target, *args):
+        for tracker in list(_trackers):
+            tracker._changed(target)
+
+    configure_mappers()         # create the backref attributes
+    for cls in (Concept, Collection):
+        for prop in cls.__mapper__.iterate_properties:
+            attribute = getattr(cls, prop.key)
+            if isinstance(prop, ColumnProperty):
+                event.listen(attribute, 'set', changed)
+            elif isinstance(prop, RelationshipProperty):
+                event.listen(attribute, 'append', changed)
+                event.listen(attribute, 'remove', changed)
+    _change_listening.append(True)
+
+class ChangeTracker(object):
+    """
+    Records the `Concept` and `Collection` instances changed since a checkpoint
+
+    Each object is described by the `RDFBuilder` when it is first
+    changed, allowing `RDFBuilder.delta` to compare that description
+    with its current one.  Objects created while the tracker is active
+    have no prior description, so a tracker should be checkpointed once
+    its objects are loaded.
+    """
+
+    def __init__(self, builder=None):
+        if builder is None:
+            builder = RDFBuilder()
+        self.builder = builder
+        self._before = {}       # id -> (object, triples)
+        _listenForChanges()
+        _trackers[self] = True
+
+    @property
+    def changed(self):
+        """
+        The objects changed since the checkpoint
+        """
+        return [obj for obj, triples in self._before.itervalues()]
+
+    def checkpoint(self):
+        """
+        Forget the changes made so far
+        """
+        self._before.clear()
+
+    def close(self):
+        """
+        Stop tracking changes
+        """
+        _trackers.pop(self, None)
+        self._before.clear()
+
+    def _changed(self, obj):
+        # objects are keyed by identity as they hash by their values
+        key = id(obj)
+        if key in self._before:
+            return
+        if obj.uri is None:     # being constructed
+            triples = frozenset()
+        else:
+            triples = frozenset(self.builder._describeObject(obj))
+        self._before[key] = (obj, triples)
+
+# the `Hierarchy` instances maintained as concepts change, held like
+# `_trackers`
+_hierarchies = weakref.WeakKeyDictionary()
+
+_hierarchy_listening = []
+def _listenForHierarchyChanges():
+    """
+    Update the maintained `Hierarchy` instances as concepts change
+
+    Changes to `Concept.narrower` update `Concept.broader` through its
+    backref, so only the latter is listened to.
+    """
+    if _hierarchy_listening:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import configure_mappers
+
+    def append(target, value, initiator):
+        for hierarchy in list(_hierarchies):
+            if hierarchy._owns(target) or hierarchy._owns(value):
+                hierarchy.add(target.uri, value.uri)
+
+    def remove(target, value, initiator):
+        for hierarchy in list(_hierarchies):
+            if hierarchy._owns(target) or hierarchy._owns(value):
+                hierarchy.discard(target.uri, value.uri)
+
+    configure_mappers()         # create the backref attributes
+    event.listen(Concept.broader, 'append', append)
+    event.listen(Concept.broader, 'remove', remove)
+    _hierarchy_listening.append(True)
+
+class Hierarchy(object):
+    """
+    The transitive closure of the broader relation between concepts
+
+    The ancestors and descendants of every concept are precomputed, so
+    testing whether one concept is under another takes constant time
+    and listing them is proportional to their number.  Concepts are
+    identified by their URIs, and concepts or URIs are accepted
+    wherever a concept is expected.  The depth of a concept is the
+    least number of broader steps to a concept without broader
+    concepts, and is `None` when every path leads around a cycle.  A
+    concept on a cycle is its own ancestor and descendant.
+    """
+
+    def __init__(self, edges=(), uris=()):
+        """
+        `edges` are `(narrower, broader)` URIs and `uris` any further
+        concepts without relations
+        """
+        self._parents = {}      # uri -> broader uris
+        self._children = {}     # uri -> narrower uris
+        for uri in uris:
+            self._node(uri)
+        for narrower, broader in edges:
+            self._node(narrower).add(broader)
+            self._node(broader)
+            self._children[broader].add(narrower)
+
+        self._ancestors = {}
+        self._descendants = {}
+        self._depths = {}
+        self._owns = lambda obj: False
+        self._close(self._parents, self._parents, self._ancestors)
+        self._close(self._children, self._children, self._descendants)
+        self._updateDepths(self._parents)
+
+    def _node(self, uri):
+        try:
+            return self._parents[uri]
+        except KeyError:
+            self._children[uri] = set()
+            self._parents[uri] = parents = set()
+            return parents
+
+    def _close(self, uris, links, closure):
+        """
+        Compute the closure of `links` for each URI in `uris`
+
+        The closures of the other URIs are already complete and are
+        reused rather than traversed.
+        """
+        pending = set(uris)
+        for uri in uris:
+            reached = set()
+            stack = list(links[uri])
+            while stack:
+                other = stack.pop()
+                if other in reached:
+                    continue
+                reached.add(other)
+                if other in pending:
+                    stack.extend(links[other])
+                else:
+                    reached.update(closure[other])
+            closure[uri] = reached
+            pending.discard(uri)
+
+    def _updateDepths(self, uris):
+        """
+        Recompute the depths of `uris`, which include their descendants
+        """
+        depths = self._depths
+        for uri in uris:
+            depths.pop(uri, None)
+
+        # search outwards from the nearest known depths
+        heap = []
+        for uri in uris:
+            parents = self._parents[uri]
+            if not parents:
+                heap.append((0, uri))
+                continue
+            known = [depths[parent] for parent in parents if parent in depths]
+            if known:
+                heap.append((min(known) + 1, uri))
+        heapq.heapify(heap)
+        while heap:
+            depth, uri = heapq.heappop(heap)
+            if uri in depths:
+                continue
+            depths[uri] = depth
+            for child in self._children[uri]:
+                if child not in depths:
+                    heapq.heappush(heap, (depth + 1, child))
+
+    def __contains__(self, concept):
+        return _uriOf(concept) in self._parents
+
+    def __len__(self):
+        return len(self._parents)
+
+    def ancestors(self, concept):
+        """
+        Return the URIs of all the concepts broader than a concept
+        """
+        return frozenset(self._ancestors[_uriOf(concept)])
+
+    def descendants(self, concept):
+        """
+        Return the URIs of all the concepts narrower than a concept
+        """
+        return frozenset(self._descendants[_uriOf(concept)])
+
+    def is_descendant_of(self, concept, ancestor):
+        """
+        Test whether a concept is anywhere under another
+        """
+        return _uriOf(ancestor) in self._ancestors[_uriOf(concept)]
+
+    def depth(self, concept):
+        """
+        Return the depth of a concept below the top of the hierarchy
+        """
+        uri = _uriOf(concept)
+        if uri not in self._parents:
+            raise KeyError(uri)
+        return self._depths.get(uri)
+
+    def add(self, concept, broader):
+        """
+        Add a broader concept to a concept
+        """
+        uri, broader = _uriOf(concept), _uriOf(broader)
+        if broader in self._parents.get(uri, ()):
+            return
+        for node in (uri, broader):
+            if node not in self._parents:
+                self._node(node)
+                self._ancestors[node] = set()
+                self._descendants[node] = set()
+                self._depths[node] = 0
+        self._parents[uri].add(broader)
+        self._children[broader].add(uri)
+
+        up = self._ancestors[broader] | set([broader])
+        down = self._descendants[uri] | set([uri])
+        for node in down:
+            self._ancestors[node].update(up)
+        for node in up:
+            self._descendants[node].update(down)
+        self._updateDepths(self._descendants[uri] | set([uri]))
+
+    def discard(self, concept, broader):
+        """
+        Remove a broader concept from a concept if present
+        """
+        uri, broader = _uriOf(concept), _uriOf(broader)
+        if broader not in self._parents.get(uri, ()):
+            return
+        up = self._ancestors[broader] | set([broader])
+        down = self._descendants[uri] | set([uri])
+        self._parents[uri].discard(broader)
+        self._children[broader].discard(uri)
+
+        # only the closures passing through the edge can change
+        self._close(down, self._parents, self._ancestors)
+        self._close(up, self._children, self._descendants)
+        self._updateDepths(down)
+
+def _uriOf(concept):
+    return getattr(concept, 'uri', concept)
+
+def _chunks(values, size=500):
+    """
+    Split values into lists small enough for an SQL `IN` clause
+    """
+    values = list(values)
+    for i in xrange(0, len(values), size):
+        yield values[i:i + size]
+
+def _checkSQLAlchemy(feature):
+    """
+    Ensure SQLAlchemy supports finding event listeners and typed textual
+    queries, which were added in version 0.9
+    """
+    from sqlalchemy import event
+    if not hasattr(event, 'contains'):
+        raise NotImplementedError('%s requires SQLAlchemy >= 0.9' % feature)
+
+def build_closure(bind):
+    """
+    Create and fill the `concept_closure` table from `concept_broader`
+
+    `bind` is an engine or connection.  Any existing rows are
+    replaced.
+    """
+    from sqlalchemy import select
+    from sqlalchemy.engine import Engine
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            return build_closure(connection)
+
+    concept_closure.create(bind, checkfirst=True)
+    with bind.begin():
+        bind.execute(concept_closure.delete())
+        query = select([concept_broader.c.narrower_uri]).distinct()
+        uris = set(row[0] for row in bind.execute(query))
+        _refreshClosure(bind, uris, uris)
+
+def maintain_closure(target):
+    """
+    Keep the `concept_closure` table up to date as concepts are flushed
+
+    `target` is a `Session` or `sessionmaker` instance or class.  The
+    rows describing the concepts whose broader concepts change, and
+    their descendants, are recomputed within the flush.
+    """
+    from sqlalchemy import event
+    _checkSQLAlchemy('maintaining the closure table')
+    if not event.contains(target, 'after_flush', _closureAfterFlush):
+        event.listen(target, 'after_flush', _closureAfterFlush)
+
+def _closureAfterFlush(session, flush_context):
+    from sqlalchemy.orm.attributes import get_history, PASSIVE_NO_INITIALIZE
+
+    changed = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Concept):
+            continue
+        if obj in session.new or obj in session.deleted:
+            changed.add(obj.uri)
+        else:
+            history = get_history(obj, 'broader', passive=PASSIVE_NO_INITIALIZE)
+            if history.added or history.deleted:
+                changed.add(obj.uri)
+        # children gaining or losing this parent through `narrower` may
+        # not have their `broader` collection loaded
+        history = get_history(obj, 'narrower', passive=PASSIVE_NO_INITIALIZE)
+        for child in chain(history.added or (), history.deleted or ()):
+            changed.add(child.uri)
+    if changed:
+        _refreshClosure(session.connection(), changed)
+
+def _refreshClosure(connection, changed, descendants=None):
+    """
+    Recompute the closure rows of concepts whose broader concepts changed
+
+    Only the rows of the changed concepts and of their descendants, as
+    recorded before the change, can be affected.  The ancestors of the
+    other concepts are current and are looked up rather than
+    traversed.
+    """
+    from sqlalchemy import select
+    closure, edges = concept_closure, concept_broader
+    if descendants is None:
+        descendants = set(changed)
+        for uris in _chunks(changed):
+            query = select([closure.c.descendant_uri]).where(closure.c.ancestor_uri.in_(uris))
+            descendants.update(row[0] for row in connection.execute(query))
+    for uris in _chunks(descendants):
+        connection.execute(closure.delete().where(closure.c.descendant_uri.in_(uris)))
+
+    parents = {}
+    for uris in _chunks(descendants):
+        query = select([edges.c.narrower_uri, edges.c.broader_uri]).where(edges.c.narrower_uri.in_(uris))
+        for narrower, broader in connection.execute(query):
+            parents.setdefault(narrower, set()).add(broader)
+    outside = set()
+    for broaders in parents.itervalues():
+        outside.update(broaders)
+    outside.difference_update(descendants)
+    ancestors = dict((uri, []) for uri in outside)
+    for uris in _chunks(outside):
+        query = select([closure.c.descendant_uri, closure.c.ancestor_uri, closure.c.depth]).where(closure.c.descendant_uri.in_(uris))
+        for descendant, ancestor, depth in connection.execute(query):
+            ancestors[descendant].append((ancestor, depth))
+
+    rows = []
+    for uri in descendants:
+        # the least steps to each ancestor, leaving the affected
+        # concepts through ancestors which are up to date
+        depths = {}
+        heap = [(1, parent) for parent in parents.get(uri, ())]
+        heapq.heapify(heap)
+        while heap:
+            depth, ancestor = heapq.heappop(heap)
+            if ancestor in depths:
+                continue
+            depths[ancestor] = depth
+            if ancestor in descendants:
+                for parent in parents.get(ancestor, ()):
+                    heapq.heappush(heap, (depth + 1, parent))
+            else:
+                # the ancestors reached through closure rows are final
+                for further, steps in ancestors.get(ancestor, ()):
+                    heapq.heappush(heap, (depth + steps, further))
+        for ancestor, depth in depths.iteritems():
+            rows.append({'ancestor_uri': ancestor, 'descendant_uri': uri, 'depth': depth})
+    if rows:
+        connection.execute(closure.insert(), rows)
+
+def ancestors_query(session, concept, closure=False):
+    """
+    Query the concepts broader than a concept, with their depths
+
+    The query yields `(Concept, depth)` tuples in order of depth,
+    where the depth is the least number of broader steps from the
+    concept, using a single SQL statement.  The `concept_closure`
+    table is used if `closure` is true, and a recursive common table
+    expression over `concept_broader` otherwise.
+    """
+    return _closureQuery(session, _uriOf(concept), closure, 'descendant_uri', 'ancestor_uri')
+
+def descendants_query(session, concept, closure=False):
+    """
+    Query the concepts narrower than a concept, with their depths
+
+    See `ancestors_query`.
+    """
+    return _closureQuery(session, _uriOf(concept), closure, 'ancestor_uri', 'descendant_uri')
+
+def _closureQuery(session, uri, closure, source, target):
+    from sqlalchemy import text
+    if closure:
+        rows = concept_closure
+        query = session.query(Concept, rows.c.depth).join(rows, Concept.uri == rows.c[target])
+        query = query.filter(rows.c[source] == uri)
+        return query.order_by(rows.c.depth, Concept.uri)
+
+    _checkSQLAlchemy('recursive hierarchy queries')
+
+    # follow the edges breadth first, stopping paths once they are
+    # longer than the number of edges so that cycles end.  The common
+    # table expression is nested in a subquery as Python 2's sqlite3
+    # module loses the columns of statements starting with WITH which
+    # return no rows.
+    near, far = ('narrower_uri', 'broader_uri') if target == 'ancestor_uri' else ('broader_uri', 'narrower_uri')
+    rows = text("""
+        WITH RECURSIVE steps(uri, depth) AS (
+            SELECT %(far)s, 1 FROM concept_broader WHERE %(near)s = :uri
+            UNION
+            SELECT edges.%(far)s, steps.depth + 1 FROM concept_broader AS edges, steps
+            WHERE edges.%(near)s = steps.uri AND steps.depth < (SELECT count(*) FROM concept_broader))
+        SELECT uri, min(depth) AS depth FROM steps GROUP BY uri""" % {'near': near, 'far': far})
+    rows = rows.bindparams(uri=uri).columns(uri=String, depth=Integer).alias('rows')
+    query = session.query(Concept, rows.c.depth).join(rows, Concept.uri == rows.c.uri)
+    return query.order_by(rows.c.depth, Concept.uri)
+
+# the optional full-text index of concepts, an SQLite FTS5 table
+# ranking matches in preferred labels above alternative labels and
+# definitions
+_search_columns = ('prefLabel', 'altLabel', 'definition')
+_search_table = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS concept_search USING fts5(
+        uri UNINDEXED, prefLabel, altLabel, definition,
+        tokenize = 'unicode61 remove_diacritics 2')"""
+_search_rank = 'bm25(concept_search, 0.0, 10.0, 5.0, 1.0)'
+
+def _checkSearchDialect(bind):
+    if bind.dialect.name != 'sqlite':
+        raise NotImplementedError('full-text search requires SQLite with FTS5, found: %s' % bind.dialect.name)
+
+def build_search_index(bind):
+    """
+    Create and fill the `concept_search` full-text index of concepts
+
+    `bind` is an engine or connection to an SQLite database with the
+    FTS5 extension.  Any existing entries are replaced.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.engine import Engine
+    _checkSearchDialect(bind)
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            return build_search_index(connection)
+
+    with bind.begin():
+        bind.execute(text(_search_table))
+        bind.execute(text('DELETE FROM concept_search'))
+        bind.execute(text('INSERT INTO concept_search (uri, %(columns)s) SELECT uri, %(columns)s FROM concept' % {
+                    'columns': ', '.join(_search_columns)}))
+
+def maintain_search_index(target):
+    """
+    Keep the `concept_search` index up to date as concepts are flushed
+
+    `target` is a `Session` or `sessionmaker` instance or class.  The
+    entries of concepts which are added, deleted or have their labels
+    or definition changed are replaced within the flush.  The database
+    of a bound target must be SQLite with the FTS5 extension.
+    """
+    from sqlalchemy import event
+    _checkSQLAlchemy('maintaining the full-text index')
+    bind = getattr(target, 'bind', None) or getattr(target, 'kw', {}).get('bind')
+    if bind is not None:
+        _checkSearchDialect(bind)
+    if not event.contains(target, 'after_flush', _searchAfterFlush):
+        event.listen(target, 'after_flush', _searchAfterFlush)
+
+def _searchAfterFlush(session, flush_context):
+    from sqlalchemy import text
+    from sqlalchemy.orm.attributes import get_history, PASSIVE_NO_INITIALIZE
+
+    removed = set()
+    added = {}
+    for obj in session.deleted:
+        if isinstance(obj, Concept):
+            removed.add(obj.uri)
+    for obj in chain(session.new, session.dirty):
+        if not isinstance(obj, Concept) or obj in session.deleted:
+            continue
+        if obj not in session.new:
+            for name in _search_columns:
+                if get_history(obj, name, passive=PASSIVE_NO_INITIALIZE).has_changes():
+                    break
+            else:
+                continue        # the indexed columns are unchanged
+            removed.add(obj.uri)
+        added[obj.uri] = dict((name, getattr(obj, name)) for name in _search_columns)
+
+    if not (removed or added):
+        return
+    connection = session.connection()
+    for uris in _chunks(removed):
+        statement = 'DELETE FROM concept_search WHERE uri IN (%s)' % ', '.join([':uri%d' % i for i in xrange(len(uris))])
+        connection.execute(text(statement), dict(('uri%d' % i, uri) for i, uri in enumerate(uris)))
+    if added:
+        rows = [dict(values, uri=uri) for uri, values in added.iteritems()]
+        statement = 'INSERT INTO concept_search (uri, %s) VALUES (:uri, %s)' % (
+            ', '.join(_search_columns), ', '.join([':%s' % name for name in _search_columns]))
+        connection.execute(text(statement), rows)
+
+def _searchExpression(query, prefix):
+    """
+    Return an FTS5 expression matching every word of a query
+    """
+    words = ['"%s"' % word for word in _labelTokens(query)]
+    if words and prefix:
+        words[-1] += '*'
+    return ' '.join(words)
+
+def search_query(session, query, prefix=True):
+    """
+    Query the concepts matching a full-text search, best first
+
+    Every word of the query must appear in the preferred label,
+    alternative label or definition of a concept, and the last word
+    may be the start of a word if `prefix` is true.  Matches in labels
+    rank above matches in definitions.  The query is answered by the
+    `concept_search` index in a single SQL statement, so concepts which
+    do not match are never loaded.
+    """
+    from sqlalchemy import text, false
+    _checkSQLAlchemy('full-text search')
+    expression = _searchExpression(query, prefix)
+    if not expression:
+        return session.query(Concept).filter(false())
+    matches = text('SELECT uri, %s AS rank FROM concept_search WHERE concept_search MATCH :expression' % _search_rank)
+    matches = matches.bindparams(expression=expression).columns(uri=String, rank=Float).alias('matches')
+    concepts = session.query(Concept).join(matches, Concept.uri == matches.c.uri)
+    return concepts.order_by(matches.c.rank, Concept.uri)
+
+_label_token = re.compile(r'\w+', re.UNICODE)
+
+def _labelTokens(label):
+    """
+    Return the case and accent folded words in a label
+    """
+    if not isinstance(label, unicode):
+        label = label.decode('utf-8')
+    label = unicodedata.normalize('NFKD', label)
+    label = u''.join([char for char in label if not unicodedata.combining(char)])
+    return _label_token.findall(label.lower())
+
+class LabelIndex(object):
+    """
+    A prefix index of the preferred and alternative labels of concepts
+
+    Labels are folded to lower case without accents and split into
+    words, which are held in a sorted array searched by bisection.  As
+    queries are typed, a search matches the concepts with every word of
+    the query in a label, the last of which may be the start of a word.
+    Matches are ranked by their words, preferred labels first.
+    The index is built from a `Concepts` container, an `RDFLoader`, of
+    whose concepts all are indexed, or any iterable of concepts, and
+    `add` reindexes a concept whose labels change.
+    """
+
+    def __init__(self, concepts=()):
+        if hasattr(concepts, 'getConcepts'):
+            concepts = concepts.getConcepts(flat=True)
+        if isinstance(concepts, collections.Mapping):
+            concepts = concepts.itervalues()
+        self._concepts = {}     # uri -> entries
+        entries = []
+        for concept in concepts:
+            self._concepts[concept.uri] = added = self._entries(concept)
+            entries.extend(added)
+        entries.sort()
+        self._sorted = entries  # (word, kind, uri, label, words)
+
+    def _entries(self, concept):
+        entries = []
+        uri = concept.uri
+        for kind, label in enumerate((concept.prefLabel, concept.altLabel)):
+            if not label:
+                continue
+            words = tuple(_labelTokens(label))
+            for word in set(words):
+                entries.append((word, kind, uri, label, words))
+        return entries
+
+    def __contains__(self, concept):
+        return _uriOf(concept) in self._concepts
+
+    def __len__(self):
+        return len(self._concepts)
+
+    def add(self, concept):
+        """
+        Index the labels of a concept, replacing any indexed before
+        """
+        self.discard(concept)
+        self._concepts[concept.uri] = entries = self._entries(concept)
+        for entry in entries:
+            bisect.insort(self._sorted, entry)
+
+    def discard(self, concept):
+        """
+        Remove the labels of a concept from the index if present
+        """
+        for entry in self._concepts.pop(_uriOf(concept), ()):
+            del self._sorted[bisect.bisect_left(self._sorted, entry)]
+
+    def _range(self, word, whole=False):
+        """
+        Return the slice of entries for the words starting with `word`,
+        or for `word` itself if `whole` is true
+        """
+        end = word + (u'\x00' if whole else u'\uffff')
+        return bisect.bisect_left(self._sorted, (word,)), bisect.bisect_left(self._sorted, (end,))
+
+    def search(self, query, limit=10):
+        """
+        Return the `(uri, label)` of up to `limit` concepts matching a query
+        """
+        words = _labelTokens(query)
+        if not words:
+            return []
+
+        # scan the entries for the word matching least, checking the
+        # labels found against the other words
+        ranges = [self._range(word, True) for word in words[:-1]] + [self._range(words[-1])]
+        size, start, stop, i = min((stop - start, start, stop, i) for i, (start, stop) in enumerate(ranges))
+        complete = set(words[:i] + words[i + 1:-1])
+        prefix = words[-1] if i != len(words) - 1 else None
+        results = []
+        found = set()
+        entries = self._sorted
+        for i in xrange(start, stop):
+            word, kind, uri, label, label_words = entries[i]
+            if uri in found:
+                continue
+            if complete and not complete.issubset(label_words):
+                continue
+            if prefix is not None and not any(label_word.startswith(prefix) for label_word in label_words):
+                continue
+            found.add(uri)
+            results.append((uri, label))
+            if len(results) == limit:
+                break
+        return results
+
+class _Snapshot(object):
+    """
+    A memory mapped binary snapshot of the objects of an `RDFLoader`
+
+    The file starts with a magic string and a table of the offset and
+    length of each section.  Strings (URIs and literal values) are
+    stored once as UTF-8 data indexed by an array of offsets.  Objects
+    are stored sorted by URI as fixed size records of string indices,
+    so they can be found by binary search, and each relation is stored
+    in both directions as arrays of the indices of the related objects.
+    Values are only decoded when they are accessed, so opening a
+    snapshot is fast and processes mapping the same file share its
+    pages.
+    """
+
+    magic = 'SKOSSNP1'
+
+    types = ('Concept', 'Collection', 'ConceptScheme')
+    relations = ('broader', 'related', 'synonyms', 'members')
+    label_attrs = ('prefLabel', 'definition', 'altLabel')
+
+    # the bits flagging the loader views an object belongs to
+    views = {
+        '_concepts': 1,
+        '_collections': 2,
+        '_schemes': 4,
+        '_flat_concepts': 8,
+        '_flat_collections': 16,
+        '_flat_schemes': 32
+        }
+    view_mask = 7
+    flat_view_mask = 56
+    has_labels = 64
+
+    # the relation and direction populating each lazily loaded
+    # attribute
+    attributes = {
+        'broader': ('broader', 0),
+        'narrower': ('broader', 1),
+        '_related_left': ('related', 0),
+        '_related_right': ('related', 1),
+        '_synonyms_left': ('synonyms', 0),
+        '_synonyms_right': ('synonyms', 1),
+        'members': ('members', 0),
+        'collections': ('members', 1)
+        }
+
+    # type, uri, four values and flags
+    _record = struct.Struct('<7i')
+
+    # the sections following the string offsets, string data and
+    # records: the offsets and targets of each relation in each
+    # direction, then the label offsets and label data
+    _relation_section = 3
+    _label_section = 3 + 4 * len(relations)
+    _section_count = _label_section + 2
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(self.magic)] != self.magic:
+            raise ValueError('not a SKOS snapshot: %s' % path)
+        offset = len(self.magic)
+        count, = struct.unpack_from('<I', self._map, offset)
+        self._sections = [struct.unpack_from('<II', self._map, offset + 4 + 8 * i) for i in xrange(count)]
+        self._count = self._sections[2][1] // self._record.size
+
+    def close(self):
+        """
+        Unmap the snapshot file
+        """
+        self._map.close()
+
+    @classmethod
+    def write(cls, path, objects, views, related):
+        """
+        Write objects to a snapshot file
+
+        `views` maps the names in `_Snapshot.views` to the URIs in each
+        view.  `related(obj, relation)` returns the objects related to
+        an object by one of `_Snapshot.relations`.
+        """
+        def key(uri):
+            return uri.encode('utf-8') if isinstance(uri, unicode) else uri
+
+        objects = sorted(objects, key=lambda obj: key(obj.uri))
+        index = dict((obj.uri, i) for i, obj in enumerate(objects))
+
+        strings = {}
+        def string(value):
+            if value is None:
+                return -1
+            try:
+                return strings[value]
+            except KeyError:
+                strings[value] = len(strings)
+                return strings[value]
+
+        flags = [0] * len(objects)
+        for name, bit in cls.views.iteritems():
+            for uri in views[name]:
+                flags[index[uri]] |= bit
+
+        records = []
+        forward = [[[] for obj in objects] for relation in cls.relations]
+        labels = [[] for obj in objects]
+        for i, obj in enumerate(objects):
+            type_ = getattr(obj, '_rdf_type', obj.__class__.__name__)
+            if type_ == 'Concept':
+                values = (obj.prefLabel, obj.definition, obj.notation, obj.altLabel)
+                if obj.labels is not None:
+                    flags[i] |= cls.has_labels
+                    for code, attr in enumerate(cls.label_attrs):
+                        for language, value in obj.labels._values.get(attr, ()):
+                            labels[i].extend((code, string(language), string(value)))
+            elif type_ == 'Collection':
+                date = obj.date.isoformat() if obj.date else None
+                values = (obj.title, obj.description, date, None)
+            else:
+                values = (obj.title, obj.description, None, None)
+            records.append(cls._record.pack(cls.types.index(type_), string(obj.uri), *([string(value) for value in values] + [flags[i]])))
+
+            for relation, targets in zip(cls.relations, forward):
+                targets[i] = [index[target.uri] for target in related(obj, relation) if target.uri in index]
+
+        sections = []
+        def ints(values):
+            values = array.array('i', values)
+            if sys.byteorder != 'little':
+                values.byteswap()
+            sections.append(values.tostring())
+
+        # the string table
+        data = []
+        offsets = [0]
+        for value, i in sorted(strings.iteritems(), key=lambda item: item[1]):
+            data.append(key(value if isinstance(value, basestring) else unicode(value)))
+            offsets.append(offsets[-1] + len(data[-1]))
+        ints(offsets)
+        sections.append(''.join(data))
+        sections.append(''.join(records))
+
+        # the relations in each direction
+        for targets in forward:
+            reverse = [[] for obj in objects]
+            for i, values in enumerate(targets):
+                for j in values:
+                    reverse[j].append(i)
+            for lists in (targets, reverse):
+                offsets = [0]
+                for values in lists:
+                    offsets.append(offsets[-1] + len(values))
+                ints(offsets)
+                ints(chain(*lists))
+
+        offsets = [0]
+        for values in labels:
+            offsets.append(offsets[-1] + len(values) // 3)
+        ints(offsets)
+        ints(chain(*labels))
+
+        # write atomically so that readers never see a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(cls.magic)
+                fh.write(struct.pack('<I', len(sections)))
+                offset = len(cls.magic) + 4 + 8 * len(sections)
+                for section in sections:
+                    fh.write(struct.pack('<II', offset, len(section)))
+                    offset += len(section)
+                for section in sections:
+                    fh.write(section)
+            os.rename(temp, path)
+        except:
+            os.unlink(temp)
+            raise
+
+    def __len__(self):
+        return self._count
+
+    def _ints(self, section, start, stop):
+        offset = self._sections[section][0] + 4 * start
+        return struct.unpack_from('<%di' % (stop - start), self._map, offset)
+
+    def _bytes(self, i):
+        start, stop = self._ints(0, i, i + 2)
+        offset = self._sections[1][0]
+        return self._map[offset + start:offset + stop]
+
+    def string(self, i):
+        if i < 0:
+            return None
+        return self._bytes(i).decode('utf-8')
+
+    def record(self, i):
+        return self._record.unpack_from(self._map, self._sections[2][0] + i * self._record.size)
+
+    def uri(self, i):
+        value = self._bytes(self.record(i)[1])
+        try:
+            value.decode('ascii')
+        except UnicodeDecodeError:
+            return value.decode('utf-8')
+        return value
+
+    def flags(self, i):
+        return self.record(i)[6]
+
+    def find(self, uri):
+        """
+        Return the index of the object with a URI, or `None`
+        """
+        if isinstance(uri, unicode):
+            uri = uri.encode('utf-8')
+        elif not isinstance(uri, str):
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            value = self._bytes(self.record(middle)[1])
+            if value < uri:
+                low = middle + 1
+            elif value > uri:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def related(self, i, relation, reverse=0):
+        """
+        Return the indices of the objects related to an object
+        """
+        section = self._relation_section + 4 * self.relations.index(relation) + 2 * reverse
+        start, stop = self._ints(section, i, i + 2)
+        return self._ints(section + 1, start, stop)
+
+    def labels(self, i):
+        start, stop = self._ints(self._label_section, i, i + 2)
+        values = self._ints(self._label_section + 1, 3 * start, 3 * stop)
+        labels = {}
+        for j in xrange(0, len(values), 3):
+            code, language, value = values[j:j + 3]
+            labels.setdefault(self.label_attrs[code], []).append((self.string(language), self.string(value)))
+        return Labels(labels)
+
+    def keys(self, mask):
+        return _SnapshotKeys(self, mask)
+
+class _SnapshotKeys(collections.Set):
+    """
+    The set of URIs of the objects in a `_Snapshot` view
+    """
+
+    def __init__(self, snapshot, mask):
+        self._snapshot = snapshot
+        self._mask = mask
+        self._len = None
+
+    def __contains__(self, uri):
+        i = self._snapshot.find(uri)
+        return i is not None and bool(self._snapshot.flags(i) & self._mask)
+
+    def __iter__(self):
+        snapshot = self._snapshot
+        for i in xrange(len(snapshot)):
+            if snapshot.flags(i) & self._mask:
+                yield snapshot.uri(i)
+
+    def __len__(self):
+        if self._len is None:
+            snapshot = self._snapshot
+            self._len = sum((1 for i in xrange(len(snapshot)) if snapshot.flags(i) & self._mask))
+        return self._len
+
+class RDFLoader(collections.Mapping):
+    """
+    Loads an RDF graph into the Python SKOS object model
+
+    This class provides a mappable interface, with URIs as keys and
+    the objects themselves as values.
+
+    Use the `RDFBuilder` class to convert the Python SKOS objects back
+    into a RDF graph.
+    """
+    def __init__(self, graph, max_depth=0, flat=False, normalise_uri=str, lang=None, workers=None, per_host=None, cache=None, lazy=False, max_objects=10000, languages=False, callbacks=None, plain=False, fetcher=None, max_documents=None, max_bytes=None, max_time=None, max_depths=None):
+        """
+        `lang` is the language of the `Concept` attributes, or a
+        sequence of languages tried in turn, `''` selecting untagged
+        literals.  With `languages` set to `True` the literals in every
+        language are also retained in each `Concept.labels`.
+
+        `workers` opts in to concurrent resolution of external
+        resources: each level of unresolved URIs is fetched and parsed
+        by a pool of that many threads.  `per_host` caps the number of
+        concurrent requests made to any one host.
+
+        `cache` is an optional `DocumentCache` from which remote
+        resources are resolved.  The `cache_hits` and `cache_misses`
+        attributes count its use.
+
+        `fetcher` is an optional `Fetcher` through which remote
+        resources are retrieved, e.g. a `URLFetcher` with a timeout.
+        By default an `HTTPFetcher` is used for the duration of each
+        resolution.
+
+        Resolution can be bounded by the number of documents fetched
+        (`max_documents`), their total size in bytes (`max_bytes`) and
+        the seconds spent (`max_time`), which also bounds the time each
+        fetch may block for.  `max_depths` maps relation
+        predicates, or their SKOS names, to the depth to which they are
+        followed, overriding `max_depth`.  The URIs left unresolved are
+        recorded in the `unresolved` attribute.
+
+        When `lazy` is `True` objects are only built when they are
+        first accessed, with at least the `max_objects` most recently
+        used objects, and at most twice as many, being retained.
+
+        Timings and counts for each phase of the load are gathered in
+        the `stats` attribute, a `LoaderStats` instance which also
+        passes them to the optional sequence of `callbacks`.
+
+        With `plain` set to `True` the loader builds the lighter, read
+        only `PlainConcept`, `PlainCollection` and `PlainConceptScheme`
+        objects instead of the SQLAlchemy mapped classes.
+        """
+        if not isinstance(graph, rdflib.Graph):
+            raise TypeError('`rdflib.Graph` type expected for `graph` argument, found: %s' % type(graph))
+
+        self._configure(max_depth, flat, normalise_uri, workers, per_host, cache, lazy, max_objects, languages, callbacks, plain, fetcher, max_documents, max_bytes, max_time, max_depths)
+        self.load(graph, lang)       # convert the graph to our object model
+
+    @classmethod
+    def from_ntriples(cls, fileobj, lang=None, **kwargs):
+        """
+        Load the object model from a file of N-Triples
+
+        The triples are read incrementally and only those statements
+        used to build the object model are retained, so an
+        `rdflib.Graph` of the whole file is never materialised.  The
+        remaining keyword arguments are those accepted by the
+        constructor.
+        """
+        loader = cls.__new__(cls)
+        loader._configure(**kwargs)
+        loader.loadNTriples(fileobj, lang)
+        return loader
+
+    @classmethod
+    def start(cls, graph, lang=None, callback=None, **kwargs):
+        """
+        Load a graph in a background thread, returning a `LoaderFuture`
+
+        This allows services running an event loop to load graphs
+        without blocking it: the future's `callback` is called from the
+        loading thread once the loader is ready.  The arguments are
+        checked before returning and the remaining keyword arguments
+        are those accepted by the constructor.  The graph must not be
+        used until the load has finished as resolved resources are
+        added to it.
+        """
+        if not isinstance(graph, rdflib.Graph):
+            raise TypeError('`rdflib.Graph` type expected for `graph` argument, found: %s' % type(graph))
+
+        loader = cls.__new__(cls)
+        loader._configure(**kwargs)
+        future = LoaderFuture()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        def load():
+            try:
+                loader.load(graph, lang)
+            except Exception, e:
+                future._finish(exception=e)
+            else:
+                future._finish(loader)
+
+        thread = threading.Thread(target=load, name='RDFLoader')
+        thread.daemon = True
+        thread.start()
+        return future
+
+    @classmethod
+    def from_snapshot(cls, path, **kwargs):
+        """
+        Load the object model from a snapshot written by `save_snapshot`
+
+        The remaining keyword arguments are those accepted by the
+        constructor.  With `lazy=True` the snapshot is only mapped into
+        memory, objects being built from it as they are accessed, and
+        stays mapped until the loader is closed.
+        """
+        loader = cls.__new__(cls)
+        loader._configure(**kwargs)
+        loader.loadSnapshot(path)
+        return loader
+
+    def _configure(self, max_depth=0, flat=False, normalise_uri=str, workers=None, per_host=None, cache=None, lazy=False, max_objects=10000, languages=False, callbacks=None, plain=False, fetcher=None, max_documents=None, max_bytes=None, max_time=None, max_depths=None):
+        """
+        Check and set the options passed to the constructor
+        """
+        try:
+            self.max_depth = float(max_depth)
+        except (TypeError, ValueError):
+            raise TypeError('Numeric type expected for `max_depth` argument, found: %s' % type(max_depth))
+
+        max_depths = dict(max_depths or {})
+        self.max_depths = {}
+        for predicate, depth in max_depths.iteritems():
+            uri = rdflib.URIRef(predicate)
+            if uri not in _TripleIndex.relation_predicates:
+                uri = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#%s' % predicate)
+            if uri not in _TripleIndex.relation_predicates:
+                raise ValueError('relation predicate expected in `max_depths` argument, found: %r' % (predicate,))
+            try:
+                self.max_depths[uri] = float(depth)
+            except (TypeError, ValueError):
+                raise TypeError('Numeric type expected for `max_depths` values, found: %s' % type(depth))
+
+        for name, value in (('max_documents', max_documents), ('max_bytes', max_bytes)):
+            if value is not None and (not isinstance(value, (int, long)) or value < 0):
+                raise TypeError('non negative integer expected for `%s` argument, found: %r' % (name, value))
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        if max_time is not None:
+            try:
+                max_time = float(max_time)
+            except (TypeError, ValueError):
+                raise TypeError('Numeric type expected for `max_time` argument, found: %s' % type(max_time))
+        self.max_time = max_time
+        self.unresolved = frozenset()
+
+        self.flat = bool(flat)
+
+        if not callable(normalise_uri):
+            raise TypeError('callable expected for `normalise_uri` argument')
+        self.normalise_uri = normalise_uri
+        self._uris = _URITable(normalise_uri)
+
+        for name, value in (('workers', workers), ('per_host', per_host)):
+            if value is not None and (not isinstance(value, (int, long)) or value < 1):
+                raise TypeError('positive integer expected for `%s` argument, found: %r' % (name, value))
+        self.workers = workers
+        self.per_host = per_host
+
+        if cache is not None and not isinstance(cache, DocumentCache):
+            raise TypeError('`DocumentCache` type expected for `cache` argument, found: %s' % type(cache))
+        self.cache = cache
+
+        if fetcher is not None and not isinstance(fetcher, Fetcher):
+            raise TypeError('`Fetcher` type expected for `fetcher` argument, found: %s' % type(fetcher))
+        self.fetcher = fetcher
+        self._fetcher = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+
+        self.plain = bool(plain)
+        if self.plain:
+            self._classes = {'Concept': PlainConcept, 'Collection': PlainCollection, 'ConceptScheme': PlainConceptScheme}
+        else:
+            self._classes = {'Concept': Concept, 'Collection': Collection, 'ConceptScheme': ConceptScheme}
+
+        self._snapshot = None
+        self.lazy = bool(lazy)
+        if self.lazy and self.plain:
+            raise TypeError('the `lazy` and `plain` arguments cannot be combined')
+        if self.lazy:
+            _listenForLazyRelations()
+        if not isinstance(max_objects, (int, long)) or max_objects < 1:
+            raise TypeError('positive integer expected for `max_objects` argument, found: %r' % (max_objects,))
+        self.max_objects = max_objects
+
+        self.languages = bool(languages)
+
+        callbacks = list(callbacks or ())
+        for callback in callbacks:
+            if not callable(callback):
+                raise TypeError('callables expected for `callbacks` argument, found: %r' % (callback,))
+        self.stats = LoaderStats(callbacks)
+
+    def _dcDateToDatetime(self, date):
+        """
+        Convert a Dublin Core date to a datetime object
+        """
+        from iso8601 import parse_date, ParseError
+        try:
+            return parse_date(date)
+        except ParseError:
+            return None
+
+    def _resolveIndex(self, index, graph=None):
+        """
+        Resolve external RDF resources
+
+        Resolution proceeds breadth first: only the statements parsed
+        from the resources at one depth are inspected for the URIs
+        making up the next depth, so the accumulated statements are
+        never rescanned.  Parsed statements are added to the index
+        and, if provided, the graph.
+        """
+        self.unresolved = frozenset()
+        if self._depthLimit(index.relation_predicates) < 1:
+            return
+
+        with self.stats.phase('resolve'):
+            self._fetcher = self.fetcher or HTTPFetcher()
+            try:
+                resolved = self._resolveFrontier(index, graph)
+            finally:
+                if self._fetcher is not self.fetcher:
+                    self._fetcher.close()
+                self._fetcher = None
+            self.unresolved = frozenset(self._referencedURIs(index) - resolved)
+
+        if self.unresolved:
+            info('%d URIs left unresolved', len(self.unresolved))
+
+    def _depthLimit(self, predicates):
+        """
+        Return the greatest depth to which any of `predicates` is followed
+        """
+        return max(self.max_depths.get(predicate, self.max_depth) for predicate in predicates)
+
+    def _resolveFrontier(self, index, graph):
+        """
+        Resolve the URIs referenced by an index within the budgets
+
+        The URIs defined or resolved are returned.
+        """
+        budget = _ResolutionBudget(self.stats, self.max_documents, self.max_bytes, self.max_time)
+        resolved = set()
+        predicates = self._followedPredicates(0)
+        frontier = self._unresolvedURIs(index, resolved, predicates)
+        depth = 0
+        while frontier and budget.exhausted is None:
+            # flag the frontier as being resolved, as that is what
+            # happens next; flagging it now prevents duplicate
+            # resolutions!
+            resolved.update(frontier)
+            depth += 1
+            predicates = self._followedPredicates(depth)
+            unresolved = set()
+            for subgraph in self._parseResources(frontier, budget):
+                subindex = _TripleIndex(subgraph)
+                unresolved.update(self._unresolvedURIs(subindex, resolved, predicates))
+                index.merge(subindex)
+                if graph is not None:
+                    graph += subgraph
+
+            # a URI referenced by one resource may be defined by
+            # another resource at the same depth
+            frontier = unresolved - resolved
+
+        if budget.exhausted is not None:
+            warning('resolution stopped after %d documents as the %s budget ran out', budget.documents, budget.exhausted)
+            resolved.difference_update(budget.skipped)
+        return resolved
+
+    def _followedPredicates(self, depth):
+        """
+        Return the relation predicates followed from resources at a depth
+
+        `None` stands for every predicate.
+        """
+        if not self.max_depths:
+            return None if depth < self.max_depth else ()
+        return frozenset(predicate for predicate in _TripleIndex.relation_predicates
+                         if depth < self.max_depths.get(predicate, self.max_depth))
+
+    def _referencedURIs(self, index):
+        """
+        Return the URIs of the objects of the relations in an index
+        """
+        normalise_uri = self._uris.__getitem__
+        return set(normalise_uri(object_) for pairs in index.relations.itervalues() for subject, object_ in pairs)
+
+    def _unresolvedURIs(self, index, resolved, predicates=None):
+        """
+        Return the URIs referenced by an index that are yet to be resolved
+
+        Only the relations with the given `predicates` are followed,
+        defaulting to all of them.  SKOS objects defined in the index
+        are added to `resolved`.
+        """
+        normalise_uri = self._uris.__getitem__
+        # add existing resolved objects
+        for type_ in index.types:
+            resolved.update((normalise_uri(subject) for subject in index.subjects(type_)))
+
+        unresolved = set()
+        for predicate, pairs in index.relations.iteritems():
+            if predicates is not None and predicate not in predicates:
+                continue
+            for subject, object_ in pairs:
+                uri = normalise_uri(object_)
+                if uri not in resolved:
+                    unresolved.add(uri)
+
+        return unresolved
+
+    def _parseResources(self, uris, budget=None):
+        """
+        Parse external RDF resources, yielding a graph for each
+
+        Resources are parsed one after the other unless concurrent
+        resolution has been requested with the `workers` argument.
+        Resources not allowed by the optional `_ResolutionBudget` are
+        skipped.
+        """
+        def parse(uri):
+            if budget is None:
+                return self._parseResource(uri)
+            if not budget.allow(uri):
+                return None
+            try:
+                return self._parseResource(uri, budget.remaining())
+            except IOError:
+                if not budget.abandon(uri):
+                    raise
+
+        if not self.workers or self.workers < 2 or len(uris) < 2:
+            for uri in uris:
+                subgraph = parse(uri)
+                if subgraph is not None:
+                    yield subgraph
+            return
+
+        from multiprocessing.pool import ThreadPool
+
+        # a semaphore for each host caps the concurrent requests to it
+        per_host = self.per_host or self.workers
+        semaphores = dict((urlparse.urlsplit(uri).netloc, threading.BoundedSemaphore(per_host)) for uri in uris)
+
+        def parseConcurrently(uri):
+            # each resource is parsed into its own graph so that the
+            # shared graph is only ever modified by the calling thread
+            with semaphores[urlparse.urlsplit(uri).netloc]:
+                return parse(uri)
+
+        pool = ThreadPool(min(self.workers, len(uris)))
+        try:
+            for subgraph in pool.imap_unordered(parseConcurrently, uris):
+                if subgraph is not None:
+                    yield subgraph
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _parseResource(self, uri, timeout=None):
+        """
+        Parse an external RDF resource into a new graph
+
+        `timeout` bounds fetching a remote resource.
+        """
+        info('parsing %s', uri)
+        subgraph = rdflib.Graph()
+        if urlparse.urlsplit(uri).scheme not in ('http', 'https'):
+            from rdflib.parser import create_input_source
+            source = create_input_source(location=uri)
+            source.setByteStream(_CountingStream(source.getByteStream(), self._countBytes))
+            subgraph.parse(source)
+        else:
+            document = self._fetchDocument(uri, timeout)
+            self._countBytes(len(document.data))
+            subgraph.parse(data=document.data, format=document.format, publicID=uri)
+        self.stats.count('documents')
+        return subgraph
+
+    def _countBytes(self, size):
+        if size:
+            self.stats.count('bytes', size)
+
+    def _fetchDocument(self, uri, timeout=None):
+        """
+        Retrieve a remote RDF document through the fetcher
+
+        If there is a document cache fresh documents are retrieved from
+        it and stale documents are revalidated using conditional
+        requests.  A `timeout` is only passed to the fetcher when given,
+        so fetchers written before it was introduced keep working
+        without a `max_time` budget.
+        """
+        fetcher = self._fetcher or self.fetcher or HTTPFetcher()
+        if timeout is None:
+            fetch = fetcher.fetch
+        else:
+            fetch = lambda uri, headers=None: fetcher.fetch(uri, headers, timeout=timeout)
+
+        cache = self.cache
+        if cache is None:
+            return fetch(uri)
+
+        key = urlparse.urldefrag(uri)[0]
+        cached = cache.get(key)
+        if cached is not None and cache.isFresh(cached):
+            debug('cache hit for %s', uri)
+            self._countCache(True)
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        document = fetch(uri, headers)
+        if document is None:
+            debug('cache revalidated for %s', uri)
+            cached.fetched = time.time()
+            cache.put(key, cached)
+            self._countCache(True)
+            return cached
+
+        debug('cache miss for %s', uri)
+        cache.put(key, document)
+        self._countCache(False)
+        return document
+
+    def _countCache(self, hit):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _get_value_for_lang(self, objects, lang):
+        """
+        Return the value of the first literal in a specific language
+
+        `lang` can also be a sequence of languages tried in turn.  As
+        for `Labels`, `''` selects an untagged literal.
+        """
+        for lang in _languages(lang):
+            if lang == '':
+                lang = None     # rdflib gives untagged literals no language
+            for obj in objects:
+                if hasattr(obj, "language") and obj.language == lang:
+                    return obj.value
+
+        return None
+
+    def _preferredLabel(self, values, lang):
+        """
+        Return the preferred label from the values indexed for a subject
+
+        This mirrors `rdflib.Graph.preferredLabel`, preferring
+        `skos:prefLabel` over `rdfs:label`.  `lang` can also be a
+        sequence of languages tried in turn.
+        """
+        for lang in _languages(lang):
+            if lang is None:
+                langfilter = lambda l: True
+            elif lang == '':
+                langfilter = lambda l: getattr(l, 'language', None) is None
+            else:
+                langfilter = lambda l, lang=lang: getattr(l, 'language', None) == lang
+
+            for predicate in _TripleIndex.label_predicates:
+                for label in values.get(predicate, ()):
+                    if langfilter(label):
+                        return unicode(label.value)
+        return u''
+
+    def _labels(self, values, predicates):
+        """
+        Create the `Labels` from the values indexed for a subject
+        """
+        labels = {}
+        for attr, attr_predicates in predicates:
+            labels[attr] = [(getattr(literal, 'language', None) or None, unicode(literal))
+                            for predicate in attr_predicates
+                            for literal in values.get(predicate, ())]
+        return Labels(labels)
+
+    def _buildConcept(self, index, subject, uri, lang):
+        """
+        Create a `Concept` from the statements indexed for a subject
+        """
+        values = index.values.get(subject, {})
+        definition = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#definition')
+        notation = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#notation')
+        altLabel = rdflib.URIRef('http://www.w3.org/2004/02/skos/core#altLabel')
+
+        # Check for a preferredLabel in our desired language
+        label = self._preferredLabel(values, lang)
+
+        defn = self._get_value_for_lang(values.get(definition, ()), lang)
+        alt = self._get_value_for_lang(values.get(altLabel, ()), lang)
+
+        notn = unicode(index.value(subject, notation))
+
+        debug('creating Concept %s', uri)
+        concept = self._classes['Concept'](uri, label, defn, notn, alt)
+        if self.languages:
+            concept.labels = self._labels(values, (
+                    ('prefLabel', _TripleIndex.label_predicates),
+                    ('definition', (definition,)),
+                    ('altLabel', (altLabel,))))
+        return concept
+
+    def _buildCollection(self, index, subject, uri, lang):
+        """
+        Create a `Collection` from the statements indexed for a subject
+        """
+        pred_titles = [rdflib.URIRef('http://purl.org/dc/terms/title'), rdflib.URIRef('http://purl.org/dc/elements/1.1/title')]
+        pred_descriptions = [rdflib.URIRef('http://purl.org/dc/terms/description'), rdflib.URIRef('http://purl.org/dc/elements/1.1/description')]
+        pred_dates = [rdflib.URIRef('http://purl.org/dc/terms/date'), rdflib.URIRef('http://purl.org/dc/elements/1.1/date')]
+        title = unicode(self._valueFromPredicates(index, subject, pred_titles))
+        description = unicode(self._valueFromPredicates(index, subject, pred_descriptions))
+        date = self._dcDateToDatetime(self._valueFromPredicates(index, subject, pred_dates))
+        debug('creating Collection %s', uri)
+        return self._classes['Collection'](uri, title, description, date)
+
+    def _buildConceptScheme(self, index, subject, uri, lang):
+        """
+        Create a `ConceptScheme` from the statements indexed for a subject
+        """
+        pred_titles = [rdflib.URIRef('http://purl.org/dc/terms/title'), rdflib.URIRef('http://purl.org/dc/elements/1.1/title')]
+        pred_descriptions = [rdflib.URIRef('http://purl.org/dc/terms/description'), rdflib.URIRef('http://purl.org/dc/elements/1.1/description')]
+        title = unicode(self._valueFromPredicates(index, subject, pred_titles))
+        description = unicode(self._valueFromPredicates(index, subject, pred_descriptions))
+        debug('creating ConceptScheme %s', uri)
+        return self._classes['ConceptScheme'](uri, title, description)
+
+    def _conceptRelations(self, index, concepts):
+        """
+        Iterate over the relations between concepts in an index
+
+        Each relation is a `(subject, attribute, object)` tuple of
+        normalised URIs.
+        """
+        normalise_uri = self._uris.__getitem__
+        attrs = {
+            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#narrower'): 'narrower',
+            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#broader'): 'broader',
+            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#related'): 'related',
+            rdflib.URIRef('http://www.w3.org/2004/02/skos/core#exactMatch'): 'synonyms',
+            rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'): 'synonyms'
+            }
+        symmetric = set()       # the symmetric edges yielded
+        for predicate, attr in attrs.iteritems():
+            for subject, object_ in index.relations[predicate]:
+                subject, object_ = normalise_uri(subject), normalise_uri(object_)
+                if subject in concepts and object_ in concepts:
+                    if attr in ('related', 'synonyms'):
+                        # a single edge is stored for each pair
+                        if (attr, object_, subject) in symmetric:
+                            continue
+                        symmetric.add((attr, subject, object_))
+                    yield subject, attr, object_
+
+    def _memberRelations(self, index, collections, members):
+        """
+        Iterate over the `(collection, member)` URIs in an index
+        """
+        normalise_uri = self._uris.__getitem__
+        for subject, object_ in index.relations[rdflib.URIRef('http://www.w3.org/2004/02/skos/core#member')]:
+            subject, object_ = normalise_uri(subject), normalise_uri(object_)
+            if subject in collections and object_ in members:
+                yield subject, object_
+
+    # the keys of the relationship collections populated by each
+    # relation, and of their inverses
+    _relation_keys = {
+        'broader': ('broader', 'narrower'),
+        'narrower': ('narrower', 'broader'),
+        'related': ('_related_left', '_related_right'),
+        'synonyms': ('_synonyms_left', '_synonyms_right'),
+        'members': ('members', 'collections')
+        }
+
+    # the plain model holds symmetric relations on both objects
+    _plain_relation_keys = dict(_relation_keys,
+        related=('related', 'related'),
+        synonyms=('synonyms', 'synonyms'))
+
+    def _wireRelations(self, cache, relations):
+        """
+        Add the objects in the cache to each other's relations
+
+        `relations` is an iterable of `(subject, attribute, object)`
+        URIs.  The edges are grouped by collection and both sides of
+        each relationship are then populated in a single batch.
+        """
+        with self.stats.phase('relations'):
+            self.stats.count('edges', self._wireEdges(cache, relations))
+
+    def _wireEdges(self, cache, relations):
+        count = 0
+        edges = {}
+        relation_keys = self._plain_relation_keys if self.plain else self._relation_keys
+        for subject, attr, object_ in relations:
+            count += 1
+            debug('adding %s to %s as %s', object_, subject, attr)
+            key, reverse = relation_keys[attr]
+            for uri, key, value in ((subject, key, object_), (object_, reverse, subject)):
+                try:
+                    edges[uri, key].append(cache[value])
+                except KeyError:
+                    edges[uri, key] = [cache[value]]
 
-        for uri, related in concept.related.iteritems():
-            graph.add((node, self.SKOS['related'], rdflib.URIRef(uri)))
-            self.buildConcept(graph, related)
+        for (uri, key), values in edges.iteritems():
+            obj = cache[uri]
+            if not hasattr(type(obj), key): # a `Collection` has no `collections`
+                continue
+            if self.plain:
+                obj._populate(key, values)
+            else:
+                _populate(obj, key, getattr(obj, key), values)
+        return count
 
-        for uri, broader in concept.broader.iteritems():
-            graph.add((node, self.SKOS['broader'], rdflib.URIRef(uri)))
-            self.buildConcept(graph, broader)
+    def _loadConcepts(self, index, cache, lang):
+        # generate all the concepts
+        concepts = set()
+        normalise_uri = self._uris.__getitem__
+        with self.stats.phase('concepts'):
+            for subject in index.subjects('Concept'):
+                uri = normalise_uri(subject)
+                cache[uri] = self._buildConcept(index, subject, uri, lang)
+                concepts.add(uri)
+        self.stats.count('concepts', len(concepts))
+
+        self._wireRelations(cache, self._conceptRelations(index, concepts))
+        return concepts
 
-        for uri, narrower in concept.narrower.iteritems():
-            graph.add((node, self.SKOS['narrower'], rdflib.URIRef(uri)))
-            self.buildConcept(graph, narrower)
+    def _loadCollections(self, index, cache):
+        # generate all the collections
+        collections = set()
+        normalise_uri = self._uris.__getitem__
+        with self.stats.phase('collections'):
+            for subject in index.subjects('Collection'):
+                uri = normalise_uri(subject)
+                cache[uri] = self._buildCollection(index, subject, uri, None)
+                collections.add(uri)
+        self.stats.count('collections', len(collections))
+
+        members = self._memberRelations(index, collections, cache)
+        self._wireRelations(cache, ((subject, 'members', object_) for subject, object_ in members))
+        return collections
 
-        for collection in concept.collections.itervalues():
-            self.buildCollection(graph, collection)
+    def _valueFromPredicates(self, index, subject, predicates):
+        """
+        Given a list of predicates return the first value from an index that is not None
+        """
+        for predicate in predicates:
+            value = index.value(subject, predicate)
+            if value: return value
+        return None
+
+    def _loadConceptSchemes(self, index, cache):
+        # generate all the schemes
+        schemes = set()
+        normalise_uri = self._uris.__getitem__
+        with self.stats.phase('schemes'):
+            for subject in index.subjects('ConceptScheme'):
+                uri = normalise_uri(subject)
+                cache[uri] = self._buildConceptScheme(index, subject, uri, None)
+                schemes.add(uri)
+        self.stats.count('schemes', len(schemes))
+
+        return schemes
+
+    def _loadLazily(self, index, lang):
+        """
+        Index the objects in a `_TripleIndex` for building on demand
+        """
+        normalise_uri = self._uris.__getitem__
+        builders = {
+            'Concept': (self._buildConcept, 'concepts'),
+            'Collection': (self._buildCollection, 'collections'),
+            'ConceptScheme': (self._buildConceptScheme, 'schemes')
+            }
+
+        # map each URI to the builder, subject and counter for its object
+        subjects = {}
+        uris = {}
+        for type_ in ('Concept', 'Collection', 'ConceptScheme'):
+            uris[type_] = set()
+            for subject in index.subjects(type_):
+                uri = normalise_uri(subject)
+                subjects[uri] = builders[type_] + (subject,)
+                uris[type_].add(uri)
+
+        # index the relations by the attribute each populates
+        adjacency = dict((key, {}) for key in _lazy_attributes)
+        edges = [0]
+        def link(key, subject, object_):
+            edges[0] += 1
+            try:
+                adjacency[key][subject].append(object_)
+            except KeyError:
+                adjacency[key][subject] = [object_]
+
+        for subject, attr, object_ in self._conceptRelations(index, uris['Concept']):
+            if attr == 'broader':
+                link('broader', subject, object_)
+                link('narrower', object_, subject)
+            elif attr == 'narrower':
+                link('narrower', subject, object_)
+                link('broader', object_, subject)
+            else:
+                link('_%s_left' % attr, subject, object_)
+                link('_%s_right' % attr, object_, subject)
+
+        members = uris['Concept'] | uris['Collection']
+        for subject, object_ in self._memberRelations(index, uris['Collection'], members):
+            link('members', subject, object_)
+            link('collections', object_, subject)
+
+        self.stats.count('edges', edges[0] // 2)  # each edge is linked both ways
+        self._index = index
+        self._lang = lang
+        self._subjects = subjects
+        self._adjacency = adjacency
+        self._objects = weakref.WeakValueDictionary()
+        self._recent = _RecentObjects(self.max_objects)
+        return uris['Concept'], uris['Collection'], uris['ConceptScheme']
+
+    def _getObject(self, uri):
+        """
+        Return the object for a URI, building it if necessary
+        """
+        try:
+            obj = self._objects[uri]
+        except KeyError:
+            obj, counter = self._buildObject(uri)
+            self.stats.count(counter)
+            # flag the relations to populate when first accessed
+            obj._skos_lazy = (self, set(_lazy_attributes))
+            self._objects[uri] = obj
+        self._recent.add(uri, obj)
+        return obj
+
+    def _buildObject(self, uri):
+        """
+        Build the object for a URI, returning it and its counter name
+        """
+        if self._snapshot is not None:
+            i = self._snapshot.find(uri)
+            if i is None:
+                raise KeyError(uri)
+            return self._buildSnapshotObject(self._snapshot, i, uri)
+
+        build, counter, subject = self._subjects[uri]
+        return build(self._index, subject, uri, self._lang), counter
+
+    def _relatedURIs(self, uri, key):
+        """
+        Return the URIs populating a relation of a lazily built object
+        """
+        if self._snapshot is not None:
+            snapshot = self._snapshot
+            relation, reverse = _Snapshot.attributes[key]
+            return [snapshot.uri(i) for i in snapshot.related(snapshot.find(uri), relation, reverse)]
+
+        return self._adjacency[key].get(uri, ())
+
+    def _populate(self, obj, key, collection):
+        """
+        Populate a relation of a lazily built object
+        """
+        uris = self._relatedURIs(obj.uri, key)
+        debug('populating %s of %s with %d objects', key, obj.uri, len(uris))
+        _populate(obj, key, collection, [self._getObject(uri) for uri in uris])
+
+    def load(self, graph, lang='en'):
+        """
+        Load the object model from an `rdflib.Graph`
+
+        Any external resources that are resolved are added to the
+        graph.
+        """
+        with self.stats.phase('index'):
+            index = _TripleIndex(graph)  # a single pass over the triples
+        self._loadIndex(index, lang, graph)
+
+    def loadNTriples(self, fileobj, lang='en'):
+        """
+        Load the object model from a file of N-Triples
+
+        The file is parsed incrementally into an index of the
+        statements used to build the object model.
+        """
+        try:
+            from rdflib.plugins.parsers.ntriples import NTriplesParser
+        except ImportError:     # rdflib < 3
+            from rdflib.syntax.parsers.ntriples import NTriplesParser
+
+        index = _TripleIndex()
+        with self.stats.phase('index'):
+            NTriplesParser(index).parse(fileobj)
+        self._loadIndex(index, lang)
+
+    def loadSnapshot(self, path):
+        """
+        Load the object model from a snapshot file
+        """
+        self._hierarchy = None
+        with self.stats.phase('index'):
+            snapshot = _Snapshot(path)
+        for name, mask in _Snapshot.views.iteritems():
+            setattr(self, name, snapshot.keys(mask))
+
+        if self.lazy:
+            self._snapshot = snapshot
+            self._objects = weakref.WeakValueDictionary()
+            self._recent = _RecentObjects(self.max_objects)
+            self._flat_cache = _LazyConcepts(snapshot.keys(_Snapshot.flat_view_mask), self._getObject)
+            self._cache = _LazyConcepts(snapshot.keys(_Snapshot.view_mask), self._getObject)
+            return
+
+        cache = {}
+        uris = [snapshot.uri(i) for i in xrange(len(snapshot))]
+        counts = {}
+        with self.stats.phase('snapshot'):
+            for i, uri in enumerate(uris):
+                cache[uri], counter = self._buildSnapshotObject(snapshot, i, uri)
+                counts[counter] = counts.get(counter, 0) + 1
+        for counter, count in counts.iteritems():
+            self.stats.count(counter, count)
+
+        def relations():
+            for relation in _Snapshot.relations:
+                for i, subject in enumerate(uris):
+                    for j in snapshot.related(i, relation):
+                        yield subject, relation, uris[j]
+        self._wireRelations(cache, relations())
+
+        for name in _Snapshot.views:
+            setattr(self, name, set(getattr(self, name)))
+        self._flat_cache = cache # all objects
+        self._cache = dict((uri, cache[uri]) for uri in (chain(self._concepts, self._schemes, self._collections)))
+        snapshot.close()
+
+    def close(self):
+        """
+        Unmap the snapshot a lazy loader builds its objects from
+
+        The loader can no longer be used, but the objects it has
+        already built can.
+        """
+        if self._snapshot is not None:
+            self._snapshot.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _buildSnapshotObject(self, snapshot, i, uri):
+        """
+        Build an object from its record in a snapshot
+        """
+        type_, uri_id, a, b, c, d, flags = snapshot.record(i)
+        string = snapshot.string
+        type_ = _Snapshot.types[type_]
+        cls = self._classes[type_]
+        if type_ == 'Concept':
+            obj = cls(uri, string(a), string(b), string(c), string(d))
+            if flags & _Snapshot.has_labels:
+                obj.labels = snapshot.labels(i)
+            return obj, 'concepts'
+        elif type_ == 'Collection':
+            date = string(c)
+            return cls(uri, string(a), string(b), date and self._dcDateToDatetime(date)), 'collections'
+        return cls(uri, string(a), string(b)), 'schemes'
+
+    def save_snapshot(self, path):
+        """
+        Save the object model to a snapshot file
+
+        The snapshot holds all the loaded objects, their relations and
+        the `flat` and non-flat views, in a compact binary format
+        which `from_snapshot` maps into memory.  Lazily loaded objects
+        are all built in order to be saved.
+        """
+        cache = self._getCache(True)
+        objects = [cache[uri] for uri in cache]
+        views = dict((name, getattr(self, name)) for name in _Snapshot.views)
+        _Snapshot.write(path, objects, views, self._relatedObjects)
+
+    def _relatedObjects(self, obj, relation):
+        """
+        Return the objects related to an object for a snapshot
+        """
+        if relation == 'members':
+            members = getattr(obj, 'members', None)
+            return members.values() if members is not None else ()
+        if not hasattr(obj, 'broader'):
+            return ()           # not a concept
+        if relation == 'broader':
+            return obj.broader.values()
+        if not self.plain:
+            return getattr(obj, '_%s_left' % relation).values()
+
+        # plain objects hold both ends of a symmetric edge, which is
+        # written once
+        uri = obj.uri
+        return [value for key, value in getattr(obj, relation).iteritems() if key >= uri]
+
+    def _loadIndex(self, index, lang, graph=None):
+        cache = {}
+        self._hierarchy = None
+        normalise_uri = self._uris.__getitem__
+        self._concepts = set((normalise_uri(subj) for subj in index.subjects('Concept')))
+        self._collections = set((normalise_uri(subj) for subj in index.subjects('Collection')))
+        self._schemes = set((normalise_uri(subj) for subj in index.subjects('ConceptScheme')))
+        self._resolveIndex(index, graph)
+
+        if self.lazy:
+            with self.stats.phase('index'):
+                self._flat_concepts, self._flat_collections, self._flat_schemes = self._loadLazily(index, lang)
+            self._flat_cache = _LazyConcepts(chain(self._flat_concepts, self._flat_collections, self._flat_schemes), self._getObject)
+            self._cache = _LazyConcepts(chain(self._concepts, self._schemes, self._collections), self._getObject)
+            self._uris.forget()
+            return
+
+        self._flat_concepts = self._loadConcepts(index, cache, lang)
+        self._flat_collections = self._loadCollections(index, cache)
+        self._flat_schemes = self._loadConceptSchemes(index, cache)
+        self._flat_cache = cache # all objects
+        self._cache = dict((uri, cache[uri]) for uri in (chain(self._concepts, self._schemes, self._collections)))
+        self._uris.forget()
+
+    def _getAttr(self, name, flat=None):
+        if flat is None:
+            flat = self.flat
+        if flat:
+            name = '_flat%s' % name
+        return getattr(self, name)
+
+    def _getCache(self, flat=None):
+        return self._getAttr('_cache', flat)
+
+    # Implement the interface for `collections.Iterable`
+    def __iter__(self, flat=None):
+        return iter(self._getCache(flat))
+
+    # Implement the interface for `collections.Container`
+    def __contains__(self, value, flat=None):
+        return value in self._getCache(flat)
+
+    # Implement the interface for `collections.Sized`
+    def __len__(self, flat=None):
+        return len(self._getCache(flat))
+
+    # Implement the interface for `collections.Mapping`
+    def __getitem__(self, key):
+        # try and return a cached item
+        return self._getCache()[key]
+
+    def _getObjects(self, name, flat=None):
+        cache = self._getCache(flat)
+        keys = self._getAttr(name, flat)
+
+        if self.lazy:
+            return _LazyConcepts(keys, self._getObject)
+        return Concepts([cache[key] for key in keys])
+
+    def getConcepts(self, flat=None):
+        return self._getObjects('_concepts', flat)
+
+    @property
+    def hierarchy(self):
+        """
+        The `Hierarchy` of all the loaded concepts
+
+        It is built when first accessed, and is then kept up to date as
+        the broader and narrower concepts of the loaded objects change.
+        """
+        if self._hierarchy is None:
+            with self.stats.phase('hierarchy'):
+                hierarchy = Hierarchy(self._broaderEdges(), self._flat_concepts)
+            if not self.plain:  # plain relations cannot change
+                hierarchy._owns = self._owns
+                _listenForHierarchyChanges()
+                _hierarchies[hierarchy] = True
+            self._hierarchy = hierarchy
+        return self._hierarchy
+
+    def _broaderEdges(self):
+        """
+        Iterate over the `(narrower, broader)` URIs of the loaded concepts
+        """
+        if not self.lazy:
+            cache = self._flat_cache
+            for uri in self._flat_concepts:
+                for broader in cache[uri].broader:
+                    yield uri, broader
+            return
+
+        for uri in self._flat_concepts:
+            obj = self._objects.get(uri)
+            if obj is not None and 'broader' not in obj._skos_lazy[1]:
+                broaders = obj.broader  # already populated and maybe changed
+            else:
+                broaders = self._relatedURIs(uri, 'broader')
+            for broader in broaders:
+                yield uri, broader
+
+    def _owns(self, obj):
+        """
+        Test whether an object was loaded by this loader
+        """
+        objects = self._objects if self.lazy else self._flat_cache
+        return objects.get(obj.uri) is obj
+
+    def getConceptSchemes(self, flat=None):
+        return self._getObjects('_schemes', flat)
+
+    def getCollections(self, flat=None):
+        return self._getObjects('_collections', flat)
+
+# characters escaped in N-Triples strings and URIs
+_nt_escapes = {u'\\': u'\\\\', u'"': u'\\"', u'\n': u'\\n', u'\r': u'\\r', u'\t': u'\\t'}
+_nt_escaped = re.compile(u'[\\\\"\n\r\t]|[\ud800-\udbff][\udc00-\udfff]|[^\x20-\x7e]')
+
+def _ntEscape(match):
+    char = match.group()
+    try:
+        return _nt_escapes[char]
+    except KeyError:
+        pass
+    if len(char) == 2:          # a surrogate pair in a narrow build
+        code = 0x10000 + ((ord(char[0]) - 0xd800) << 10) + ord(char[1]) - 0xdc00
+    else:
+        code = ord(char)
+    if code > 0xffff:
+        return u'\\U%08X' % code
+    return u'\\u%04X' % code
+
+def _ntriple(triple):
+    """
+    Format a triple as an ASCII encoded N-Triples statement
+    """
+    terms = []
+    for term in triple:
+        if isinstance(term, rdflib.Literal):
+            value = u'"%s"' % _nt_escaped.sub(_ntEscape, term)
+            if term.language:
+                value = u'%s@%s' % (value, term.language)
+            elif term.datatype:
+                value = u'%s^^<%s>' % (value, _nt_escaped.sub(_ntEscape, term.datatype))
+        else:
+            value = u'<%s>' % _nt_escaped.sub(_ntEscape, term)
+        terms.append(value)
+    return (u'%s %s %s .\n' % tuple(terms)).encode('ascii')
+
+class RDFBuilder(object):
+    """
+    Creates a RDF graph from Python SKOS objects
+
+    The primary method of this class is `build()`.
+
+    Use the `RDFLoader` class to convert the RDF graph back into the
+    Python SKOS object model.
+    """
+
+    def __init__(self):
+        self.SKOS = rdflib.Namespace("http://www.w3.org/2004/02/skos/core#")
+        self.DC = rdflib.Namespace("http://purl.org/dc/elements/1.1/")
+
+    def getGraph(self):
+        # Instantiate the graph
+        graph = rdflib.Graph()
+
+        # Bind a few prefix, namespace pairs.
+        graph.bind("dc", "http://purl.org/dc/elements/1.1/")
+        graph.bind("skos", "http://www.w3.org/2004/02/skos/core#")
+        return graph
+
+    def objectInGraph(self, obj, graph):
+        type_ = getattr(obj, '_rdf_type', obj.__class__.__name__)
+        return (rdflib.term.URIRef(obj.uri), rdflib.term.URIRef(u'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'), rdflib.term.URIRef(u'http://www.w3.org/2004/02/skos/core#%s' % type_)) in graph
+
+    # the relations between concepts and their predicates
+    concept_links = (
+        ('synonyms', 'exactMatch'),
+        ('related', 'related'),
+        ('broader', 'broader'),
+        ('narrower', 'narrower'),
+        )
+
+    def buildConcept(self, graph, concept):
+        """
+        Add a `skos.Concept` instance, and the objects linked to it, to a RDF graph
+        """
+        self._build(graph, [('Concept', concept)])
 
     def buildCollection(self, graph, collection):
         """
-        Add a `skos.Collection` instance to a RDF graph
+        Add a `skos.Collection` instance, and the objects linked to it, to a RDF graph
+        """
+        self._build(graph, [('Collection', collection)])
+
+    def _build(self, graph, objects, max_hops=None, predicates=None):
+        """
+        Add the triples describing objects to a RDF graph
+
+        Only if the graph already held statements is it queried for
+        objects added by a previous build.
+        """
+        skip = None
+        if len(graph):
+            skip = lambda obj: self.objectInGraph(obj, graph)
+
+        add = graph.add
+        for triple in self._triples(objects, skip, max_hops, predicates):
+            add(triple)
+
+    def _triples(self, objects, skip=None, max_hops=None, predicates=None):
+        """
+        Generate the triples describing objects and the objects linked to them
+
+        Unless `max_hops` or `predicates` restricts the neighbourhood
+        described, every linked object is described.
         """
-        if self.objectInGraph(collection, graph):
+        if max_hops is None and predicates is None:
+            for kind, obj in self._traverse(objects, skip):
+                for triple in self._describe(kind, obj):
+                    yield triple
             return
 
+        for triple in self._neighbourhood(objects, skip, max_hops, predicates):
+            yield triple
+
+    # the predicates that may be followed by a neighbourhood
+    link_predicates = frozenset([predicate for attr, predicate in concept_links] + ['member'])
+
+    def _checkNeighbourhood(self, max_hops, predicates):
+        """
+        Check and normalise the arguments restricting a neighbourhood
+        """
+        if max_hops is not None and (not isinstance(max_hops, (int, long)) or max_hops < 0):
+            raise TypeError('non negative integer expected for `max_hops` argument, found: %r' % (max_hops,))
+
+        if predicates is None:
+            return max_hops, self.link_predicates
+
+        names = set()
+        for predicate in predicates:
+            name = predicate
+            if name.startswith(self.SKOS):
+                name = name[len(self.SKOS):]
+            if name not in self.link_predicates:
+                raise ValueError('SKOS relation expected in `predicates` argument, found: %r' % (predicate,))
+            names.add(str(name))
+        return max_hops, frozenset(names)
+
+    def _neighbourhood(self, objects, skip, max_hops, predicates):
+        """
+        Generate the triples describing the neighbourhood of objects
+
+        Objects up to `max_hops` links away over the `predicates` are
+        described breadth first, so the cost is proportional to the
+        neighbourhood rather than the vocabulary.  Only the relations
+        over the `predicates` are described, and the objects they refer
+        to beyond the neighbourhood are typed with a single triple.
+        """
+        max_hops, predicates = self._checkNeighbourhood(max_hops, predicates)
+        hops = {}               # uri -> the hops to the object
+        boundary = {}           # uri -> kind
+        pending = collections.deque()
+        for kind, obj in objects:
+            if obj.uri not in hops:
+                hops[obj.uri] = 0
+                pending.append((kind, obj, 0))
+
+        while pending:
+            kind, obj, hop = pending.popleft()
+            if skip is not None and skip(obj):
+                continue
+            for triple in self._describe(kind, obj, predicates):
+                yield triple
+
+            for predicate, link_kind, linked in self._links(kind, obj):
+                if predicate not in predicates or linked.uri in hops:
+                    continue
+                if max_hops is None or hop < max_hops:
+                    hops[linked.uri] = hop + 1
+                    pending.append((link_kind, linked, hop + 1))
+                elif not (kind == 'Concept' and link_kind == 'Collection'):
+                    # membership is stated by the collection
+                    boundary[linked.uri] = link_kind
+
+        for uri, kind in boundary.iteritems():
+            if uri not in hops:
+                yield (rdflib.URIRef(uri), rdflib.RDF.type, self.SKOS[kind])
+
+    def _traverse(self, objects, skip=None):
+        """
+        Generate objects and the objects linked to them
+
+        `objects` is an iterable of `(kind, obj)` pairs, `kind` being
+        `'Concept'` or `'Collection'`, and pairs of the same form are
+        generated.  Links are followed iteratively and each object is
+        visited once, keyed by its URI, so deep hierarchies do not
+        exhaust the stack.  Objects for which the optional `skip`
+        returns `True` are passed over along with their links.
+        """
+        visited = set()
+        pending = []
+        for item in objects:
+            pending.append(item)
+            while pending:
+                kind, obj = pending.pop()
+                if obj.uri in visited:
+                    continue
+                visited.add(obj.uri)
+                if skip is not None and skip(obj):
+                    continue
+                yield kind, obj
+
+                for predicate, link_kind, linked in self._links(kind, obj):
+                    if linked.uri not in visited:
+                        pending.append((link_kind, linked))
+
+    def _kinds(self, objects):
+        """
+        Pair objects with their kind for `_traverse`
+        """
+        for obj in objects:
+            try:
+                obj.prefLabel
+            except AttributeError:
+                yield 'Collection', obj
+            else:
+                yield 'Concept', obj
+
+    def _describe(self, kind, obj, predicates=None):
+        """
+        Return the triples describing an object of a kind
+
+        Only the relations over the optional `predicates` are described.
+        """
+        if kind == 'Concept':
+            return self._conceptTriples(obj, predicates)
+        return self._collectionTriples(obj, predicates)
+
+    def _links(self, kind, obj):
+        """
+        Return the `(predicate, kind, obj)` links from an object of a kind
+        """
+        if kind == 'Concept':
+            return self._conceptLinks(obj)
+        return self._collectionLinks(obj)
+
+    def _describeObject(self, obj):
+        """
+        Return the triples describing an object of any kind
+        """
+        for kind, obj in self._kinds([obj]):
+            return self._describe(kind, obj)
+
+    def _conceptLinks(self, concept):
+        for attr, predicate in self.concept_links:
+            for linked in getattr(concept, attr).itervalues():
+                yield predicate, 'Concept', linked
+
+        for collection in concept.collections.itervalues():
+            yield 'member', 'Collection', collection
+
+    def _collectionLinks(self, collection):
+        for member in collection.members.itervalues():
+            yield 'member', 'Concept', member
+
+    def _conceptTriples(self, concept, predicates=None):
+        node = rdflib.URIRef(concept.uri)
+        yield (node, rdflib.RDF.type, self.SKOS['Concept'])
+        yield (node, self.SKOS['notation'], rdflib.Literal(concept.notation))
+        yield (node, self.SKOS['prefLabel'], rdflib.Literal(concept.prefLabel))
+        yield (node, self.SKOS['definition'], rdflib.Literal(concept.definition))
+        yield (node, self.SKOS['altLabel'], rdflib.Literal(concept.altLabel))
+
+        for attr, predicate in self.concept_links:
+            if predicates is not None and predicate not in predicates:
+                continue
+            predicate = self.SKOS[predicate]
+            for uri in getattr(concept, attr).iterkeys():
+                yield (node, predicate, rdflib.URIRef(uri))
+
+    def _collectionTriples(self, collection, predicates=None):
         node = rdflib.URIRef(collection.uri)
-        graph.add((node, rdflib.RDF.type, self.SKOS['Collection']))
-        graph.add((node, self.DC['title'], rdflib.Literal(collection.title)))
-        graph.add((node, self.DC['description'], rdflib.Literal(collection.description)))
+        yield (node, rdflib.RDF.type, self.SKOS['Collection'])
+        yield (node, self.DC['title'], rdflib.Literal(collection.title))
+        yield (node, self.DC['description'], rdflib.Literal(collection.description))
         try:
             date = collection.date.isoformat()
         except AttributeError:
             pass
         else:
-            graph.add((node, self.DC['date'], rdflib.Literal(date)))
+            yield (node, self.DC['date'], rdflib.Literal(date))
 
-        for uri, member in collection.members.iteritems():
-            graph.add((node, self.SKOS['member'], rdflib.URIRef(uri)))
-            self.buildConcept(graph, member)
+        if predicates is not None and 'member' not in predicates:
+            return
+        for uri in collection.members.iterkeys():
+            yield (node, self.SKOS['member'], rdflib.URIRef(uri))
 
-    def build(self, objects, graph=None):
+    def build(self, objects, graph=None, max_hops=None, predicates=None):
         """
         Create an RDF graph from Python SKOS objects
 
@@ -997,16 +4341,144 @@ class RDFBuilder(object):
         objects are added to the graph rather than creating a new
         `Graph` instance.  An empty graph can be created with the
         `getGraph` method.
+
+        By default every object linked to the objects is also added.
+        `max_hops` limits this to the objects that number of links
+        away, and `predicates` to the links over the given SKOS
+        relations, e.g. `['broader', 'narrower']`; objects referred to
+        beyond these limits are only given an `rdf:type`.
         """
         if graph is None:
             graph = self.getGraph()
 
-        for obj in objects:
-            try:
-                obj.prefLabel
-            except AttributeError:
-                self.buildCollection(graph, obj)
-            else:
-                self.buildConcept(graph, obj)
-
+        self._build(graph, self._kinds(objects), max_hops, predicates)
         return graph
+
+    def iter_triples(self, objects, max_hops=None, predicates=None):
+        """
+        Generate the RDF triples describing Python SKOS objects
+
+        This yields the triples that `build` would add to a new graph,
+        each once, without accumulating them: beyond the objects
+        themselves only the URIs of the objects visited are retained.
+        """
+        return self._triples(self._kinds(objects), None, max_hops, predicates)
+
+    def write_ntriples(self, objects, fileobj, max_hops=None, predicates=None):
+        """
+        Write the RDF describing Python SKOS objects to a file as N-Triples
+
+        The triples are streamed to `fileobj` as they are generated by
+        `iter_triples`.
+        """
+        write = fileobj.write
+        for triple in self.iter_triples(objects, max_hops, predicates):
+            write(_ntriple(triple))
+
+    def delta(self, tracker):
+        """
+        Return the triples added and removed since a `ChangeTracker` checkpoint
+
+        Only the objects changed since the checkpoint are described.  A
+        pair of sets of triples is returned: those to be added to and
+        those to be removed from an export taken at the checkpoint.
+        """
+        additions = set()
+        removals = set()
+        for obj, before in tracker._before.itervalues():
+            after = set(self._describeObject(obj))
+            additions.update(after - before)
+            removals.update(before - after)
+        return additions, removals
+
+    def write_ntriples_delta(self, tracker, additions, removals):
+        """
+        Write the changes since a `ChangeTracker` checkpoint as N-Triples
+
+        The triples added and removed are written, sorted, to the
+        `additions` and `removals` files respectively.  The tracker is
+        not checkpointed.
+        """
+        for fileobj, triples in zip((additions, removals), self.delta(tracker)):
+            fileobj.writelines(sorted(_ntriple(triple) for triple in triples))
+
+    def write_ntriples_sharded(self, objects, paths, processes=None):
+        """
+        Write the RDF describing Python SKOS objects to N-Triples shards
+
+        The objects are partitioned between the files in `paths` by a
+        hash of their URI, each triple being written to the shard of
+        its subject.  The shards are written concurrently by a pool of
+        `processes` worker processes, defaulting to one for each shard
+        or CPU, which inherit the objects; on platforms without `fork`
+        they are written in turn.  Sorted, the lines of the shards are
+        those written by `write_ntriples`.
+        """
+        paths = list(paths)
+        if not paths:
+            raise ValueError('at least one shard path is required')
+
+        count = len(paths)
+        shards = [[] for path in paths]
+        for kind, obj in self._traverse(self._kinds(objects)):
+            shards[_shardOf(obj.uri, count)].append((kind, obj))
+
+        if processes is None:
+            import multiprocessing
+            processes = multiprocessing.cpu_count()
+        processes = min(processes, count)
+        jobs = [(self, shard, path) for shard, path in zip(shards, paths)]
+        if processes < 2 or not hasattr(os, 'fork'):
+            for job in jobs:
+                _writeShard(job)
+            return
+
+        _forkShards(jobs, processes)
+
+def _shardOf(uri, count):
+    """
+    Return the shard of an object by the hash of its URI
+    """
+    if isinstance(uri, unicode):
+        uri = uri.encode('utf-8')
+    return (zlib.crc32(uri) & 0xffffffff) % count
+
+def _writeShard(job):
+    builder, shard, path = job
+    with open(path, 'wb') as fh:
+        write = fh.write
+        for kind, obj in shard:
+            for triple in builder._describe(kind, obj):
+                write(_ntriple(triple))
+
+# the shards inherited by the processes forked by `_forkShards`
+_shard_jobs = None
+_shard_lock = threading.Lock()
+
+def _writeForkedShard(index):
+    _writeShard(_shard_jobs[index])
+
+def _forkShards(jobs, processes):
+    """
+    Write shards in a pool of forked processes
+
+    The jobs are made available to the workers in a module global as
+    they hold objects that cannot be pickled.
+    """
+    global _shard_jobs
+    import multiprocessing
+
+    with _shard_lock:
+        _shard_jobs = jobs
+        try:
+            pool = multiprocessing.Pool(processes)
+        finally:
+            _shard_jobs = None
+        try:
+            pool.map(_writeForkedShard, range(len(jobs)))
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
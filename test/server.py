@@ -0,0 +1,177 @@
+"""
+A local HTTP stand-in for remote SKOS resources
+
+This serves the RDF fixtures in the test directory over HTTP so that
+external resource resolution can be exercised without going online.
+"""
+
+import gzip
+import hashlib
+import os.path
+import threading
+import time
+import rdflib
+from StringIO import StringIO
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+
+class RDFRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve files from the test directory as RDF/XML
+
+    Connections are kept alive, the files are converted to N-Triples or
+    Turtle if the client prefers them and responses are gzip compressed
+    if the client accepts it.  Requests under `/moved/` are redirected.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = 5                 # close idle connections
+
+    # send each response in one go, as kept alive connections otherwise
+    # stall on delayed acknowledgements
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    # the served media types and their `rdflib` formats
+    formats = (
+        ('application/rdf+xml', 'xml'),
+        ('application/n-triples', 'nt'),
+        ('text/turtle', 'turtle')
+        )
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server._lock:
+            self.server.connections += 1
+
+    def negotiate(self):
+        """
+        Return the media type and format preferred by the client
+        """
+        qualities = {}
+        for item in self.headers.get('Accept', '*/*').split(','):
+            params = item.split(';')
+            quality = 1.0
+            for param in params[1:]:
+                name, _, value = param.partition('=')
+                if name.strip() == 'q':
+                    quality = float(value)
+            qualities[params[0].strip()] = quality
+
+        default = qualities.get('*/*', 0)
+        return max(self.formats, key=lambda (media_type, format): qualities.get(media_type, default))
+
+    def do_GET(self):
+        server = self.server
+        server.enter(self.path)
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+
+            if self.path.startswith('/moved/'):
+                self.send_response(301)
+                self.send_header('Location', self.path[len('/moved'):])
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            filename = os.path.join(server.directory, self.path.lstrip('/'))
+            try:
+                with open(filename, 'rb') as fh:
+                    data = fh.read()
+            except IOError:
+                self.send_error(404)
+                return
+
+            # each representation carries its own validators to
+            # support conditional requests
+            media_type, format = self.negotiate()
+            etag = '"%s"' % hashlib.md5(media_type + data).hexdigest()
+            last_modified = self.date_time_string(int(os.path.getmtime(filename)))
+            if format != 'xml':
+                graph = rdflib.Graph()
+                graph.parse(data=data, format='xml', publicID=server.url(self.path.lstrip('/')))
+                data = graph.serialize(format=format)
+
+            if self.headers.get('If-None-Match') == etag or \
+                    self.headers.get('If-Modified-Since') == last_modified:
+                server.statuses.append(304)
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            server.statuses.append(200)
+            self.send_response(200)
+            self.send_header('Content-Type', media_type)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                buf = StringIO()
+                fh = gzip.GzipFile(fileobj=buf, mode='wb')
+                try:
+                    fh.write(data)
+                finally:
+                    fh.close()
+                data = buf.getvalue()
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            server.leave()
+
+    def log_message(self, *args):
+        pass                    # keep the test output quiet
+
+class RDFServer(ThreadingMixIn, HTTPServer):
+    """
+    A threaded HTTP server recording the requests it receives
+
+    Responses carry `ETag` and `Last-Modified` headers and conditional
+    requests are answered with `304 Not Modified`.
+
+    `delay` is the number of seconds each request is held open for,
+    which allows the number of concurrent requests to be observed in
+    `max_concurrent`.  `connections` counts the connections accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay=0):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), RDFRequestHandler)
+        self.directory = os.path.dirname(os.path.abspath(__file__))
+        self.delay = delay
+        self.requests = []
+        self.statuses = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base(self):
+        return 'http://%s:%d/' % self.server_address
+
+    def url(self, path):
+        return self.base + path
+
+    def enter(self, path):
+        with self._lock:
+            self.requests.append(path)
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+
+    def leave(self):
+        with self._lock:
+            self.concurrent -= 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import skos
+from test import unittest
+from test.server import RDFServer
+import rdflib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+class TestCase(unittest.TestCase):
+    """
+    A base class providing a temporary cache directory
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def getCache(self, **kwargs):
+        return skos.DirectoryCache(os.path.join(self.directory, 'cache'), **kwargs)
+
+class TestDirectoryCache(TestCase):
+    """
+    Test the `DirectoryCache` storage
+    """
+
+    def testRoundTrip(self):
+        cache = self.getCache()
+        self.assertIsNone(cache.get('http://example.com/test'))
+
+        document = skos.Document('<rdf:RDF/>', 'application/rdf+xml', '"etag"', 'Thu, 24 May 2012 20:35:34 GMT')
+        cache.put('http://example.com/test', document)
+        self.assertIsNone(cache.get('http://example.com/other'))
+
+        # a new instance sees the documents stored by another
+        cached = self.getCache().get('http://example.com/test')
+        self.assertIsInstance(cached, skos.Document)
+        for attr in ('data', 'content_type', 'etag', 'last_modified', 'fetched'):
+            self.assertEqual(getattr(cached, attr), getattr(document, attr))
+        self.assertEqual(cached.format, 'xml')
+
+    def testFreshness(self):
+        cache = self.getCache(ttl=60)
+        self.assertTrue(cache.isFresh(skos.Document('')))
+        self.assertFalse(cache.isFresh(skos.Document('', fetched=time.time() - 61)))
+
+    def testEviction(self):
+        cache = self.getCache()
+        for i, uri in enumerate(('uri1', 'uri2', 'uri3')):
+            cache.put(uri, skos.Document('x' * 10))
+            # age the entries so their order is unambiguous
+            data_path = cache._paths(uri)[0]
+            os.utime(data_path, (i * 10, i * 10))
+
+        # the least recently used document is the one evicted
+        cache.get('uri1')
+        cache.evict(25)
+        self.assertIsNotNone(cache.get('uri1'))
+        self.assertIsNone(cache.get('uri2'))
+        self.assertIsNotNone(cache.get('uri3'))
+
+        # eviction also happens automatically when storing documents
+        cache.max_size = 15
+        cache.put('uri4', skos.Document('x' * 10))
+        self.assertEqual([cache.get(uri) is None for uri in ('uri1', 'uri3', 'uri4')], [True, True, False])
+
+    def testRunningSize(self):
+        listed = []
+        listdir = os.listdir
+        def record(path):
+            listed.append(path)
+            return listdir(path)
+        os.listdir = record
+        self.addCleanup(setattr, os, 'listdir', listdir)
+
+        # the directory is scanned once, then only when evicting
+        cache = self.getCache(max_size=45)
+        for i in xrange(4):
+            cache.put('uri%d' % i, skos.Document('x' * 10))
+        cache.put('uri0', skos.Document('x' * 5)) # replaces 10 bytes
+        self.assertEqual(len(listed), 1)
+        self.assertEqual(cache._size, 35)
+        cache.put('uri4', skos.Document('x' * 20))
+        self.assertEqual(len(listed), 2)
+        self.assertLessEqual(cache._size, 45)
+        self.assertEqual(cache._size, sum(os.path.getsize(os.path.join(cache.directory, name))
+                                          for name in listdir(cache.directory) if name.endswith('.rdf')))
+
+    def testConcurrentPuts(self):
+        # the running size stays exact when documents are stored from
+        # several threads
+        cache = self.getCache(max_size=10 ** 6)
+        def put(start):
+            for i in xrange(start, start + 50):
+                cache.put('uri%d' % (i % 60), skos.Document('x' * (i % 7 + 1)))
+        threads = [threading.Thread(target=put, args=(i * 50,)) for i in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cache._size, sum(os.path.getsize(os.path.join(cache.directory, name))
+                                          for name in os.listdir(cache.directory) if name.endswith('.rdf')))
+
+    def testFormats(self):
+        # plain text is not taken to be N-Triples
+        self.assertEqual(skos.Document('', 'application/n-triples').format, 'nt')
+        self.assertEqual(skos.Document('', 'text/plain').format, 'xml')
+
+class TestCachedResolution(TestCase):
+    """
+    Test resolving remote resources through a `DirectoryCache`
+    """
+
+    def setUp(self):
+        super(TestCachedResolution, self).setUp()
+        self.server = RDFServer()
+        self.server.start()
+        self.graph = rdflib.Graph()
+        self.graph.parse(self.server.url('http-root.xml'))
+        del self.server.statuses[:]
+
+    def tearDown(self):
+        self.server.stop()
+        super(TestCachedResolution, self).tearDown()
+
+    def getLoader(self, cache, **kwargs):
+        graph = rdflib.Graph()
+        graph += self.graph
+        return skos.RDFLoader(graph, 2, flat=True, cache=cache, **kwargs)
+
+    def testConstructor(self):
+        with self.assertRaises(TypeError):
+            self.getLoader('oops')
+
+    def testWarmCache(self):
+        cache = self.getCache()
+        loader = self.getLoader(cache)
+        self.assertEqual(len(loader), 5)
+        self.assertEqual((loader.cache_hits, loader.cache_misses), (0, 4))
+        self.assertEqual(self.server.statuses, [200] * 4)
+
+        # a warm cache resolves everything from disk
+        loader = self.getLoader(self.getCache())
+        self.assertEqual(len(loader), 5)
+        self.assertEqual((loader.cache_hits, loader.cache_misses), (4, 0))
+        self.assertEqual(len(self.server.statuses), 4)
+
+        concept = loader[self.server.url('http-broader.xml')]
+        self.assertEqual(concept.prefLabel, 'Broader concept')
+        self.assertIn(self.server.url('http-top.xml'), concept.broader)
+
+    def testRevalidation(self):
+        self.getLoader(self.getCache())
+
+        # stale documents are revalidated with conditional requests
+        loader = self.getLoader(self.getCache(ttl=0), workers=4)
+        self.assertEqual(len(loader), 5)
+        self.assertEqual((loader.cache_hits, loader.cache_misses), (4, 0))
+        self.assertEqual(self.server.statuses, [200] * 4 + [304] * 4)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+import skos
+from test import unittest
+
+@unittest.skipUnless(hasattr(event, 'contains'), 'requires SQLAlchemy >= 0.9')
+class TestClosure(unittest.TestCase):
+    """
+    Test the closure table and queries over persisted hierarchies
+    """
+
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        self.addCleanup(self.engine.dispose)
+        skos.Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine)
+
+        # a -> b -> c -> d, and e -> c
+        self.concepts = dict((uri, skos.Concept(uri, uri.upper())) for uri in 'abcdef')
+        for uri, broader in (('b', 'a'), ('c', 'b'), ('d', 'c'), ('c', 'e')):
+            self.concepts[uri].broader.add(self.concepts[broader])
+        session = self.Session()
+        session.add_all(self.concepts.values())
+        session.commit()
+        session.close()
+
+    def rows(self):
+        return sorted(tuple(row) for row in self.engine.execute(skos.concept_closure.select()))
+
+    def assertClosure(self, session):
+        # the maintained rows match rows built from scratch, and the
+        # queries agree with each other
+        rows = self.rows()
+        skos.build_closure(self.engine)
+        self.assertEqual(self.rows(), rows)
+        for uri in 'abcdef':
+            for query in (skos.ancestors_query, skos.descendants_query):
+                closure = [(concept.uri, depth) for concept, depth in query(session, uri, closure=True)]
+                recursive = [(concept.uri, depth) for concept, depth in query(session, uri)]
+                self.assertEqual(closure, recursive)
+
+    def testQueries(self):
+        skos.build_closure(self.engine)
+        session = self.Session()
+        for closure in (False, True):
+            ancestors = skos.ancestors_query(session, 'd', closure=closure)
+            self.assertEqual([(concept.uri, depth) for concept, depth in ancestors], [('c', 1), ('b', 2), ('e', 2), ('a', 3)])
+            descendants = skos.descendants_query(session, skos.Concept('a', 'A'), closure=closure)
+            self.assertEqual([(concept.uri, depth) for concept, depth in descendants], [('b', 1), ('c', 2), ('d', 3)])
+            self.assertEqual(skos.descendants_query(session, 'f', closure=closure).all(), [])
+
+            # each query is a single statement
+            statements = []
+            def record(*args):
+                statements.append(args[2])
+            event.listen(self.engine, 'before_cursor_execute', record)
+            skos.descendants_query(session, 'a', closure=closure).all()
+            event.remove(self.engine, 'before_cursor_execute', record)
+            self.assertEqual(len(statements), 1)
+        session.close()
+
+    def testMaintenance(self):
+        skos.build_closure(self.engine)
+        skos.maintain_closure(self.Session)
+        self.addCleanup(event.remove, self.Session, 'after_flush', skos._closureAfterFlush)
+        session = self.Session()
+        get = lambda uri: session.query(skos.Concept).get(uri)
+
+        d, f = get('d'), get('f')
+        d.narrower.add(skos.Concept('g', 'G'))
+        f.narrower.add(get('a'))
+        session.commit()
+        self.assertIn(('f', 'g', 5), self.rows())
+        self.assertClosure(session)
+
+        c = get('c')
+        c.broader.discard(get('b'))
+        session.commit()
+        self.assertNotIn(('a', 'd', 3), self.rows())
+        self.assertClosure(session)
+
+        session.delete(get('c'))
+        session.commit()
+        self.assertEqual(self.rows(), [('a', 'b', 1), ('d', 'g', 1), ('f', 'a', 1), ('f', 'b', 2)])
+        self.assertClosure(session)
+        session.close()
+
+    def testNewParent(self):
+        skos.build_closure(self.engine)
+        skos.maintain_closure(self.Session)
+        self.addCleanup(event.remove, self.Session, 'after_flush', skos._closureAfterFlush)
+        session = self.Session()
+
+        # the child's broader concepts are never loaded
+        parent = skos.Concept('p', 'P')
+        parent.narrower.add(session.query(skos.Concept).get('c'))
+        session.add(parent)
+        session.commit()
+        self.assertIn(('p', 'c', 1), self.rows())
+        self.assertIn(('p', 'd', 2), self.rows())
+        self.assertEqual([concept.uri for concept, depth in skos.ancestors_query(session, 'c', closure=True)],
+                         ['b', 'e', 'p', 'a'])
+        self.assertClosure(session)
+
+        session.delete(session.query(skos.Concept).get('p'))
+        session.commit()
+        self.assertNotIn(('p', 'd', 2), self.rows())
+        self.assertClosure(session)
+        session.close()
+
+    def testCycles(self):
+        skos.build_closure(self.engine)
+        skos.maintain_closure(self.Session)
+        self.addCleanup(event.remove, self.Session, 'after_flush', skos._closureAfterFlush)
+        session = self.Session()
+        get = lambda uri: session.query(skos.Concept).get(uri)
+
+        a = get('a')
+        a.broader.add(get('d'))
+        session.commit()
+        self.assertIn(('a', 'a', 4), self.rows())
+        self.assertClosure(session)
+        self.assertEqual([(concept.uri, depth) for concept, depth in skos.ancestors_query(session, 'a')],
+                         [('d', 1), ('c', 2), ('b', 3), ('e', 3), ('a', 4)])
+
+        b = get('b')
+        b.broader.discard(get('a'))
+        session.commit()
+        self.assertNotIn(('a', 'a', 4), self.rows())
+        self.assertClosure(session)
+        session.close()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
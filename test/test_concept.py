@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import skos
 from test import unittest
@@ -172,5 +172,80 @@ class TestConcept(TestCase):
         for child in concept.narrower.itervalues():
             self.assertIn(concept, child.broader)
 
+    def testSymmetricStorage(self):
+        uri1, uri2 = self.getChildConcepts().itervalues()
+        for attr in ('related', 'synonyms'):
+            concept1, concept2 = skos.Concept(uri1.uri, 'one'), skos.Concept(uri2.uri, 'two')
+            getattr(concept1, attr).add(concept2)
+            getattr(concept2, attr).add(concept1) # the edge already exists
+
+            # a single edge is stored and seen from both ends
+            self.assertEqual(len(getattr(concept1, '_%s_left' % attr)), 1)
+            self.assertEqual(len(getattr(concept2, '_%s_left' % attr)), 0)
+            self.assertEqual(list(getattr(concept1, attr)), [concept2.uri])
+            self.assertEqual(list(getattr(concept2, attr)), [concept1.uri])
+            self.assertEqual(len(getattr(concept2, attr)), 1)
+
+            # a concept related to itself is counted once
+            getattr(concept1, attr).add(concept1)
+            self.assertEqual(len(getattr(concept1, attr)), 2)
+            self.assertEqual(sorted(getattr(concept1, attr)), sorted([concept1.uri, concept2.uri]))
+
+            popped = set([getattr(concept1, attr).pop(), getattr(concept1, attr).pop()])
+            self.assertEqual(popped, set([concept1, concept2]))
+            self.assertEqual(len(getattr(concept2, attr)), 0)
+            self.assertRaises(KeyError, getattr(concept1, attr).pop)
+
+    def testReadOnly(self):
+        child_concepts = self.getChildConcepts()
+        self.obj.related = child_concepts
+        self.obj.synonyms = child_concepts
+        session = self.Session()
+        session.add(self.obj)
+        session.commit()
+
+        # listeners cannot be removed before SQLAlchemy 0.9, so this one
+        # stops recording once the test ends
+        statements = []
+        recording = [True]
+        def record(conn, cursor, statement, *args):
+            if recording:
+                statements.append(statement)
+        event.listen(self.engine, 'before_cursor_execute', record)
+        self.addCleanup(recording.pop)
+
+        # reading the relations from either end writes nothing
+        for concept in [self.obj] + list(child_concepts.itervalues()):
+            for attr in ('related', 'synonyms'):
+                values = getattr(concept, attr)
+                self.assertEqual(len(values), len(list(values)))
+        self.assertFalse(session.dirty)
+        session.commit()
+        self.assertEqual([s for s in statements if not s.startswith('SELECT')], [])
+        session.close()
+
+    def testBothDirections(self):
+        # earlier versions stored each symmetric pair in both directions
+        session = self.Session()
+        session.add_all(self.getChildConcepts().values())
+        session.commit()
+        for table in (skos.concept_related, skos.concept_synonyms):
+            session.execute(table.insert(), [{'left_uri': 'uri1', 'right_uri': 'uri2'},
+                                             {'left_uri': 'uri2', 'right_uri': 'uri1'}])
+        session.commit()
+
+        concept1 = session.query(skos.Concept).get('uri1')
+        concept2 = session.query(skos.Concept).get('uri2')
+        for attr in ('related', 'synonyms'):
+            values = getattr(concept1, attr)
+            self.assertEqual(len(values), 1)
+            self.assertEqual(list(values), ['uri2'])
+            self.assertEqual(values.pop(), concept2)
+            self.assertEqual(len(values), 0)
+            self.assertEqual(len(getattr(concept2, attr)), 0)
+        session.commit()
+        self.assertEqual(session.execute(skos.concept_related.count()).scalar(), 0)
+        session.close()
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import skos
+from test import unittest
+from test.server import RDFServer
+import rdflib
+import urllib2
+
+class TestHTTPFetcher(unittest.TestCase):
+    """
+    Test fetching documents with persistent connections
+    """
+
+    def setUp(self):
+        self.server = RDFServer()
+        self.server.start()
+        self.fetcher = skos.HTTPFetcher(timeout=5)
+
+    def tearDown(self):
+        self.fetcher.close()
+        self.server.stop()
+
+    def testNegotiation(self):
+        url = self.server.url('http-root.xml')
+        document = self.fetcher.fetch(url)
+        self.assertEqual(document.content_type, 'application/n-triples')
+        self.assertEqual(document.format, 'nt')
+
+        graph = rdflib.Graph()
+        graph.parse(data=document.data, format=document.format)
+        self.assertIn(rdflib.URIRef(url), set(graph.subjects()))
+
+        # servers offering a single serialisation are still understood
+        self.fetcher.accept = 'application/rdf+xml'
+        self.assertEqual(self.fetcher.fetch(url).format, 'xml')
+
+    def testKeepAlive(self):
+        for name in ('http-root.xml', 'http-broader.xml', 'http-related.xml', 'http-root.xml'):
+            self.assertIsNotNone(self.fetcher.fetch(self.server.url(name)))
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(self.server.connections, 1)
+
+        # a new connection replaces one closed by the server
+        for connections in self.fetcher._idle.itervalues():
+            for connection in connections:
+                connection.sock.close()
+        self.assertIsNotNone(self.fetcher.fetch(self.server.url('http-top.xml')))
+        self.assertEqual(self.server.connections, 2)
+
+    def testGzip(self):
+        document = self.fetcher.fetch(self.server.url('http-root.xml'))
+        self.assertIn('<%s>' % self.server.url('http-root.xml'), document.data)
+
+        # the server only compresses responses when asked to
+        response = urllib2.urlopen(self.server.url('http-root.xml'))
+        self.assertIsNone(response.info().get('Content-Encoding'))
+        response.close()
+
+    def testConditional(self):
+        url = self.server.url('http-root.xml')
+        document = self.fetcher.fetch(url)
+        self.assertIsNone(self.fetcher.fetch(url, {'If-None-Match': document.etag}))
+        self.assertIsNone(self.fetcher.fetch(url, {'If-Modified-Since': document.last_modified}))
+        self.assertEqual(self.server.statuses, [200, 304, 304])
+        self.assertEqual(self.server.connections, 1)
+
+    def testRedirect(self):
+        document = self.fetcher.fetch(self.server.url('moved/http-root.xml'))
+        self.assertIn(self.server.url('http-root.xml'), document.data)
+        self.assertEqual(self.server.requests, ['/moved/http-root.xml', '/http-root.xml'])
+
+        self.fetcher.max_redirects = 0
+        with self.assertRaises(IOError):
+            self.fetcher.fetch(self.server.url('moved/http-root.xml'))
+
+    def testNotFound(self):
+        with self.assertRaises(urllib2.HTTPError) as cm:
+            self.fetcher.fetch(self.server.url('missing.xml'))
+        self.assertEqual(cm.exception.code, 404)
+        self.assertIsNotNone(self.fetcher.fetch(self.server.url('http-root.xml')))
+
+    def testLoader(self):
+        graph = rdflib.Graph()
+        graph.parse(self.server.url('http-root.xml'))
+        connections = self.server.connections
+
+        # the loader's own fetcher reuses its connection
+        loader = skos.RDFLoader(graph, 2, flat=True)
+        self.assertEqual(len(loader), 5)
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(self.server.connections, connections + 1)
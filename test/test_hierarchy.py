@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import skos
+from test import unittest
+
+class TestHierarchy(unittest.TestCase):
+    """
+    Test the transitive closure of broader concepts
+    """
+
+    def setUp(self):
+        # a -> b -> c -> d, and e -> c
+        edges = [('b', 'a'), ('c', 'b'), ('d', 'c'), ('c', 'e')]
+        self.hierarchy = skos.Hierarchy(edges, ['f'])
+
+    def assertConsistent(self, hierarchy):
+        # the maintained closure matches one built from scratch
+        edges = [(uri, broader) for uri, parents in hierarchy._parents.iteritems() for broader in parents]
+        rebuilt = skos.Hierarchy(edges, hierarchy._parents)
+        for uri in rebuilt._parents:
+            self.assertEqual(hierarchy.ancestors(uri), rebuilt.ancestors(uri))
+            self.assertEqual(hierarchy.descendants(uri), rebuilt.descendants(uri))
+            self.assertEqual(hierarchy.depth(uri), rebuilt.depth(uri))
+
+    def testQueries(self):
+        hierarchy = self.hierarchy
+        self.assertEqual(len(hierarchy), 6)
+        self.assertIn('f', hierarchy)
+        self.assertEqual(hierarchy.ancestors('d'), frozenset('abce'))
+        self.assertEqual(hierarchy.descendants('a'), frozenset('bcd'))
+        self.assertEqual(hierarchy.descendants('f'), frozenset())
+        self.assertTrue(hierarchy.is_descendant_of('d', 'a'))
+        self.assertFalse(hierarchy.is_descendant_of('a', 'd'))
+        self.assertFalse(hierarchy.is_descendant_of('a', 'a'))
+        self.assertEqual([hierarchy.depth(uri) for uri in 'abcdef'], [0, 1, 1, 2, 0, 0])
+
+        # concepts are accepted as well as URIs
+        concept = skos.Concept('d', 'D')
+        self.assertTrue(hierarchy.is_descendant_of(concept, skos.Concept('a', 'A')))
+        self.assertRaises(KeyError, hierarchy.ancestors, 'missing')
+        self.assertRaises(KeyError, hierarchy.depth, 'missing')
+
+    def testAdd(self):
+        hierarchy = self.hierarchy
+        hierarchy.add('a', 'f')
+        self.assertTrue(hierarchy.is_descendant_of('d', 'f'))
+        self.assertEqual(hierarchy.depth('b'), 2)
+        hierarchy.add('g', 'd')   # a new concept
+        self.assertEqual(hierarchy.ancestors('g'), frozenset('abcdef'))
+        self.assertEqual(hierarchy.depth('g'), 3)
+        self.assertConsistent(hierarchy)
+
+    def testDiscard(self):
+        hierarchy = self.hierarchy
+        hierarchy.discard('c', 'b')
+        self.assertEqual(hierarchy.ancestors('d'), frozenset('ce'))
+        self.assertEqual(hierarchy.descendants('a'), frozenset('b'))
+        self.assertEqual(hierarchy.depth('d'), 2)
+        hierarchy.discard('c', 'e')
+        self.assertEqual(hierarchy.depth('c'), 0)
+        hierarchy.discard('c', 'missing') # ignored
+        self.assertConsistent(hierarchy)
+
+    def testCycles(self):
+        hierarchy = self.hierarchy
+        hierarchy.add('a', 'd')
+        for uri in 'abcd':
+            self.assertTrue(hierarchy.is_descendant_of(uri, uri))
+        self.assertEqual(hierarchy.ancestors('a'), frozenset('abcde'))
+        self.assertEqual(hierarchy.depth('a'), 3) # through e
+        hierarchy.discard('c', 'e')
+        self.assertEqual(hierarchy.depth('a'), None) # no way out of the cycle
+        self.assertConsistent(hierarchy)
+
+        hierarchy.discard('b', 'a')
+        self.assertFalse(hierarchy.is_descendant_of('a', 'a'))
+        self.assertEqual(hierarchy.depth('a'), 3)
+        self.assertConsistent(hierarchy)
+
+        hierarchy = skos.Hierarchy([('a', 'a')])
+        self.assertEqual(hierarchy.ancestors('a'), frozenset('a'))
+        self.assertEqual(hierarchy.depth('a'), None)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
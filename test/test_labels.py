@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import rdflib
+from sqlalchemy.orm.events import AttributeEvents
+import skos
+from test import unittest
+
+class TestLabelIndex(unittest.TestCase):
+    """
+    Test searching the labels of concepts by prefix
+    """
+
+    def setUp(self):
+        self.concepts = skos.Concepts([
+            skos.Concept('sst', u'Sea surface temperature', altLabel=u'SST'),
+            skos.Concept('temp', u'Température de l\'eau'),
+            skos.Concept('column', 'Water column', altLabel='Water body'),
+            skos.Concept('waves', 'Waves', altLabel='Swell')
+            ])
+        self.index = skos.LabelIndex(self.concepts)
+
+    def search(self, query, limit=10):
+        return [uri for uri, label in self.index.search(query, limit)]
+
+    def testSearch(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertIn('waves', self.index)
+        self.assertEqual(self.search('wa'), ['column', 'waves'])
+        self.assertEqual(self.search('WAT'), ['column'])
+        self.assertEqual(self.search('sw'), ['waves'])
+        self.assertEqual(self.search('sea'), ['sst'])
+        self.assertEqual(self.search('salinity'), [])
+        self.assertEqual(self.search(''), [])
+        self.assertEqual(self.search('wa', limit=1), ['column'])
+
+    def testFolding(self):
+        # accents, case and word order are ignored
+        self.assertEqual(self.search(u'tempé'), ['sst', 'temp'])
+        self.assertEqual(self.search('TEMPERATURE EAU'), ['temp'])
+        self.assertEqual(self.search(u'l\'Eau'), ['temp'])
+        self.assertEqual(self.search('temperature surf'), ['sst'])
+
+        # the words before the last are whole words
+        self.assertEqual(self.search('temp surf'), [])
+        self.assertEqual(self.search('water b'), ['column'])
+        self.assertEqual(self.search(u'température'.encode('utf-8')), ['sst', 'temp'])
+
+    def testLabels(self):
+        # each concept is found once, by its preferred label first
+        self.assertEqual(self.index.search('water'), [('column', 'Water column')])
+        self.assertEqual(self.index.search('sst'), [('sst', u'SST')])
+
+    def testChanges(self):
+        concept = self.concepts['waves']
+        concept.prefLabel = 'Wind waves'
+        self.index.add(concept)
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.search('wind'), ['waves'])
+        self.index.add(skos.Concept('wind', 'Wind speed'))
+        self.assertEqual(self.search('wi'), ['waves', 'wind'])
+
+        self.index.discard(concept)
+        self.index.discard('missing')
+        self.assertEqual(self.search('wi'), ['wind'])
+        self.assertEqual(self.search('swell'), [])
+        self.assertNotIn('waves', self.index)
+
+    @unittest.skipUnless(hasattr(AttributeEvents, 'init_collection'), 'requires SQLAlchemy >= 1.0')
+    def testLoader(self):
+        graph = rdflib.Graph()
+        graph.parse(os.path.join(os.path.dirname(__file__), 'concepts-dce.xml'))
+        index = skos.LabelIndex(skos.RDFLoader(graph, lazy=True))
+        self.assertEqual(index.search('acoustic back'), [('http://portal.oceannet.org/test', u'Acoustic backscatter in the water\n    column')])
+        self.assertEqual(len(index), 3)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
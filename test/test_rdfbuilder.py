@@ -5,6 +5,11 @@ from test import unittest
 from datetime import datetime
 from iso8601.iso8601 import UTC
 import rdflib
+import os
+import sys
+import shutil
+import tempfile
+from StringIO import StringIO
 
 class TestCase(unittest.TestCase):
 
@@ -38,5 +43,237 @@ class TestCase(unittest.TestCase):
             self.assertIn(obj.uri, loader)
             self.assertEqual(loader[obj.uri], obj)
 
+    def testDeepHierarchy(self):
+        # a hierarchy deeper than the recursion limit
+        count = sys.getrecursionlimit() * 2
+        concepts = [skos.Concept('uri%d' % i, 'prefLabel%d' % i, 'definition%d' % i) for i in xrange(count)]
+        for broader, narrower in zip(concepts, concepts[1:]):
+            narrower.broader.add(broader)
+
+        graph = self.builder.build(concepts[-1:])
+        types = set(graph.subjects(rdflib.RDF.type, self.builder.SKOS['Concept']))
+        self.assertEqual(len(types), count)
+        self.assertEqual(len(list(graph.triples((None, self.builder.SKOS['broader'], None)))), count - 1)
+
+    def testExistingGraph(self):
+        objects = self.getConcepts()
+        graph = self.builder.build(objects[:1])
+        self.assertEqual(len(graph), 5)
+
+        # objects already in the graph are not visited again
+        checked = []
+        objectInGraph = self.builder.objectInGraph
+        def check(obj, graph):
+            checked.append(obj.uri)
+            return objectInGraph(obj, graph)
+        self.builder.objectInGraph = check
+
+        collection = self.getCollection()
+        objects[0].prefLabel = 'changed'
+        self.builder.build([collection, objects[0]], graph)
+        self.assertEqual(len(graph), 16)
+        self.assertItemsEqual(checked, ['uri', 'uri1', 'uri2'])
+        self.assertNotIn((rdflib.URIRef('uri1'), self.builder.SKOS['prefLabel'], rdflib.Literal('changed')), graph)
+
+    def testIterTriples(self):
+        objects = self.getConcepts()
+        objects[0].related.add(objects[1])
+        objects.append(self.getCollection())
+
+        triples = list(self.builder.iter_triples(iter(objects)))
+        self.assertEqual(len(triples), len(set(triples)))
+        self.assertSetEqual(set(triples), set(self.builder.build(objects)))
+
+    def testWriteNTriples(self):
+        # N-Triples requires absolute URIs
+        objects = [
+            skos.Concept('http://example.com/1', 'prefLabel1', u'A "quoted"\ndéfinition\tin \\ \U0001d11e', 'notation1', 'altLabel1'),
+            skos.Concept('http://example.com/2', u'préfLabel2', 'definition2', 'notation2', 'altLabel2'),
+            skos.Collection('http://example.com/3', 'title', 'description', datetime(2012, 5, 24, 20, 35, 34, 489923, UTC))
+            ]
+        objects[1].broader.add(objects[0])
+        objects[2].members.add(objects[1])
+
+        fileobj = StringIO()
+        self.builder.write_ntriples(objects, fileobj)
+        data = fileobj.getvalue()
+        data.decode('ascii')
+
+        graph = rdflib.Graph()
+        graph.parse(data=data, format='nt')
+        self.assertEqual(len(graph), len(data.splitlines()))
+        self.assertSetEqual(set(graph), set(self.builder.build(objects)))
+
+    def testWriteNTriplesSharded(self):
+        concepts = [skos.Concept('http://example.com/%d' % i, u'prefLabel %d é' % i, 'definition') for i in xrange(50)]
+        for i, concept in enumerate(concepts[1:]):
+            concept.broader.add(concepts[i // 2])
+            concept.related.add(concepts[(i * 7) % 50])
+        collection = skos.Collection('http://example.com/collection', 'title', 'description')
+        collection.members = concepts[::5]
+
+        fileobj = StringIO()
+        self.builder.write_ntriples(concepts[:1], fileobj)
+        expected = sorted(fileobj.getvalue().splitlines(True))
+
+        directory = tempfile.mkdtemp()
+        try:
+            for shards, processes in ((4, None), (3, 1), (1, 4)):
+                paths = [os.path.join(directory, 'shard%d.nt' % i) for i in xrange(shards)]
+                self.builder.write_ntriples_sharded(concepts[:1], paths, processes)
+
+                lines = []
+                for i, path in enumerate(paths):
+                    with open(path, 'rb') as fh:
+                        shard = fh.readlines()
+                    # each triple is owned by the shard of its subject
+                    for line in shard:
+                        self.assertEqual(skos._shardOf(line.split()[0][1:-1], shards), i)
+                    lines.extend(shard)
+                self.assertEqual(sorted(lines), expected)
+        finally:
+            shutil.rmtree(directory)
+
+        with self.assertRaises(ValueError):
+            self.builder.write_ntriples_sharded(concepts, [])
+
+class TestNeighbourhood(unittest.TestCase):
+    """
+    Test building the neighbourhood of objects
+    """
+
+    def setUp(self):
+        # a chain of concepts, each related to the concept three along
+        self.concepts = [skos.Concept('http://example.com/%d' % i, 'prefLabel%d' % i, 'definition%d' % i) for i in xrange(10)]
+        for i, concept in enumerate(self.concepts[1:]):
+            concept.broader.add(self.concepts[i])
+        for i, concept in enumerate(self.concepts[3:]):
+            concept.related.add(self.concepts[i])
+        self.collection = skos.Collection('http://example.com/collection', 'title', 'description')
+        self.collection.members = self.concepts[5:7]
+        self.builder = skos.RDFBuilder()
+
+    def getDescribed(self, graph):
+        return set(unicode(uri) for uri in graph.subjects(self.builder.SKOS['prefLabel']))
+
+    def getStubs(self, graph):
+        return set(unicode(uri) for uri in graph.subjects(rdflib.RDF.type)) - self.getDescribed(graph) - set([self.collection.uri])
+
+    def testMaxHops(self):
+        described = []
+        describe = self.builder._describe
+        def spy(kind, obj, *args):
+            described.append(obj.uri)
+            return describe(kind, obj, *args)
+        self.builder._describe = spy
+
+        graph = self.builder.build([self.concepts[5]], max_hops=1, predicates=['broader', 'narrower'])
+        uris = ['http://example.com/%d' % i for i in (4, 5, 6)]
+        self.assertSetEqual(self.getDescribed(graph), set(uris))
+        self.assertSetEqual(self.getStubs(graph), set(['http://example.com/3', 'http://example.com/7']))
+        self.assertItemsEqual(described, uris)
+
+        # only the chosen relations are described
+        self.assertEqual(len(list(graph.triples((None, self.builder.SKOS['related'], None)))), 0)
+        self.assertEqual(len(list(graph.triples((None, self.builder.SKOS['broader'], None)))), 3)
+
+        # a graph is valid input to the loader
+        self.assertEqual(len(skos.RDFLoader(graph)), 5)
+
+    def testZeroHops(self):
+        graph = self.builder.build([self.concepts[5]], max_hops=0)
+        self.assertSetEqual(self.getDescribed(graph), set([self.concepts[5].uri]))
+        concept = self.concepts[5]
+        self.assertSetEqual(self.getStubs(graph), set(concept.broader) | set(concept.narrower) | set(concept.related))
+        self.assertNotIn(rdflib.URIRef(self.collection.uri), set(graph.subjects()))
+
+    def testPredicates(self):
+        graph = self.builder.build([self.concepts[9]], predicates=['http://www.w3.org/2004/02/skos/core#broader'])
+        self.assertSetEqual(self.getDescribed(graph), set(concept.uri for concept in self.concepts))
+        self.assertEqual(len(list(graph.triples((None, self.builder.SKOS['narrower'], None)))), 0)
+
+        # triples are the same as those of a full build over the relation
+        full = self.builder.build(self.concepts)
+        self.assertTrue(set(graph) < set(full))
+        self.assertSetEqual(set(self.builder.iter_triples([self.concepts[9]], predicates=['broader'])), set(graph))
+
+    def testMembers(self):
+        graph = self.builder.build([self.concepts[5]], max_hops=1, predicates=['member'])
+        self.assertIn((rdflib.URIRef(self.collection.uri), rdflib.RDF.type, self.builder.SKOS['Collection']), graph)
+        self.assertEqual(len(list(graph.triples((None, self.builder.SKOS['member'], None)))), 2)
+        self.assertSetEqual(self.getStubs(graph), set([self.concepts[6].uri]))
+
+    def testArguments(self):
+        with self.assertRaises(TypeError):
+            self.builder.build(self.concepts, max_hops=-1)
+        with self.assertRaises(ValueError):
+            self.builder.build(self.concepts, predicates=['prefLabel'])
+
+class TestChangeTracker(unittest.TestCase):
+    """
+    Test exporting the changes recorded by a `ChangeTracker`
+    """
+
+    def setUp(self):
+        self.concepts = [skos.Concept('http://example.com/%d' % i, 'prefLabel%d' % i, 'definition%d' % i) for i in xrange(5)]
+        self.concepts[1].broader.add(self.concepts[0])
+        self.collection = skos.Collection('http://example.com/collection', 'title', 'description')
+        self.collection.members = self.concepts[:2]
+        self.tracker = skos.ChangeTracker()
+        self.builder = self.tracker.builder
+
+    def tearDown(self):
+        self.tracker.close()
+
+    def testDelta(self):
+        objects = self.concepts + [self.collection]
+        before = set(self.builder.build(objects))
+        self.assertEqual(self.tracker.changed, [])
+
+        self.concepts[0].prefLabel = 'changed'
+        self.concepts[2].related.add(self.concepts[3])
+        self.concepts[1].broader.discard(self.concepts[0])
+        self.collection.members.discard(self.concepts[1])
+
+        after = set(self.builder.build(objects))
+        additions, removals = self.builder.delta(self.tracker)
+        self.assertSetEqual(additions, after - before)
+        self.assertSetEqual(removals, before - after)
+        self.assertItemsEqual([obj.uri for obj in self.tracker.changed], [
+            'http://example.com/0',
+            'http://example.com/1',
+            'http://example.com/2',
+            'http://example.com/3',
+            'http://example.com/collection'
+            ])
+
+        # only the objects changed since the checkpoint are described
+        self.tracker.checkpoint()
+        self.assertEqual(self.builder.delta(self.tracker), (set(), set()))
+        self.concepts[4].notation = 'notation4'
+        self.assertEqual(len(self.tracker.changed), 1)
+
+    def testNewObjects(self):
+        before = set(self.builder.build(self.concepts))
+        concept = skos.Concept('http://example.com/new', 'prefLabel', 'definition')
+        concept.narrower.add(self.concepts[4])
+
+        additions, removals = self.builder.delta(self.tracker)
+        self.assertSetEqual(additions, set(self.builder.build(self.concepts + [concept])) - before)
+        self.assertEqual(removals, set())
+        self.assertIn((rdflib.URIRef(concept.uri), rdflib.RDF.type, self.builder.SKOS['Concept']), additions)
+
+    def testClose(self):
+        self.tracker.close()
+        self.concepts[0].prefLabel = 'changed'
+        self.assertEqual(self.tracker.changed, [])
+
+    def testWriteNTriplesDelta(self):
+        self.concepts[0].prefLabel = u'chängéd'
+        added, removed = StringIO(), StringIO()
+        self.builder.write_ntriples_delta(self.tracker, added, removed)
+        self.assertEqual(added.getvalue(), '<http://example.com/0> <http://www.w3.org/2004/02/skos/core#prefLabel> "ch\\u00E4ng\\u00E9d" .\n')
+        self.assertEqual(removed.getvalue(), '<http://example.com/0> <http://www.w3.org/2004/02/skos/core#prefLabel> "prefLabel0" .\n')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
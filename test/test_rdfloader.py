@@ -4,7 +4,19 @@ import skos
 from test import unittest
 import rdflib
 import os.path
+import shutil
+import tempfile
+import threading
+import time
 import datetime
+from StringIO import StringIO
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.events import AttributeEvents
+from test.server import RDFServer
+
+# lazy loading relies on the `init_collection` event of SQLAlchemy >= 1.0
+lazy_loading = hasattr(AttributeEvents, 'init_collection')
 
 class TestRDFLoaderConstructor(unittest.TestCase):
     """
@@ -22,6 +34,79 @@ class TestRDFLoaderConstructor(unittest.TestCase):
         with self.assertRaises(TypeError):
             skos.RDFLoader(graph, normalise_uri='oops')
 
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(graph, workers='oops')
+
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(graph, workers=2, per_host=0)
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(graph, callbacks=['oops'])
+
+class TestRDFLoaderLabels(unittest.TestCase):
+    """
+    Test the selection of labels when loading concepts
+    """
+
+    def getGraph(self):
+        SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+        graph = rdflib.Graph()
+        for uri in ('http://example.com/a', 'http://example.com/b'):
+            graph.add((rdflib.URIRef(uri), rdflib.RDF.type, SKOS['Concept']))
+        a = rdflib.URIRef('http://example.com/a')
+        graph.add((a, rdflib.RDFS.label, rdflib.Literal('label', lang='es')))
+        graph.add((a, SKOS['definition'], rdflib.Literal('definition', lang='en')))
+        graph.add((a, SKOS['definition'], rdflib.Literal(u'definici\xf3n', lang='es')))
+        # relations from untyped subjects are ignored
+        graph.add((rdflib.URIRef('http://example.com/c'), SKOS['broader'], a))
+        return graph
+
+    def testFallback(self):
+        loader = skos.RDFLoader(self.getGraph(), lang='es')
+        concept = loader['http://example.com/a']
+        self.assertEqual(concept.prefLabel, 'label')
+        self.assertEqual(concept.definition, u'definici\xf3n')
+        self.assertEqual(concept.notation, 'None')
+        self.assertEqual(len(concept.narrower), 0)
+
+        # concepts without any label have an empty one
+        self.assertEqual(loader['http://example.com/b'].prefLabel, '')
+        self.assertIsNone(loader['http://example.com/b'].definition)
+
+    def testCallbacks(self):
+        recorded = []
+        skos.RDFLoader(self.getGraph(), callbacks=[lambda *args: recorded.append(args)])
+        self.assertIn(('count', 'concepts', 2), recorded)
+        for phase in ('index', 'concepts', 'relations', 'collections', 'schemes'):
+            self.assertIn(phase, [name for kind, name, value in recorded if kind == 'timing'])
+
+    def testFallbackChain(self):
+        loader = skos.RDFLoader(self.getGraph(), lang=('fr', 'en'))
+        concept = loader['http://example.com/a']
+        self.assertEqual(concept.definition, 'definition')
+        self.assertEqual(concept.prefLabel, '')
+        self.assertIsNone(concept.labels)
+
+    def testUntagged(self):
+        # `''` selects untagged literals for every attribute
+        graph = self.getGraph()
+        SKOS = rdflib.Namespace('http://www.w3.org/2004/02/skos/core#')
+        b = rdflib.URIRef('http://example.com/b')
+        for predicate, value in (('prefLabel', 'label'), ('altLabel', 'alternative'), ('definition', 'untagged')):
+            graph.add((b, SKOS[predicate], rdflib.Literal(value)))
+        concept = skos.RDFLoader(graph, lang=('fr', ''))['http://example.com/b']
+        self.assertEqual((concept.prefLabel, concept.altLabel, concept.definition), ('label', 'alternative', 'untagged'))
+
+    def testAllLanguages(self):
+        loader = skos.RDFLoader(self.getGraph(), lang='en', languages=True)
+        labels = loader['http://example.com/a'].labels
+        self.assertIsInstance(labels, skos.Labels)
+        self.assertEqual(labels.languages(), set(['en', 'es']))
+        self.assertEqual(labels.get('definition', ('fr', 'es')), u'definici\xf3n')
+        self.assertEqual(labels.get('prefLabel', ('en', None)), 'label')
+        self.assertEqual(labels.getAll('altLabel', 'en'), [])
+        self.assertIsNone(labels.get('prefLabel', 'en'))
+        self.assertEqual(loader['http://example.com/b'].labels.languages(), set())
+
 class TestCase(unittest.TestCase):
 
     def __init__(self, rdf_files, *args, **kwargs):
@@ -33,6 +118,7 @@ class TestCase(unittest.TestCase):
         directory = os.path.dirname(__file__)
         for file_ in self.rdf_files:
             graph.parse(os.path.join(directory, file_))
+        self.graph = graph
         self.loader = self.getLoader(graph)
 
     def getLoader(self, graph):
@@ -61,12 +147,26 @@ class TestUnicode(TestCase):
         assert concept.altLabel == u'Prueba alternativa: ó', concept.altLabel
         assert concept.definition == u'Prueba de caracteres unicode ó', concept.definition
 
+    def testAllLanguages(self):
+        loader = skos.RDFLoader(self.graph, 0, lang='es', languages=True)
+        labels = loader['http://portal.oceannet.org/test1/unicode'].labels
+
+        self.assertTrue(set(['en', 'es', 'fr']).issubset(labels.languages('definition')))
+        self.assertEqual(labels.get('prefLabel', 'fr'), u'Notion de test Unicode: ó')
+        self.assertEqual(labels.get('altLabel', ('de', 'en')), u'Alternative test: ó')
+        self.assertEqual(labels.get('definition', 'es'), u'Prueba de caracteres unicode ó')
+
 
 class TestRDFLoader(TestCase):
     """
     A base class used for testing `RDFLoader` objects
     """
 
+    # the classes of the objects being loaded
+    Concept = skos.Concept
+    ConceptScheme = skos.ConceptScheme
+    Collection = skos.Collection
+
     def __init__(self, *args, **kwargs):
         rdf_files = [
             'concepts-dce.xml',
@@ -105,17 +205,17 @@ class TestRDFLoader(TestCase):
 
     def testGetItem(self):
         value = self.loader['http://portal.oceannet.org/test']
-        self.assertIsInstance(value, skos.Concept)
+        self.assertIsInstance(value, self.Concept)
 
         value = self.loader['http://example.com/thesaurus']
-        self.assertIsInstance(value, skos.ConceptScheme)
+        self.assertIsInstance(value, self.ConceptScheme)
 
     def testGetConcepts(self):
         concepts = self.loader.getConcepts()
         self.assertIsInstance(concepts, skos.Concepts)
         self.assertEqual(len(concepts), 6)
         for concept in concepts.itervalues():
-            self.assertIsInstance(concept, skos.Concept)
+            self.assertIsInstance(concept, self.Concept)
             self.assertGreater(len(concept.uri), 1)
             self.assertGreater(len(concept.prefLabel), 1)
             self.assertGreater(len(concept.definition), 1)
@@ -130,7 +230,7 @@ class TestRDFLoader(TestCase):
         self.assertIsInstance(schemes, skos.Concepts)
         self.assertEqual(len(schemes), 2)
         for scheme in schemes.itervalues():
-            self.assertIsInstance(scheme, skos.ConceptScheme)
+            self.assertIsInstance(scheme, self.ConceptScheme)
             self.assertEqual(scheme.title, 'The SWAD-Europe Example Thesaurus')
             self.assertEqual(scheme.description, 'An example thesaurus to illustrate the use of the SKOS-Core schema.')
 
@@ -139,11 +239,21 @@ class TestRDFLoader(TestCase):
         self.assertIsInstance(collections, skos.Concepts)
         self.assertEqual(len(collections), 2)
         for collection in collections.itervalues():
-            self.assertIsInstance(collection, skos.Collection)
+            self.assertIsInstance(collection, self.Collection)
             self.assertEqual(collection.title, 'Test Collection')
             self.assertEqual(collection.description, 'A collection of concepts used as a test')
             self.assertIsInstance(collection.date, datetime.datetime)
 
+    def testStats(self):
+        self.loader.flat = True
+        self.loader.values()    # build any lazily loaded objects
+        stats = self.loader.stats
+        self.assertIsInstance(stats, skos.LoaderStats)
+        self.assertEqual(stats.counts['concepts'], len(self.loader.getConcepts(flat=True)))
+        self.assertEqual(stats.counts['collections'], len(self.loader.getCollections(flat=True)))
+        self.assertEqual(stats.counts['schemes'], len(self.loader.getConceptSchemes(flat=True)))
+        self.assertIn('index', stats.timings)
+
     def testFlattening(self):
         self.loader.flat = True
         self.assertEqual(len(self.loader), 10)
@@ -164,7 +274,7 @@ class TestRDFParsing(TestRDFLoader):
         key = self.getExternalResource('external1-dce.xml')
         self.assertIn(key, concept.synonyms)
         match = concept.synonyms[key]
-        self.assertIsInstance(match, skos.Concept)
+        self.assertIsInstance(match, self.Concept)
         self.assertIn(concept, match.synonyms)
 
     def testRelated(self):
@@ -174,22 +284,563 @@ class TestRDFParsing(TestRDFLoader):
         for key in keys:
             self.assertIn(key, concept.related)
             match = concept.related[key]
-            self.assertIsInstance(match, skos.Concept)
+            self.assertIsInstance(match, self.Concept)
             self.assertIn(concept, match.related)
 
+    def testSymmetricEdges(self):
+        # the test data relates test and test3 in both directions, and
+        # the synonyms test2 and test3 are stated both ways here
+        graph = rdflib.Graph()
+        for file_ in self.rdf_files:
+            graph.parse(os.path.join(os.path.dirname(__file__), file_))
+        graph.add((rdflib.URIRef('http://portal.oceannet.org/test2'),
+                   rdflib.URIRef('http://www.w3.org/2006/12/owl2-xml#sameAs'),
+                   rdflib.URIRef('http://portal.oceannet.org/test3')))
+        loader = self.getLoader(graph)
+
+        concept = loader['http://portal.oceannet.org/test']
+        self.assertEqual(len(concept.related), 2)
+        for concept in loader.getConcepts().itervalues():
+            for attr in ('related', 'synonyms'):
+                values = getattr(concept, attr)
+                self.assertEqual(len(values), len(list(values)))
+                for match in values.itervalues():
+                    self.assertIn(concept, getattr(match, attr))
+                if hasattr(concept, '_%s_left' % attr):
+                    # a single edge is stored for each pair
+                    left = set(getattr(concept, '_%s_left' % attr))
+                    self.assertFalse(left & set(getattr(concept, '_%s_right' % attr)))
+
     def testNarrower(self):
         concept = self.loader['http://portal.oceannet.org/test2']
         key = self.getExternalResource('external2-dce.xml')
         self.assertIn(key, concept.narrower)
         match = concept.narrower[key]
-        self.assertIsInstance(match, skos.Concept)
+        self.assertIsInstance(match, self.Concept)
         self.assertIn(concept, match.broader)
 
+    def testHierarchy(self):
+        top, external = 'http://portal.oceannet.org/test2', self.getExternalResource('external2-dce.xml')
+        hierarchy = self.loader.hierarchy
+        self.assertIs(self.loader.hierarchy, hierarchy)
+        self.assertEqual(hierarchy.ancestors(external), frozenset([top]))
+        self.assertEqual(hierarchy.descendants(top), frozenset([external]))
+        self.assertEqual((hierarchy.depth(top), hierarchy.depth(external)), (0, 1))
+        self.assertEqual(hierarchy.depth('http://portal.oceannet.org/test'), 0)
+        if self.Concept is skos.PlainConcept:
+            return              # plain relations cannot change
+
+        # the hierarchy follows changes to the loaded concepts
+        concepts = self.loader.getConcepts(flat=True)
+        concept = concepts['http://portal.oceannet.org/test']
+        concepts[external].narrower.add(concept)
+        self.assertTrue(hierarchy.is_descendant_of(concept, top))
+        self.assertEqual(hierarchy.depth(concept), 2)
+        concept.broader.discard(concepts[external])
+        self.assertFalse(hierarchy.is_descendant_of(concept, top))
+
+        # other concepts do not affect it
+        copy, broader = skos.Concept(external, 'copy'), skos.Concept(concept.uri, 'copy')
+        copy.broader.add(broader)
+        self.assertEqual(hierarchy.ancestors(external), frozenset([top]))
+
+    def testResolutionStats(self):
+        stats = self.loader.stats
+        self.assertEqual(stats.counts['documents'], 2)
+        self.assertGreater(stats.counts['bytes'], 0)
+        self.assertIn('resolve', stats.timings)
+
+    def testInsert(self):
+        engine = create_engine('sqlite:///:memory:')
+        self.addCleanup(engine.dispose)     # close the connection in this thread
+        skos.Base.metadata.create_all(engine)
+        Session = sessionmaker(engine)
+
+        # the relations are saved along with the concept
+        uri = 'http://portal.oceannet.org/test'
+        concept = self.loader[uri]
+        related = sorted(concept.related)
+        synonyms = sorted(concept.synonyms)
+        session = Session()
+        session.add(concept)
+        session.commit()
+
+        session.close()
+
+        session = Session()
+        result = session.query(skos.Concept).filter_by(uri=uri).one()
+        self.assertEqual(sorted(result.related), related)
+        self.assertEqual(sorted(result.synonyms), synonyms)
+        session.close()
+
     def testFlattening(self):
         self.loader.flat = True
         self.assertEqual(len(self.loader), 12)
         self.assertIn(self.getExternalResource('external2-dce.xml'), self.loader)
 
+class TestRDFConcurrentParsing(TestRDFParsing):
+    """
+    Test the concurrent parsing of `RDFLoader` objects
+    """
+
+    def getLoader(self, graph):
+        return skos.RDFLoader(graph, 1, workers=4, per_host=2)
+
+class TestRDFHTTPResolution(unittest.TestCase):
+    """
+    Test the resolution of resources from a local HTTP server
+    """
+
+    def setUp(self):
+        self.server = RDFServer(delay=0.05)
+        self.server.start()
+        self.graph = rdflib.Graph()
+        self.graph.parse(self.server.url('http-root.xml'))
+        del self.server.requests[:]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def getKeys(self):
+        return set(self.server.url(name) for name in (
+            'http-root.xml',
+            'http-broader.xml',
+            'http-related.xml',
+            'http-match.xml',
+            'http-top.xml'
+            ))
+
+    def testSequential(self):
+        loader = skos.RDFLoader(self.graph, 2, flat=True)
+        self.assertSetEqual(set(loader), self.getKeys())
+        self.assertEqual(self.server.max_concurrent, 1)
+
+    def testConcurrent(self):
+        loader = skos.RDFLoader(self.graph, 2, flat=True, workers=4)
+        self.assertSetEqual(set(loader), self.getKeys())
+        self.assertEqual(self.server.max_concurrent, 3)
+
+        # each resource is only requested once
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(len(set(self.server.requests)), 4)
+
+        root = loader[self.server.url('http-root.xml')]
+        broader = root.broader[self.server.url('http-broader.xml')]
+        self.assertIn(root, broader.narrower)
+        self.assertIn(self.server.url('http-top.xml'), broader.broader)
+
+    def testPerHost(self):
+        loader = skos.RDFLoader(self.graph, 1, flat=True, workers=4, per_host=2)
+        self.assertEqual(len(loader), 4)
+        self.assertEqual(self.server.max_concurrent, 2)
+
+    def testDepth(self):
+        loader = skos.RDFLoader(self.graph, 1, flat=True, workers=4)
+        self.assertNotIn(self.server.url('http-top.xml'), loader)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def testScannedOnce(self):
+        scanned = []
+        class Loader(skos.RDFLoader):
+            def _unresolvedURIs(self, index, resolved, predicates=None):
+                scanned.append(sum(len(pairs) for pairs in index.relations.itervalues()))
+                return super(Loader, self)._unresolvedURIs(index, resolved, predicates)
+
+        loader = Loader(self.graph, float('inf'), flat=True)
+        self.assertSetEqual(set(loader), self.getKeys())
+
+        # the initial graph and each parsed resource are scanned once
+        self.assertEqual(len(scanned), 5)
+        self.assertEqual(scanned[0], 3)
+        relations = sum(len(list(self.graph.triples((None, predicate, None)))) for predicate in skos._TripleIndex.relation_predicates)
+        self.assertEqual(sum(scanned), relations)
+
+    def testMaxDocuments(self):
+        loader = skos.RDFLoader(self.graph, 2, flat=True, max_documents=1)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(len(loader), 2)
+
+        # the skipped resources and those referenced by the resolved one
+        skipped = self.getKeys() - set(loader) - set([self.server.url('http-top.xml')])
+        self.assertTrue(skipped <= loader.unresolved)
+        self.assertFalse(loader.unresolved & set(loader))
+
+    def testMaxBytes(self):
+        # the document exceeding the budget is still parsed
+        loader = skos.RDFLoader(self.graph, 2, flat=True, max_bytes=1)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(len(loader), 2)
+        self.assertGreater(loader.stats.counts['bytes'], 1)
+
+    def testMaxTime(self):
+        loader = skos.RDFLoader(self.graph, 2, flat=True, workers=4, max_time=0)
+        self.assertEqual(len(self.server.requests), 0)
+        self.assertSetEqual(set(loader), set([self.server.url('http-root.xml')]))
+        self.assertSetEqual(loader.unresolved, self.getKeys() - set(loader) - set([self.server.url('http-top.xml')]))
+
+    def testStalledServer(self):
+        # fetches are abandoned at the deadline, even without a timeout
+        self.server.delay = 5
+        for workers in (None, 4):
+            start = time.time()
+            loader = skos.RDFLoader(self.graph, 2, flat=True, workers=workers, max_time=0.2)
+            self.assertLess(time.time() - start, 2)
+            self.assertSetEqual(set(loader), set([self.server.url('http-root.xml')]))
+            self.assertTrue(loader.unresolved)
+
+    def testMaxDepths(self):
+        expected = set(self.server.url(name) for name in ('http-root.xml', 'http-broader.xml', 'http-top.xml'))
+        for max_depth, max_depths in (
+                (2, {'related': 0, 'http://www.w3.org/2006/12/owl2-xml#sameAs': 0}),
+                (0, {'broader': 2})):
+            graph = rdflib.Graph()
+            graph.parse(self.server.url('http-root.xml'))
+            del self.server.requests[:]
+            loader = skos.RDFLoader(graph, max_depth, flat=True, max_depths=max_depths)
+            self.assertSetEqual(set(loader), expected)
+            self.assertEqual(len(self.server.requests), 2)
+            self.assertSetEqual(loader.unresolved, self.getKeys() - expected)
+
+        loader = skos.RDFLoader(self.graph, float('inf'), flat=True)
+        self.assertEqual(loader.unresolved, frozenset())
+
+    def testBudgetArguments(self):
+        for kwargs in ({'max_documents': -1}, {'max_bytes': 1.5}, {'max_time': 'oops'}, {'max_depths': {'broader': 'oops'}}):
+            with self.assertRaises(TypeError):
+                skos.RDFLoader(self.graph, **kwargs)
+        with self.assertRaises(ValueError):
+            skos.RDFLoader(self.graph, max_depths={'prefLabel': 1})
+
+    def testFetcher(self):
+        fetched = []
+        class Fetcher(skos.URLFetcher):
+            def fetch(self, uri, headers=None):
+                fetched.append(uri)
+                return super(Fetcher, self).fetch(uri, headers)
+
+        loader = skos.RDFLoader(self.graph, 2, flat=True, workers=4, fetcher=Fetcher())
+        self.assertSetEqual(set(loader), self.getKeys())
+        self.assertItemsEqual(fetched, self.getKeys() - set([self.server.url('http-root.xml')]))
+
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(self.graph, fetcher='oops')
+
+    def testTimeout(self):
+        with self.assertRaises(IOError):
+            skos.RDFLoader(self.graph, 1, flat=True, fetcher=skos.URLFetcher(timeout=0.01))
+        loader = skos.RDFLoader(self.graph, 1, flat=True, fetcher=skos.URLFetcher(timeout=5))
+        self.assertEqual(len(loader), 4)
+
+    def testStart(self):
+        called = []
+        future = skos.RDFLoader.start(self.graph, max_depth=2, flat=True, workers=4, callback=called.append)
+        loader = future.result(5)
+        self.assertTrue(future.done())
+        self.assertIsNone(future.exception())
+        self.assertSetEqual(set(loader), self.getKeys())
+        self.assertEqual(called, [future])
+
+        # callbacks added once the load is done are called immediately
+        future.add_done_callback(called.append)
+        self.assertEqual(called, [future, future])
+
+    @unittest.skipUnless(lazy_loading, 'requires SQLAlchemy >= 1.0')
+    def testStartLazy(self):
+        future = skos.RDFLoader.start(self.graph, lazy=True, max_objects=1, flat=True)
+        self.assertIsInstance(future.result(5), skos.RDFLoader)
+
+    def testStartErrors(self):
+        with self.assertRaises(TypeError):
+            skos.RDFLoader.start(self.graph, max_depth='oops')
+
+        event = threading.Event()
+        class Loader(skos.RDFLoader):
+            def load(self, graph, lang=None):
+                event.wait()
+                raise ValueError('oops')
+
+        future = Loader.start(self.graph)
+        with self.assertRaises(skos.LoaderTimeout):
+            future.result(0.01)
+        event.set()
+        with self.assertRaises(ValueError):
+            future.result(5)
+
+class TestRDFNTriples(TestRDFLoader):
+    """
+    Test streaming `RDFLoader` objects from N-Triples
+    """
+
+    def getLoader(self, graph):
+        fileobj = StringIO(graph.serialize(format='nt'))
+        return skos.RDFLoader.from_ntriples(fileobj)
+
+    def testConstructorArguments(self):
+        with self.assertRaises(TypeError):
+            skos.RDFLoader.from_ntriples(StringIO(''), max_depth='oops')
+
+class TestRDFNTriplesParsing(TestRDFParsing):
+    """
+    Test the parsing of `RDFLoader` objects streamed from N-Triples
+    """
+
+    def getLoader(self, graph):
+        fileobj = StringIO(graph.serialize(format='nt'))
+        return skos.RDFLoader.from_ntriples(fileobj, max_depth=1)
+
+@unittest.skipUnless(lazy_loading, 'requires SQLAlchemy >= 1.0')
+class TestRDFLazyLoading(TestRDFLoader):
+    """
+    Test `RDFLoader` objects building objects on demand
+    """
+
+    def getLoader(self, graph):
+        return skos.RDFLoader(graph, lazy=True)
+
+    def testConstructorArguments(self):
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(rdflib.Graph(), lazy=True, max_objects=0)
+
+    def testUnbuilt(self):
+        # the loader can be sized and queried without building objects
+        self.assertEqual(len(self.loader), 10)
+        self.assertIn('http://portal.oceannet.org/test', self.loader)
+        self.assertNotIn('http://portal.oceannet.org/missing', self.loader)
+        self.assertEqual(len(self.loader.getConcepts()), 6)
+        self.assertEqual(len(self.loader._objects), 0)
+
+    def testIdentity(self):
+        concept = self.loader['http://portal.oceannet.org/test']
+        self.assertIs(self.loader['http://portal.oceannet.org/test'], concept)
+        self.assertIs(self.loader.getConcepts()['http://portal.oceannet.org/test'], concept)
+
+    def testBoundedCache(self):
+        loader = skos.RDFLoader(self.graph, lazy=True, max_objects=2)
+        for key in loader:
+            loader[key]
+        self.assertLessEqual(len(loader._recent), 4)
+
+    def testRecentObjects(self):
+        # the most recently used objects are always retained
+        recent = skos._RecentObjects(3)
+        for i in xrange(10):
+            recent.add(i, object())
+            retained = set(recent._current) | set(recent._previous)
+            self.assertTrue(set(xrange(max(i - 2, 0), i + 1)) <= retained)
+            self.assertLess(len(recent), 6)
+
+@unittest.skipUnless(lazy_loading, 'requires SQLAlchemy >= 1.0')
+class TestRDFLazyParsing(TestRDFParsing):
+    """
+    Test the relations of `RDFLoader` objects building objects on demand
+    """
+
+    def getLoader(self, graph):
+        return skos.RDFLoader(graph, 1, lazy=True)
+
+    def testOnDemand(self):
+        concept = self.loader['http://portal.oceannet.org/test']
+        self.assertEqual(len(self.loader._objects), 1)
+
+        # relations are built when first accessed
+        self.assertEqual(len(concept.related), 2)
+        self.assertEqual(len(self.loader._objects), 3)
+
+    def testModification(self):
+        concept = self.loader['http://portal.oceannet.org/test']
+        match = self.loader['http://portal.oceannet.org/test3']
+        concept.related.discard(match)
+        self.assertNotIn(concept, match.related)
+        self.assertEqual(len(concept.related), 1)
+
+    def storedRelations(self, objects):
+        engine = create_engine('sqlite:///:memory:')
+        self.addCleanup(engine.dispose)
+        skos.Base.metadata.create_all(engine)
+        session = sessionmaker(engine)()
+        session.add_all(objects)
+        session.commit()
+        session.close()
+        relations = [sorted(tuple(row) for row in engine.execute(table.select()))
+                     for table in (skos.concept_broader, skos.concepts2collections)]
+        # a symmetric pair is stored once, in either direction
+        for table in (skos.concept_related, skos.concept_synonyms):
+            relations.append(sorted(tuple(sorted(row)) for row in engine.execute(table.select())))
+        return relations
+
+    def testInsertUntouched(self):
+        # relations which were never read are saved with their objects
+        objects = [self.loader[uri] for uri in self.loader.keys()]
+        self.assertEqual(len(self.loader._objects), len(objects))
+        stored = self.storedRelations(objects)
+        self.assertTrue(stored[0] and stored[2] and stored[3])
+
+        graph = rdflib.Graph()
+        directory = os.path.dirname(__file__)
+        for file_ in self.rdf_files:
+            graph.parse(os.path.join(directory, file_))
+        self.assertEqual(stored, self.storedRelations(skos.RDFLoader(graph, 1).values()))
+
+class TestRDFPlainLoading(TestRDFLoader):
+    """
+    Test `RDFLoader` objects building the plain object model
+    """
+
+    Concept = skos.PlainConcept
+    ConceptScheme = skos.PlainConceptScheme
+    Collection = skos.PlainCollection
+
+    def getLoader(self, graph):
+        return skos.RDFLoader(graph, plain=True)
+
+    def testConstructorArguments(self):
+        with self.assertRaises(TypeError):
+            skos.RDFLoader(rdflib.Graph(), plain=True, lazy=True)
+
+    def testSlots(self):
+        concept = self.loader['http://portal.oceannet.org/test']
+        with self.assertRaises(AttributeError):
+            concept.other = 'value'
+
+    def testReadOnly(self):
+        concept = self.loader['http://portal.oceannet.org/test']
+        with self.assertRaises(TypeError):
+            concept.broader.add(self.loader['http://portal.oceannet.org/test2'])
+
+    def testBuilder(self):
+        objects = self.loader.getConcepts().values() + self.loader.getCollections().values()
+        loader = skos.RDFLoader(skos.RDFBuilder().build(objects))
+        self.assertEqual(sorted(loader), sorted(obj.uri for obj in objects))
+
+class TestRDFPlainParsing(TestRDFParsing):
+    """
+    Test the relations of `RDFLoader` objects in the plain object model
+    """
+
+    Concept = skos.PlainConcept
+    ConceptScheme = skos.PlainConceptScheme
+    Collection = skos.PlainCollection
+
+    def getLoader(self, graph):
+        return skos.RDFLoader(graph, 1, plain=True)
+
+    def testInsert(self):
+        pass                    # plain objects are not persisted
+
+class SnapshotMixin(object):
+    """
+    Load objects from a snapshot of the objects loaded from a graph
+    """
+
+    snapshot_kwargs = {}
+
+    def getLoader(self, graph):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        super(SnapshotMixin, self).getLoader(graph).save_snapshot(path)
+        return skos.RDFLoader.from_snapshot(path, **self.snapshot_kwargs)
+
+class TestRDFSnapshot(SnapshotMixin, TestRDFLoader):
+    """
+    Test `RDFLoader` objects loaded from a snapshot
+    """
+
+    def testFormat(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        with self.assertRaises(ValueError):
+            skos.RDFLoader.from_snapshot(path)
+
+    def testValues(self):
+        expected = skos.RDFLoader(self.graph)
+        for key in expected:
+            self.assertEqual(self.loader[key], expected[key])
+            self.assertEqual(type(self.loader[key]), type(expected[key]))
+
+    def testViews(self):
+        expected = skos.RDFLoader(self.graph)
+        for flat in (False, True):
+            for name in ('getConcepts', 'getCollections', 'getConceptSchemes'):
+                self.assertEqual(sorted(getattr(self.loader, name)(flat)), sorted(getattr(expected, name)(flat)))
+
+    def loadClosed(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        expected = skos.RDFLoader(self.graph)
+        expected.save_snapshot(path)
+        uris = sorted(expected)
+        with skos.RDFLoader.from_snapshot(path, **self.snapshot_kwargs) as loader:
+            obj = loader[uris[0]]
+        self.assertEqual(obj, expected[uris[0]])
+        return loader, expected, uris
+
+    def testClose(self):
+        # everything is built before the snapshot is unmapped
+        loader, expected, uris = self.loadClosed()
+        for uri in uris:
+            self.assertEqual(loader[uri], expected[uri])
+
+@unittest.skipUnless(lazy_loading, 'requires SQLAlchemy >= 1.0')
+class TestRDFLazySnapshot(TestRDFSnapshot):
+    """
+    Test `RDFLoader` objects lazily loaded from a snapshot
+    """
+
+    snapshot_kwargs = {'lazy': True}
+
+    def testClose(self):
+        loader, expected, uris = self.loadClosed()
+        with self.assertRaises(ValueError):
+            loader[uris[1]]
+
+    def testUnbuilt(self):
+        self.assertEqual(len(self.loader), 10)
+        self.assertIn('http://portal.oceannet.org/test', self.loader)
+        self.assertNotIn('http://portal.oceannet.org/missing', self.loader)
+        self.assertEqual(len(self.loader._objects), 0)
+
+class TestRDFSnapshotParsing(SnapshotMixin, TestRDFParsing):
+    """
+    Test the relations of `RDFLoader` objects loaded from a snapshot
+    """
+
+    def testResolutionStats(self):
+        self.assertNotIn('documents', self.loader.stats.counts)
+
+    def testLabels(self):
+        loader = skos.RDFLoader(self.graph, lang='en', languages=True)
+        path = os.path.join(tempfile.mkdtemp(), 'snapshot')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        loader.save_snapshot(path)
+        concept = skos.RDFLoader.from_snapshot(path)['http://portal.oceannet.org/test']
+        expected = loader['http://portal.oceannet.org/test'].labels
+        for attr in ('prefLabel', 'definition', 'altLabel'):
+            self.assertEqual(concept.labels.getAll(attr, None), expected.getAll(attr, None))
+
+@unittest.skipUnless(lazy_loading, 'requires SQLAlchemy >= 1.0')
+class TestRDFLazySnapshotParsing(TestRDFSnapshotParsing):
+    """
+    Test the relations of `RDFLoader` objects lazily loaded from a snapshot
+    """
+
+    snapshot_kwargs = {'lazy': True}
+
+class TestRDFPlainSnapshotParsing(TestRDFSnapshotParsing):
+    """
+    Test the relations of plain objects loaded from a snapshot
+    """
+
+    snapshot_kwargs = {'plain': True}
+    Concept = skos.PlainConcept
+    ConceptScheme = skos.PlainConceptScheme
+    Collection = skos.PlainCollection
+
+    def testInsert(self):
+        pass                    # plain objects are not persisted
+
 class TestRDFUriNormalisation(TestRDFLoader):
     """
     Test the uri normalisation functionality
@@ -200,5 +851,18 @@ class TestRDFUriNormalisation(TestRDFLoader):
             return uri.rstrip(u'/')
         return skos.RDFLoader(graph, normalise_uri=normalise_uri)
 
+    def testMemoised(self):
+        calls = []
+        def normalise_uri(uri):
+            calls.append(uri)
+            return uri.rstrip(u'/')
+        skos.RDFLoader(self.graph, normalise_uri=normalise_uri)
+        self.assertEqual(len(calls), len(set(calls)))
+
+    def testInterned(self):
+        # the loader's keys and the objects share one string per URI
+        for key in self.loader:
+            self.assertIs(self.loader[key].uri, key)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+import skos
+from test import unittest
+
+@unittest.skipUnless(hasattr(event, 'contains'), 'requires SQLAlchemy >= 0.9')
+class TestSearch(unittest.TestCase):
+    """
+    Test the full-text index and search over persisted concepts
+    """
+
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        self.addCleanup(self.engine.dispose)
+        skos.Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(self.engine)
+
+        session = self.Session()
+        session.add_all([
+            skos.Concept('sst', u'Sea surface temperature', u'Temperature of the water at the sea surface', altLabel=u'SST'),
+            skos.Concept('temp', u'Température de l\'eau', u'Temperature of the water column'),
+            skos.Concept('column', u'Water column', u'The water between the surface and the bed', altLabel=u'Water body'),
+            skos.Concept('waves', u'Waves', u'Surface gravity waves', altLabel=u'Swell')
+            ])
+        session.commit()
+        session.close()
+
+    def search(self, session, query, **kwargs):
+        return [concept.uri for concept in skos.search_query(session, query, **kwargs)]
+
+    def testSearch(self):
+        skos.build_search_index(self.engine)
+        session = self.Session()
+        self.assertEqual(self.search(session, 'swell'), ['waves'])
+        self.assertEqual(self.search(session, 'SALINITY'), [])
+        self.assertEqual(self.search(session, ''), [])
+        self.assertEqual(self.search(session, '"AND" OR *'), [])
+
+        # labels rank above definitions, and accents are ignored
+        self.assertEqual(self.search(session, 'column'), ['column', 'temp'])
+        self.assertEqual(self.search(session, u'température'), ['temp', 'sst'])
+        self.assertEqual(self.search(session, 'surface'), ['sst', 'waves', 'column'])
+
+        # the last word may be a prefix
+        self.assertEqual(self.search(session, 'water bo'), ['column'])
+        self.assertEqual(self.search(session, 'water bo', prefix=False), [])
+        self.assertEqual(skos.search_query(session, 'wave').limit(1).one().uri, 'waves')
+
+        # each search is a single statement
+        statements = []
+        def record(*args):
+            statements.append(args[2])
+        event.listen(self.engine, 'before_cursor_execute', record)
+        self.search(session, 'sea surface')
+        event.remove(self.engine, 'before_cursor_execute', record)
+        self.assertEqual(len(statements), 1)
+        session.close()
+
+        # rebuilding replaces the existing entries
+        skos.build_search_index(self.engine)
+        self.assertEqual(self.engine.execute('SELECT count(*) FROM concept_search').scalar(), 4)
+
+    def testMaintenance(self):
+        skos.build_search_index(self.engine)
+        skos.maintain_search_index(self.Session)
+        self.addCleanup(event.remove, self.Session, 'after_flush', skos._searchAfterFlush)
+        session = self.Session()
+        get = lambda uri: session.query(skos.Concept).get(uri)
+
+        session.add(skos.Concept('wind', u'Wind speed', u'Speed of the wind above the sea surface'))
+        waves = get('waves')
+        waves.prefLabel = u'Wind waves'
+        session.commit()
+        self.assertEqual(self.search(session, 'wind'), ['waves', 'wind'])
+        self.assertEqual(self.search(session, 'waves'), ['waves'])
+
+        # changing relations leaves the index alone
+        waves.broader.add(get('wind'))
+        session.commit()
+        self.assertEqual(self.search(session, 'wind'), ['waves', 'wind'])
+
+        session.delete(get('sst'))
+        session.commit()
+        self.assertEqual(self.search(session, 'sea'), ['wind'])
+        self.assertEqual(self.engine.execute('SELECT count(*) FROM concept_search').scalar(), 4)
+        session.close()
+
+    def testDialect(self):
+        engine = create_engine('postgresql://localhost/skos', strategy='mock', executor=lambda *args: None)
+        self.assertRaises(NotImplementedError, skos.build_search_index, engine)
+
+        # listeners are not installed for other databases
+        Session = sessionmaker(engine)
+        for target in (Session, Session()):
+            self.assertRaises(NotImplementedError, skos.maintain_search_index, target)
+            self.assertFalse(event.contains(target, 'after_flush', skos._searchAfterFlush))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)